@@ -95,7 +95,8 @@ setup(
     install_requires=global_requirements,
 
     extras_require={
-        'testing': test_requirements
+        'testing': test_requirements,
+        'fast_json': ['orjson; python_version >= "3.6"']
     },
 
     sass_manifests={
@@ -0,0 +1,195 @@
+# Copyright (C) 2019 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: batch_execution
+   :synopsis: A module to execute a state machine many times with different input data in parallel processes
+
+A batch (e.g. a parameter sweep) is defined by a parameter table, in which each row holds the input data of the root
+state for one run. The table is either a CSV file, whose header names the input data ports, or a JSON file holding a
+list of dictionaries. The runs are distributed to worker processes, which load the configuration, the libraries and
+the state machine only once and execute it for many runs. For each run, a record with the parameters, the final
+outcome, the output data of the root state and the duration is appended to a results file (one JSON object per line).
+Runs already recorded in the results file are skipped if the batch is resumed.
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import signal
+import time
+
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+# the state machine loaded by a worker process of the batch
+_state_machine = None
+# the default values of the input data ports of the root state as loaded, by data port id
+_default_values = {}
+
+
+def load_parameter_table(table_path):
+    """Loads the input data of all runs from a parameter table
+
+    :param str table_path: path to a CSV file or a JSON file holding a list of dictionaries
+    :return: the input data of the root state (by port name) for each run
+    :rtype: list[dict]
+    :raises exceptions.ValueError: if the JSON file does not hold a list of dictionaries
+    """
+    if os.path.splitext(table_path)[1].lower() == '.json':
+        with open(table_path) as table_file:
+            parameter_table = json.load(table_file)
+        if not isinstance(parameter_table, list) or not all(isinstance(row, dict) for row in parameter_table):
+            raise ValueError("The parameter table {0} has to hold a list of dictionaries".format(table_path))
+        return parameter_table
+    with open(table_path) as table_file:
+        return [dict(row) for row in csv.DictReader(table_file)]
+
+
+def load_results(results_path):
+    """Loads the records of all runs stored in a results file
+
+    An incomplete last line, e.g. caused by an interrupted batch, is ignored.
+
+    :param str results_path: path to the results file
+    :return: the records by run index
+    :rtype: dict
+    """
+    results = {}
+    if not os.path.exists(results_path):
+        return results
+    with open(results_path) as results_file:
+        for line in results_file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            results[record['run']] = record
+    return results
+
+
+def _to_json_value(value):
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def _initialize_worker(state_machine_path, config_path, parser_result):
+    """Loads configuration, plugins, libraries and the state machine once per worker process"""
+    global _state_machine, _default_values
+    from rafcon.core import start
+    # the main process handles the interruption of the batch
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    start.pre_setup_plugins()
+    start.setup_environment()
+    start.setup_configuration(config_path)
+    start.post_setup_plugins(parser_result)
+    _state_machine = start.open_state_machine(state_machine_path)
+    _default_values = {data_port_id: port.default_value
+                       for data_port_id, port in _state_machine.root_state.input_data_ports.items()}
+
+
+def _execute_run(run):
+    """Executes the state machine of the worker process with the input data of one run"""
+    from rafcon.core.singleton import state_machine_execution_engine
+    run_index, parameters = run
+    root_state = _state_machine.root_state
+    record = {'run': run_index, 'parameters': parameters, 'pid': os.getpid()}
+    start_time = time.time()
+    try:
+        input_data_ports = {port.name: port for port in root_state.input_data_ports.values()}
+        for name in parameters:
+            if name not in input_data_ports:
+                raise ValueError("The root state has no input data port named '{0}'".format(name))
+        # ports not named by the run keep their original default value, independent of the former runs of the worker
+        for data_port_id, port in root_state.input_data_ports.items():
+            port.default_value = _default_values[data_port_id]
+        for name, value in parameters.items():
+            input_data_ports[name].default_value = value
+        state_machine_execution_engine.start(_state_machine.state_machine_id)
+        state_machine_execution_engine.join()
+        final_outcome = root_state.final_outcome
+        record['final_outcome'] = final_outcome.name if final_outcome is not None else None
+        record['final_outcome_id'] = final_outcome.outcome_id if final_outcome is not None else None
+        record['output_data'] = {name: _to_json_value(value) for name, value in root_state.output_data.items()}
+        record['status'] = 'finished'
+    except Exception as e:
+        logger.exception("Error during run {0} of the batch".format(run_index))
+        record['status'] = 'error'
+        record['error'] = "{0}: {1}".format(type(e).__name__, e)
+    record['duration'] = time.time() - start_time
+    # the execution histories of former runs are not needed anymore
+    _state_machine.destroy_execution_histories()
+    return record
+
+
+def run_batch(state_machine_path, table_path, results_path, processes=None, resume=False, config_path=None,
+              parser_result=None, abort_check=None):
+    """Executes a state machine for all rows of a parameter table in parallel worker processes
+
+    :param str state_machine_path: path to the state machine
+    :param str table_path: path to the parameter table (CSV or JSON)
+    :param str results_path: path to the results file, to which a record is appended for each run
+    :param int processes: the number of worker processes, by default the number of CPUs
+    :param bool resume: if True, runs already recorded in the results file are skipped, otherwise the results file
+        is overwritten
+    :param str config_path: path to the core config file used by the worker processes
+    :param dict parser_result: the parsed command line arguments passed to the plugins of the worker processes
+    :param abort_check: optional function, which returns True if the batch shall be aborted
+    :return: the records of the runs executed by this call
+    :rtype: list[dict]
+    """
+    parameter_table = load_parameter_table(table_path)
+    recorded_runs = load_results(results_path) if resume else {}
+    if resume and recorded_runs:
+        # rewrite the valid records, as an interrupted batch may have left an incomplete line
+        with open(results_path, 'w') as results_file:
+            for run_index in sorted(recorded_runs):
+                results_file.write(json.dumps(recorded_runs[run_index], sort_keys=True) + '\n')
+    elif os.path.exists(results_path):
+        if resume:
+            logger.warning("No valid records found in the results file {0}".format(results_path))
+        else:
+            logger.warning("Overwriting the results file {0}".format(results_path))
+        os.remove(results_path)
+    runs = [(run_index, parameters) for run_index, parameters in enumerate(parameter_table)
+            if run_index not in recorded_runs]
+    logger.info("Executing {0} of {1} runs of the batch ({2} already recorded)".format(
+        len(runs), len(parameter_table), len(recorded_runs)))
+    if not runs:
+        return []
+
+    processes = min(processes or multiprocessing.cpu_count(), len(runs))
+    context = multiprocessing.get_context("spawn") if hasattr(multiprocessing, "get_context") else multiprocessing
+    pool = context.Pool(processes, initializer=_initialize_worker,
+                        initargs=(state_machine_path, config_path, parser_result or {}))
+    records = []
+    try:
+        with open(results_path, 'a') as results_file:
+            pending_records = pool.imap_unordered(_execute_run, runs)
+            while len(records) < len(runs):
+                if abort_check is not None and abort_check():
+                    logger.info("Batch aborted after {0} runs, it can be resumed".format(len(records)))
+                    break
+                try:
+                    record = pending_records.next(timeout=1.)
+                except multiprocessing.TimeoutError:
+                    continue
+                # each record is written immediately, so that an interrupted batch can be resumed
+                results_file.write(json.dumps(record, sort_keys=True) + '\n')
+                results_file.flush()
+                records.append(record)
+                logger.info("Run {0} of the batch {1} with outcome '{2}' after {3:.3f} s".format(
+                    record['run'], record['status'], record.get('final_outcome'), record['duration']))
+    finally:
+        pool.terminate()
+        pool.join()
+    return records
@@ -20,7 +20,7 @@
 """
 from future import standard_library
 standard_library.install_aliases()
-import copy
+import itertools
 import threading
 import time
 import queue
@@ -28,13 +28,23 @@ from threading import Lock, RLock
 import sys
 
 from gtkmvc3.observable import Observable
+from rafcon.core.config import global_config
 from rafcon.core.execution.execution_status import ExecutionStatus
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+from rafcon.core.execution.worker_pool import WorkerPool
+from rafcon.core.execution.process_pool import ProcessPool
 from rafcon.utils import log
 from rafcon.utils import plugins
 
 logger = log.get_logger(__name__)
 
+# every state is executed in a newly created thread
+EXECUTION_BACKEND_THREADS = "threads"
+# child states of hierarchy states are executed in the thread of their parent, if no stepping is active, and child
+# states of concurrency states are executed by a pool of reusable threads
+EXECUTION_BACKEND_WORKER_POOL = "worker_pool"
+EXECUTION_BACKENDS = (EXECUTION_BACKEND_THREADS, EXECUTION_BACKEND_WORKER_POOL)
+
 
 class ExecutionEngine(Observable):
     """A class that cares for the execution of the state machine
@@ -43,38 +53,50 @@ class ExecutionEngine(Observable):
     :ivar status: holds the current execution status of the state machine
     :ivar execution_history: the history of the execution TODO: should be an list
 
+    :param state_machine_id: if given, the engine only controls the state machine with this id, independent of the
+        active state machine of the state machine manager (see :meth:`get_independent_execution_engine`)
     """
 
     __wait_for_finishing_thread = None
     __running_state_machine = None
 
-    def __init__(self, state_machine_manager):
+    def __init__(self, state_machine_manager, state_machine_id=None):
         Observable.__init__(self)
         self.state_machine_manager = state_machine_manager
+        self._state_machine_id = state_machine_id
+        self._independent_execution_engines = {}
+        self._independent_execution_engines_lock = Lock()
         self._status = ExecutionStatus(StateMachineExecutionStatus.STOPPED)
         logger.debug("State machine execution engine initialized")
         self.start_state_paths = []
 
         self.execution_engine_lock = Lock()
-        self._run_to_states = []
-        self.run_to_states = []
+        self._run_to_states = set()
+        self.run_to_states = set()
         self.state_machine_running = False
         # the thread, that wants to synchronize, has to acquire the self._status.execution_condition_variable
         # then it can read or set the synchronization_counter; this is only relevant for tests
         self.synchronization_counter = 0
-        # counts how often a state asks for the current execution status
-        self.state_counter = 0
-        self.state_counter_lock = Lock()
+        # counts how often a state asks for the current execution status; next() on an itertools.count is atomic, thus
+        # the counter can be increased without acquiring a lock
+        self._state_counter = itertools.count(1)
+        self._last_state_count = 0
+        self._execution_backend = EXECUTION_BACKEND_THREADS
+        self._worker_pool = None
+        self._process_pool = None
+        self._process_pool_lock = Lock()
+        # set as long as no state machine is executed by the engine
+        self._finished_event = threading.Event()
+        self._finished_event.set()
 
     @Observable.observed
     def pause(self):
         """Set the execution mode to paused
         """
-        if self.state_machine_manager.active_state_machine_id is None:
+        if self._get_state_machine() is None:
             logger.info("'Pause' is not a valid action to initiate state machine execution.")
             return
-        if self.state_machine_manager.get_active_state_machine() is not None:
-            self.state_machine_manager.get_active_state_machine().root_state.recursively_pause_states()
+        self._get_state_machine().root_state.recursively_pause_states()
 
         logger.debug("Pause execution ...")
         self.set_execution_mode(StateMachineExecutionStatus.PAUSED)
@@ -106,13 +128,13 @@ class ExecutionEngine(Observable):
 
         if not self.finished_or_stopped():
             logger.debug("Resume execution engine ...")
-            self.run_to_states = []
-            if self.state_machine_manager.get_active_state_machine() is not None:
-                self.state_machine_manager.get_active_state_machine().root_state.recursively_resume_states()
+            self.run_to_states = set()
+            if self._get_state_machine() is not None:
+                self._get_state_machine().root_state.recursively_resume_states()
                 if isinstance(state_machine_id, int) and \
-                        state_machine_id != self.state_machine_manager.get_active_state_machine().state_machine_id:
+                        state_machine_id != self._get_state_machine().state_machine_id:
                     logger.info("Resumed state machine with id {0} but start of state machine id {1} was requested."
-                                "".format(self.state_machine_manager.get_active_state_machine().state_machine_id,
+                                "".format(self._get_state_machine().state_machine_id,
                                           state_machine_id))
             self.set_execution_mode(StateMachineExecutionStatus.STARTED)
         else:
@@ -124,9 +146,9 @@ class ExecutionEngine(Observable):
 
             logger.debug("Start execution engine ...")
             if state_machine_id is not None:
-                self.state_machine_manager.active_state_machine_id = state_machine_id
+                self._select_state_machine(state_machine_id)
 
-            if not self.state_machine_manager.active_state_machine_id:
+            if self._get_state_machine() is None:
                 logger.error("There exists no active state machine!")
                 return
 
@@ -151,8 +173,8 @@ class ExecutionEngine(Observable):
         """Set the execution mode to stopped
         """
         logger.debug("Stop the state machine execution ...")
-        if self.state_machine_manager.get_active_state_machine() is not None:
-            self.state_machine_manager.get_active_state_machine().root_state.recursively_preempt_states()
+        if self._get_state_machine() is not None:
+            self._get_state_machine().root_state.recursively_preempt_states()
         self.__set_execution_mode_to_stopped()
 
         # Notifies states waiting in step mode or those that are paused about execution stop
@@ -163,46 +185,62 @@ class ExecutionEngine(Observable):
     def join(self, timeout=None):
         """Blocking wait for the execution to finish
 
+        The engine signals the end of the execution, i.e. when the root state finished, was stopped or aborted, by an
+        event. Thus, the method returns without delay.
+
         :param float timeout: Maximum time to wait or None for infinitely
         :return: True if the execution finished, False if no state machine was started or a timeout occurred
         :rtype: bool
         """
         if self.__wait_for_finishing_thread:
             if not timeout:
-                # signal handlers won't work if timeout is None and the thread is joined
-                while True:
-                    self.__wait_for_finishing_thread.join(0.5)
-                    if not self.__wait_for_finishing_thread.isAlive():
-                        break
-            else:
-                self.__wait_for_finishing_thread.join(timeout)
-            return not self.__wait_for_finishing_thread.is_alive()
+                # signal handlers won't work if timeout is None and the event is waited for
+                while not self._finished_event.wait(0.5):
+                    pass
+                return True
+            return self._finished_event.wait(timeout)
         else:
             logger.warning("Cannot join as state machine was not started yet.")
             return False
 
     def __set_execution_mode_to_stopped(self):
         """Stop and reset execution engine"""
-        self.run_to_states = []
+        self.run_to_states = set()
         self.set_execution_mode(StateMachineExecutionStatus.STOPPED)
 
     def __set_execution_mode_to_finished(self):
         """Stop and reset execution engine"""
-        self.run_to_states = []
+        self.run_to_states = set()
         self.set_execution_mode(StateMachineExecutionStatus.FINISHED)
 
     def _run_active_state_machine(self):
         """Store running state machine and observe its status
         """
 
+        self._update_execution_backend()
         # Create new concurrency queue for root state to be able to synchronize with the execution
-        self.__running_state_machine = self.state_machine_manager.get_active_state_machine()
+        self.__running_state_machine = self._get_state_machine()
         if not self.__running_state_machine:
             logger.error("The running state machine must not be None")
+        other_execution_engine = self.__running_state_machine.execution_engine
+        if other_execution_engine is not None and other_execution_engine is not self and \
+                not other_execution_engine.finished_or_stopped():
+            logger.error("The state machine {0} is already executed by another execution engine"
+                         "".format(self.__running_state_machine.state_machine_id))
+            self.__running_state_machine = None
+            self.set_execution_mode(StateMachineExecutionStatus.STOPPED)
+            return
+        # the states of the state machine ask this engine for the execution mode
+        self.__running_state_machine.execution_engine = self
         self.__running_state_machine.root_state.concurrency_queue = queue.Queue(maxsize=0)
 
         if self.__running_state_machine:
-            self.__running_state_machine.start()
+            self._finished_event.clear()
+            try:
+                self.__running_state_machine.start()
+            except Exception:
+                self._finished_event.set()
+                raise
 
             self.__wait_for_finishing_thread = threading.Thread(target=self._wait_for_finishing)
             self.__wait_for_finishing_thread.start()
@@ -210,21 +248,154 @@ class ExecutionEngine(Observable):
             logger.warning("Currently no active state machine! Please create a new state machine.")
             self.set_execution_mode(StateMachineExecutionStatus.STOPPED)
 
+    def _get_state_machine(self):
+        """Returns the state machine controlled by the engine
+
+        :return: the state machine bound to the engine or, if the engine is not bound, the active state machine
+        :rtype: rafcon.core.state_machine.StateMachine
+        """
+        if self._state_machine_id is None:
+            return self.state_machine_manager.get_active_state_machine()
+        return self.state_machine_manager.state_machines.get(self._state_machine_id)
+
+    def _select_state_machine(self, state_machine_id):
+        """Selects the state machine to be executed by the engine"""
+        if self._state_machine_id is None:
+            self.state_machine_manager.active_state_machine_id = state_machine_id
+        elif state_machine_id != self._state_machine_id:
+            logger.warning("The execution engine is bound to state machine {0} and cannot execute state machine {1}"
+                           "".format(self._state_machine_id, state_machine_id))
+
+    def get_independent_execution_engine(self, state_machine_id):
+        """Returns an execution engine, which controls the given state machine independently of this engine
+
+        Several state machines can thereby be executed concurrently, each with its own execution status. The
+        execution of each state machine is started, paused, stopped, stepped and joined via its engine. All engines
+        share the state machine manager, the loaded libraries and the global variable manager. The engine is created
+        on the first call.
+
+        :param int state_machine_id: the id of the state machine to be controlled
+        :return: the execution engine of the state machine
+        :rtype: ExecutionEngine
+        :raises exceptions.ValueError: if there is no state machine with the given id
+        """
+        with self._independent_execution_engines_lock:
+            execution_engine = self._independent_execution_engines.get(state_machine_id)
+            if execution_engine is None:
+                if state_machine_id not in self.state_machine_manager.state_machines:
+                    raise ValueError("There is no state machine with id {0}".format(state_machine_id))
+                execution_engine = ExecutionEngine(self.state_machine_manager, state_machine_id)
+                self._independent_execution_engines[state_machine_id] = execution_engine
+            return execution_engine
+
+    def remove_independent_execution_engine(self, state_machine_id):
+        """Stops and removes the independent execution engine of a state machine
+
+        :param int state_machine_id: the id of the state machine
+        """
+        with self._independent_execution_engines_lock:
+            execution_engine = self._independent_execution_engines.pop(state_machine_id, None)
+        if execution_engine is None:
+            return
+        if not execution_engine.finished_or_stopped():
+            execution_engine.stop()
+            execution_engine.join()
+        if execution_engine._worker_pool is not None:
+            execution_engine._worker_pool.shutdown()
+        if execution_engine._process_pool is not None:
+            execution_engine._process_pool.shutdown()
+
+    @property
+    def independent_execution_engines(self):
+        """The independent execution engines by the ids of their state machines"""
+        with self._independent_execution_engines_lock:
+            return dict(self._independent_execution_engines)
+
+    def _update_execution_backend(self):
+        """Takes over the execution backend and the size of the worker pool from the config"""
+        execution_backend = global_config.get_config_value("EXECUTION_BACKEND", EXECUTION_BACKEND_THREADS)
+        if execution_backend not in EXECUTION_BACKENDS:
+            logger.warning("Unknown execution backend '{0}', using '{1}' instead".format(execution_backend,
+                                                                                      EXECUTION_BACKEND_THREADS))
+            execution_backend = EXECUTION_BACKEND_THREADS
+        self._execution_backend = execution_backend
+
+        if execution_backend == EXECUTION_BACKEND_WORKER_POOL:
+            max_workers = global_config.get_config_value("EXECUTION_WORKER_POOL_SIZE", 16)
+            if self._worker_pool is None or self._worker_pool.max_workers != max_workers:
+                if self._worker_pool is not None:
+                    self._worker_pool.shutdown()
+                self._worker_pool = WorkerPool(max_workers)
+
+    @property
+    def process_pool(self):
+        """The pool of worker processes executing the scripts of execution states with `execute_in_process` set
+
+        The pool is created on first use and after it was shut down. Its size is taken over from the config.
+
+        :rtype: rafcon.core.execution.process_pool.ProcessPool
+        """
+        max_workers = global_config.get_config_value("EXECUTION_PROCESS_POOL_SIZE", 4)
+        with self._process_pool_lock:
+            if self._process_pool is None or self._process_pool.is_shut_down or \
+                    self._process_pool.max_workers != max_workers:
+                if self._process_pool is not None:
+                    self._process_pool.shutdown()
+                self._process_pool = ProcessPool(max_workers)
+            return self._process_pool
+
+    def start_state(self, state, execution_history, backward_execution=False, generate_run_id=True):
+        """Starts the execution of a state in a separate thread, depending on the execution backend
+
+        The state has to be joined afterwards.
+
+        :param rafcon.core.states.state.State state: the state to be started
+        :param execution_history: the execution history the state adds its history items to
+        :param bool backward_execution: whether the state is executed backwards
+        :param bool generate_run_id: whether a new run id is generated for the state
+        """
+        if self._execution_backend == EXECUTION_BACKEND_WORKER_POOL and self._worker_pool is not None:
+            state.start_in_worker_pool(self._worker_pool, execution_history, backward_execution, generate_run_id)
+        else:
+            state.start(execution_history, backward_execution, generate_run_id)
+
+    def run_child_state(self, state, execution_history, backward_execution=False, generate_run_id=True):
+        """Executes a child state of a sequentially executing container state and returns after it finished
+
+        With the worker pool backend, the state is executed in the thread of the caller, as long as the execution
+        engine is simply running. In all other cases, the state gets its own thread.
+
+        :param rafcon.core.states.state.State state: the state to be executed
+        :param execution_history: the execution history the state adds its history items to
+        :param bool backward_execution: whether the state is executed backwards
+        :param bool generate_run_id: whether a new run id is generated for the state
+        """
+        if self._execution_backend == EXECUTION_BACKEND_WORKER_POOL and \
+                self._status.execution_mode is StateMachineExecutionStatus.STARTED:
+            state.run_inline(execution_history, backward_execution, generate_run_id)
+        else:
+            self.start_state(state, execution_history, backward_execution, generate_run_id)
+            state.join()
+
     def _wait_for_finishing(self):
         """Observe running state machine and stop engine if execution has finished"""
         self.state_machine_running = True
-        self.__running_state_machine.join()
-        self.__set_execution_mode_to_finished()
-        self.state_machine_manager.active_state_machine_id = None
-        plugins.run_on_state_machine_execution_finished()
-        # self.__set_execution_mode_to_stopped()
-        self.state_machine_running = False
+        try:
+            self.__running_state_machine.join()
+            self.__set_execution_mode_to_finished()
+            if self._state_machine_id is None:
+                self.state_machine_manager.active_state_machine_id = None
+                plugins.run_on_state_machine_execution_finished()
+            # self.__set_execution_mode_to_stopped()
+        finally:
+            self.state_machine_running = False
+            self._finished_event.set()
 
     def backward_step(self):
         """Take a backward step for all active states in the state machine
         """
         logger.debug("Executing backward step ...")
-        self.run_to_states = []
+        self.run_to_states = set()
         self.set_execution_mode(StateMachineExecutionStatus.BACKWARD)
 
     @Observable.observed
@@ -234,9 +405,9 @@ class ExecutionEngine(Observable):
         logger.debug("Activate step mode")
 
         if state_machine_id is not None:
-            self.state_machine_manager.active_state_machine_id = state_machine_id
+            self._select_state_machine(state_machine_id)
 
-        self.run_to_states = []
+        self.run_to_states = set()
         if self.finished_or_stopped():
             self.set_execution_mode(StateMachineExecutionStatus.STEP_MODE)
             self._run_active_state_machine()
@@ -247,7 +418,7 @@ class ExecutionEngine(Observable):
         """Take a forward step (into) for all active states in the state machine
         """
         logger.debug("Execution step into ...")
-        self.run_to_states = []
+        self.run_to_states = set()
         if self.finished_or_stopped():
             self.set_execution_mode(StateMachineExecutionStatus.FORWARD_INTO)
             self._run_active_state_machine()
@@ -258,7 +429,7 @@ class ExecutionEngine(Observable):
         """Take a forward step (over) for all active states in the state machine
         """
         logger.debug("Execution step over ...")
-        self.run_to_states = []
+        self.run_to_states = set()
         if self.finished_or_stopped():
             self.set_execution_mode(StateMachineExecutionStatus.FORWARD_OVER)
             self._run_active_state_machine()
@@ -269,7 +440,7 @@ class ExecutionEngine(Observable):
         """Take a forward step (out) for all active states in the state machine
         """
         logger.debug("Execution step out ...")
-        self.run_to_states = []
+        self.run_to_states = set()
         if self.finished_or_stopped():
             self.set_execution_mode(StateMachineExecutionStatus.FORWARD_OUT)
             self._run_active_state_machine()
@@ -279,21 +450,21 @@ class ExecutionEngine(Observable):
     def run_to_selected_state(self, path, state_machine_id=None):
         """Execute the state machine until a specific state. This state won't be executed. This is an asynchronous task
         """
-        if self.state_machine_manager.get_active_state_machine() is not None:
-            self.state_machine_manager.get_active_state_machine().root_state.recursively_resume_states()
+        if self._get_state_machine() is not None:
+            self._get_state_machine().root_state.recursively_resume_states()
 
         if not self.finished_or_stopped():
             logger.debug("Resume execution engine and run to selected state!")
-            self.run_to_states = []
-            self.run_to_states.append(path)
+            self.run_to_states = set()
+            self.run_to_states.add(path)
             self.set_execution_mode(StateMachineExecutionStatus.RUN_TO_SELECTED_STATE)
         else:
             logger.debug("Start execution engine and run to selected state!")
             if state_machine_id is not None:
-                self.state_machine_manager.active_state_machine_id = state_machine_id
+                self._select_state_machine(state_machine_id)
             self.set_execution_mode(StateMachineExecutionStatus.RUN_TO_SELECTED_STATE)
-            self.run_to_states = []
-            self.run_to_states.append(path)
+            self.run_to_states = set()
+            self.run_to_states.add(path)
             self._run_active_state_machine()
 
     def _wait_while_in_pause_or_in_step_mode(self):
@@ -318,32 +489,29 @@ class ExecutionEngine(Observable):
         #    a) a step_over
         #    b) a step_out
         #    c) a run_until
-        for state_path in copy.deepcopy(self.run_to_states):
-            next_child_state_path = None
+        run_to_states = self.run_to_states
+        if run_to_states:
+            # the paths are determined only once, as the set of run_to_states is looked up by path
+            container_state_path = container_state.get_path()
             # can be None in case of no transition given
-            if next_child_state_to_execute:
-                next_child_state_path = next_child_state_to_execute.get_path()
-            if state_path == container_state.get_path():
-                # the execution did a whole step_over inside hierarchy state "state" (case a) )
-                # or a whole step_out into the hierarchy state "state" (case b) )
-                # thus we delete its state path from self.run_to_states
-                # and wait for another step (of maybe different kind)
-                wait = True
-                self.run_to_states.remove(state_path)
-                break
-            elif state_path == next_child_state_path:
-                # this is the case that execution has reached a specific state explicitly marked via
-                # run_to_selected_state() (case c) )
-                # if this is the case run_to_selected_state() is finished and the execution
-                # has to wait for new execution commands
-                wait = True
-                self.run_to_states.remove(state_path)
-                break
-            # don't wait if its just a normal step
-            else:
-                wait = False
-                # do not break here, the state_path may be of another state machine branch
-                # break
+            next_child_state_path = next_child_state_to_execute.get_path() if next_child_state_to_execute else None
+            with self.execution_engine_lock:
+                if container_state_path in run_to_states:
+                    # the execution did a whole step_over inside hierarchy state "state" (case a) )
+                    # or a whole step_out into the hierarchy state "state" (case b) )
+                    # thus we delete its state path from self.run_to_states
+                    # and wait for another step (of maybe different kind)
+                    run_to_states.discard(container_state_path)
+                elif next_child_state_path in run_to_states:
+                    # this is the case that execution has reached a specific state explicitly marked via
+                    # run_to_selected_state() (case c) )
+                    # if this is the case run_to_selected_state() is finished and the execution
+                    # has to wait for new execution commands
+                    run_to_states.discard(next_child_state_path)
+                else:
+                    # don't wait if its just a normal step
+                    # the remaining state paths may be of another state machine branch
+                    wait = False
         # don't wait if the the execution just woke up from step mode or pause
         if wait and not woke_up_from_pause_or_step_mode:
             logger.debug("Stepping mode: waiting for next step!")
@@ -369,9 +537,12 @@ class ExecutionEngine(Observable):
         :param next_child_state_to_execute: is the next child state of :param state to be executed
         :return: the current state machine execution status
         """
-        with self.state_counter_lock:
-            self.state_counter += 1
-            # logger.verbose("Increase state_counter!" + str(self.state_counter))
+        self._last_state_count = next(self._state_counter)
+
+        # fast path: in the plain running mode there is nothing to wait for and no run_to_states to update
+        if self._status.execution_mode is StateMachineExecutionStatus.STARTED:
+            container_state.execution_history.new_execution_command_handled = True
+            return StateMachineExecutionStatus.STARTED
 
         woke_up_from_pause_or_step_mode = False
 
@@ -409,7 +580,7 @@ class ExecutionEngine(Observable):
                 if not container_state.execution_history.new_execution_command_handled:
                     # the state that called this method is a hierarchy state => thus we save this state and wait until
                     # thise very state will execute its next state; only then we will wait on the condition variable
-                    self.run_to_states.append(container_state.get_path())
+                    self.run_to_states.add(container_state.get_path())
                 else:
                     pass
             elif self._status.execution_mode is StateMachineExecutionStatus.FORWARD_OUT:
@@ -421,12 +592,12 @@ class ExecutionEngine(Observable):
                             parent_path = container_state.parent.parent.get_path()
                         else:
                             parent_path = container_state.parent.get_path()
-                        self.run_to_states.append(parent_path)
+                        self.run_to_states.add(parent_path)
                     else:
                         pass
                 else:
                     # if step_out is called from the highest level just run the state machine to the end
-                    self.run_to_states = []
+                    self.run_to_states = set()
                     self.set_execution_mode(StateMachineExecutionStatus.STARTED)
             elif self._status.execution_mode is StateMachineExecutionStatus.RUN_TO_SELECTED_STATE:
                 # "run_to_states" were already updated thus doing nothing
@@ -451,19 +622,18 @@ class ExecutionEngine(Observable):
         """
         if self._status.execution_mode is StateMachineExecutionStatus.FORWARD_OVER or \
                 self._status.execution_mode is StateMachineExecutionStatus.FORWARD_OUT:
-            for state_path in copy.deepcopy(self.run_to_states):
-                if state_path == state.get_path():
-                    logger.verbose("Modifying run_to_states; triggered by state %s!", state.name)
-                    self.run_to_states.remove(state_path)
-                    from rafcon.core.states.state import State
-                    if isinstance(state.parent, State):
-                        from rafcon.core.states.library_state import LibraryState
-                        if isinstance(state.parent, LibraryState):
-                            parent_path = state.parent.parent.get_path()
-                        else:
-                            parent_path = state.parent.get_path()
-                        self.run_to_states.append(parent_path)
-                    break
+            state_path = state.get_path()
+            if state_path in self.run_to_states:
+                logger.verbose("Modifying run_to_states; triggered by state %s!", state.name)
+                self.run_to_states.discard(state_path)
+                from rafcon.core.states.state import State
+                if isinstance(state.parent, State):
+                    from rafcon.core.states.library_state import LibraryState
+                    if isinstance(state.parent, LibraryState):
+                        parent_path = state.parent.parent.get_path()
+                    else:
+                        parent_path = state.parent.get_path()
+                    self.run_to_states.add(parent_path)
 
     def execute_state_machine_from_path(self, state_machine=None, path=None, start_state_path=None, wait_for_execution_finished=True):
         """ A helper function to start an arbitrary state machine at a given path.
@@ -514,18 +684,44 @@ class ExecutionEngine(Observable):
         """
         return self._status
 
+    @property
+    def execution_backend(self):
+        """The execution backend used for the current or last state machine execution"""
+        return self._execution_backend
+
+    @property
+    def worker_pool_statistics(self):
+        """Usage metrics of the worker pool or None if the worker pool was never used
+
+        See :attr:`rafcon.core.execution.worker_pool.WorkerPool.statistics`
+        """
+        if self._worker_pool is None:
+            return None
+        return self._worker_pool.statistics
+
     @property
     def run_to_states(self):
         """Property for the _run_to_states field
 
+        The paths of the states to run to are kept in a set, so that they can be looked up in constant time.
         """
         with self.execution_engine_lock:
             return self._run_to_states
 
     @run_to_states.setter
     def run_to_states(self, run_to_states):
-        if not isinstance(run_to_states, list):
-            raise TypeError("run_to_states must be of type list")
+        if not isinstance(run_to_states, (list, set)):
+            raise TypeError("run_to_states must be of type list or set")
         with self.execution_engine_lock:
-            self._run_to_states = run_to_states
+            self._run_to_states = set(run_to_states)
+
+    @property
+    def state_counter(self):
+        """Property for the number of times, states asked for the current execution status"""
+        return self._last_state_count
+
+    @state_counter.setter
+    def state_counter(self, state_counter):
+        self._state_counter = itertools.count(state_counter + 1)
+        self._last_state_count = state_counter
 
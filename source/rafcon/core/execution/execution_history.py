@@ -17,6 +17,8 @@
    :synopsis: A module for the history of one thread during state machine execution
 
 """
+from future import standard_library
+standard_library.install_aliases()
 from future.utils import native_str
 from builtins import object
 from builtins import range
@@ -29,44 +31,129 @@ from jsonconversion.decoder import JSONObjectDecoder
 from jsonconversion.encoder import JSONObjectEncoder
 
 import shelve
+import queue
+import threading
 from threading import Lock
 from enum import Enum
 from gtkmvc3.observable import Observable
 
-from rafcon.core.id_generator import history_item_id_generator
+from rafcon.core.id_generator import history_item_id_generator, experiment_id
+from rafcon.core.state_elements.logical_port import Outcome
+from rafcon.core.state_elements.scope import ScopedData
 from rafcon.utils import log
+from rafcon.utils import execution_log
 logger = log.get_logger(__name__)
 import os
+import glob
 import subprocess
 import pickle
-from weakref import ref
+from uuid import uuid4
+from weakref import ref, WeakKeyDictionary
+
+from rafcon.utils.constants import RAFCON_TEMP_PATH_BASE
+
+SPILL_PATH = os.path.join(RAFCON_TEMP_PATH_BASE, 'execution_history_spill')
 
 
 class ExecutionHistoryStorage(object):
-    def __init__(self, filename):
+    """An execution history storage writing the records of the history items into a shelve
+
+    :param str filename: the path of the shelve file
+    :param bool state_catalogue: if True, the static metadata of the states is written once into a state catalogue
+        (see :mod:`rafcon.utils.execution_log`) instead of into every record
+    """
+
+    def __init__(self, filename, state_catalogue=False):
         self.filename = filename
+        self.state_catalogue = state_catalogue
+        self._state_catalogue_keys = set()
+        # the catalogue key and the fingerprint of the static metadata of the last item stored for each state
+        self._state_catalogue_keys_by_state = WeakKeyDictionary()
+        self._state_catalogue_lock = Lock()
         self.store_lock = Lock()
         try:
-            # 'c' for read/write/create
-            # protocol 2 cause of in some cases smaller file size
-            # writeback disabled, cause we don't need caching of entries in memory but continuous writes to the disk
-            self.store = shelve.open(filename, flag='c', protocol=2, writeback=False)
+            self._open()
             logger.debug('Openend log file for writing %s' % self.filename)
         except Exception:
             logger.exception('Exception:')
 
+    def _open(self):
+        # 'c' for read/write/create
+        # protocol 2 cause of in some cases smaller file size
+        # writeback disabled, cause we don't need caching of entries in memory but continuous writes to the disk
+        self.store = shelve.open(self.filename, flag='c', protocol=2, writeback=False)
+
+    def _write_record(self, key, value):
+        self.store[native_str(key)] = value
+
+    def _sync(self):
+        self.store.sync()
+
+    def _close(self):
+        self.store.close()
+
     def store_item(self, key, value):
         with self.store_lock:
             try:
-                self.store[native_str(key)] = value
+                self._write_record(key, value)
+            except Exception:
+                logger.exception('Exception:')
+
+    def store_history_item(self, history_item):
+        """Stores the record of a history item
+
+        If the state catalogue is enabled, the static state metadata of the record is stored as catalogue entry,
+        unless the same entry was stored before. The static metadata is only built again, if the state was modified
+        since the last item of the state was stored.
+
+        :param HistoryItem history_item: the history item to be stored
+        """
+        if not self.state_catalogue:
+            self.store_item(history_item.history_item_id, history_item.to_dict())
+            return
+        state = history_item.state_reference
+        fingerprint = None
+        if not isinstance(history_item, StateMachineStartItem):
+            # the hash digest of the state changes with its name, description, semantic data and library, the path by
+            # name with the names of its ancestors
+            fingerprint = state.get_path(by_name=True), state.get_hash_digest()
+            with self._state_catalogue_lock:
+                known_fingerprint, key = self._state_catalogue_keys_by_state.get(state, (None, None))
+            if known_fingerprint == fingerprint:
+                record = history_item.to_dict(static_fields=False)
+                record['state_catalogue_key'] = key
+                self.store_item(history_item.history_item_id, record)
+                return
+        key, entry, record = execution_log.split_state_catalogue_entry(history_item.to_dict())
+        with self._state_catalogue_lock:
+            new_entry = key not in self._state_catalogue_keys
+            self._state_catalogue_keys.add(key)
+            if fingerprint is not None:
+                self._state_catalogue_keys_by_state[state] = fingerprint, key
+        if new_entry:
+            self._store_required_item(key, entry)
+        self.store_item(history_item.history_item_id, record)
+
+    def _store_required_item(self, key, value):
+        """Stores an item, which must not be dropped, as other records depend on it"""
+        self.store_item(key, value)
+
+    def get_item(self, key):
+        with self.store_lock:
+            return self.store[native_str(key)]
+
+    def remove_item(self, key):
+        with self.store_lock:
+            try:
+                del self.store[native_str(key)]
             except Exception:
                 logger.exception('Exception:')
 
     def flush(self):
         with self.store_lock:
             try:
-                self.store.close()
-                self.store = shelve.open(self.filename, flag='c', protocol=2, writeback=False)
+                self._close()
+                self._open()
                 logger.debug('Flushed log file %s' % self.filename)
             except Exception:
                 if self.destroyed:
@@ -77,7 +164,7 @@ class ExecutionHistoryStorage(object):
     def close(self, make_read_and_writable_for_all=False):
         with self.store_lock:
             try:
-                self.store.close()
+                self._close()
                 logger.debug('Closed log file %s' % self.filename)
                 if make_read_and_writable_for_all:
                     ret = subprocess.call(['chmod', 'a+rw', self.filename])
@@ -92,53 +179,348 @@ class ExecutionHistoryStorage(object):
         with self.store_lock:
             self.destroyed = True
             try:
-                self.store.close()
+                self._close()
                 logger.debug('Closed log file %s' % self.filename)
             except Exception:
                 logger.exception('Exception:')
 
 
+class BufferedExecutionHistoryStorage(ExecutionHistoryStorage):
+    """An execution history storage, which writes the records in a background thread
+
+    The records are passed to the writer thread via a bounded queue and written in batches, so that the executing
+    states are not delayed by the disk access. The behaviour for a full queue is defined by the back-pressure policy:
+
+    * ``"block"``: the executing state waits until the record can be queued
+    * ``"drop"``: the record is dropped
+    * ``"sample"``: only every :attr:`SAMPLE_RATE`-th record is queued (waiting for a free slot), all others are dropped
+
+    :param str filename: the path of the shelve file
+    :param int queue_size: the maximum number of records waiting to be written
+    :param float flush_interval: the maximum time in seconds until written records are synchronized to the disk
+    :param str back_pressure: the policy for a full queue, one of :attr:`BACK_PRESSURE_POLICIES`
+    :param bool state_catalogue: see :class:`ExecutionHistoryStorage`
+    """
+
+    BACK_PRESSURE_POLICIES = ("block", "drop", "sample")
+    SAMPLE_RATE = 10
+    BATCH_SIZE = 100
+
+    def __init__(self, filename, queue_size=1000, flush_interval=1., back_pressure="block", state_catalogue=False):
+        if back_pressure not in self.BACK_PRESSURE_POLICIES:
+            raise ValueError("The back-pressure policy has to be one of {0}".format(self.BACK_PRESSURE_POLICIES))
+        super(BufferedExecutionHistoryStorage, self).__init__(filename, state_catalogue)
+        self.flush_interval = flush_interval
+        self.back_pressure = back_pressure
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._counter_lock = Lock()
+        self._written_records = 0
+        self._dropped_records = 0
+        self._records_while_full = 0
+        self._closed = False
+        # guards the check for a closed storage together with the queuing of a record, so that no record is queued
+        # after the end of the queue was signaled to the writer
+        self._queue_lock = Lock()
+        self._writer_thread = threading.Thread(target=self._write_records, name="RAFCON-execution-log-writer")
+        self._writer_thread.daemon = True
+        self._writer_thread.start()
+
+    def store_item(self, key, value):
+        with self._queue_lock:
+            if self._closed:
+                self._drop_record_of_closed_log(key)
+                return
+            record = (native_str(key), value)
+            if self.back_pressure == "block":
+                self._queue.put(record)
+                return
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                with self._counter_lock:
+                    self._records_while_full += 1
+                    keep_record = self.back_pressure == "sample" and self._records_while_full % self.SAMPLE_RATE == 0
+                    if not keep_record:
+                        self._dropped_records += 1
+                if keep_record:
+                    self._queue.put(record)
+
+    def _store_required_item(self, key, value):
+        # catalogue entries are never dropped due to back-pressure
+        with self._queue_lock:
+            if self._closed:
+                self._drop_record_of_closed_log(key)
+            else:
+                self._queue.put((native_str(key), value))
+
+    def _drop_record_of_closed_log(self, key):
+        logger.warning("Record {0} is dropped, as the execution log {1} was already closed".format(key, self.filename))
+        with self._counter_lock:
+            self._dropped_records += 1
+
+    def _write_records(self):
+        last_sync_time = time.time()
+        stop = False
+        while not stop:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not None]
+            stop = len(records) < len(batch)
+            with self.store_lock:
+                for key, value in records:
+                    try:
+                        self._write_record(key, value)
+                    except Exception:
+                        logger.exception('Exception:')
+                if stop or records and time.time() - last_sync_time >= self.flush_interval:
+                    try:
+                        self._sync()
+                    except Exception:
+                        logger.exception('Exception:')
+                    last_sync_time = time.time()
+            with self._counter_lock:
+                self._written_records += len(records)
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self):
+        """Waits until all queued records are written and synchronizes them to the disk"""
+        self._queue.join()
+        with self.store_lock:
+            try:
+                self._sync()
+            except Exception:
+                logger.exception('Exception:')
+
+    def close(self, make_read_and_writable_for_all=False):
+        with self._queue_lock:
+            closing = not self._closed
+            if closing:
+                self._closed = True
+                self._queue.put(None)
+        if closing:
+            self._writer_thread.join()
+        super(BufferedExecutionHistoryStorage, self).close(make_read_and_writable_for_all)
+
+    @property
+    def statistics(self):
+        """Current metrics of the writer
+
+        :return: the number of records waiting in the queue, written to the file and dropped due to back-pressure
+        :rtype: dict
+        """
+        with self._counter_lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'written_records': self._written_records,
+                'dropped_records': self._dropped_records
+            }
+
+
+class StreamExecutionHistoryStorage(ExecutionHistoryStorage):
+    """An execution history storage writing an append-only log file
+
+    In contrast to a shelve, the log file can be read while it is written and does not depend on a dbm backend. The
+    format is described in :mod:`rafcon.utils.execution_log`, which also provides the functions to read it.
+    """
+
+    def _open(self):
+        self._file = open(self.filename, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(execution_log.STREAM_LOG_HEADER)
+        self._index_file = open(self.filename + execution_log.STREAM_LOG_INDEX_SUFFIX, 'a')
+
+    def _write_record(self, key, value):
+        offset = self._file.tell()
+        self._file.write(execution_log.pack_record(value))
+        self._file.flush()
+        self._index_file.write(execution_log.index_line(key, value.get('run_id'), offset))
+        self._index_file.flush()
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        os.fsync(self._index_file.fileno())
+
+    def _close(self):
+        self._file.close()
+        self._index_file.close()
+
+
+class BufferedStreamExecutionHistoryStorage(BufferedExecutionHistoryStorage, StreamExecutionHistoryStorage):
+    """An execution history storage writing an append-only log file in a background thread"""
+
+
 class ExecutionHistory(Observable, Iterable, Sized):
     """A class for the history of a state machine execution
 
         It stores all history elements in a stack wise fashion.
 
+        The number of history items kept in memory can be bounded by a retention policy. Older items are spilled to
+        a temporary :class:`ExecutionHistoryStorage` and paged in again transparently, when they are accessed (e.g.
+        for backward stepping or by the execution history widget).
+
         :ivar initial_prev: optional link to a previous element for the first element pushed into this history of
                             type :class:`rafcon.core.execution.execution_history.HistoryItem`
+        :ivar max_items_in_memory: the maximum number of history items kept in memory or None for no limit
+        :ivar max_age_in_memory: the maximum age in seconds of history items kept in memory or None for no limit
     """
 
-    def __init__(self, initial_prev=None):
+    # the last items are always kept in memory, as they are needed for the execution (e.g. for the previous state)
+    MIN_ITEMS_IN_MEMORY = 2
+
+    def __init__(self, initial_prev=None, max_items_in_memory=None, max_age_in_memory=None):
         super(ExecutionHistory, self).__init__()
         self._history_items = []            
         self.initial_prev = initial_prev
         self.execution_history_storage = None
         self.new_execution_command_handled = True
+        self.max_items_in_memory = max_items_in_memory
+        self.max_age_in_memory = max_age_in_memory
+        # ids of the oldest history items, which were spilled from memory, in the order of the history
+        self._spilled_item_ids = []
+        self._spill_storage = None
+        # history items that could not be pickled are kept in memory
+        self._unspillable_items = {}
+        self._state_machine = None
 
     def destroy(self):
         # logger.verbose("Destroy execution history!")
         if self.execution_history_storage:
             self.execution_history_storage.close()
         self.execution_history_storage = None
-        if len(self._history_items) > 0:
-            if self._history_items[0]:
-                execution_history_iterator = iter(self)
-                for history_item in execution_history_iterator:
-                    history_item.destroy()
+        # spilled items do not hold any references, thus only the items in memory are destroyed
+        for history_item in list(self._unspillable_items.values()) + self._history_items:
+            history_item.destroy()
+        self._remove_spill_storage()
         self.destroyed = True
         self._history_items = None
         self.initial_prev = None
 
     def __iter__(self):
-        return iter(self._history_items)                        
+        return self._iter_items(list(self._spilled_item_ids), list(self._history_items))
 
     def set_execution_history_storage(self, execution_history_storage):
         self.execution_history_storage = execution_history_storage
         
     def __len__(self):
-        return len(self._history_items)
+        return len(self._spilled_item_ids) + len(self._history_items)
 
     def __getitem__(self, index):
-        return self._history_items[index]
+        number_of_spilled_items = len(self._spilled_item_ids)
+        if not number_of_spilled_items:
+            return self._history_items[index]
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(self._iter_items(self._spilled_item_ids[start:stop],
+                                         self._history_items[max(start - number_of_spilled_items, 0):
+                                                             max(stop - number_of_spilled_items, 0)]))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("execution history index out of range")
+        if index >= number_of_spilled_items:
+            return self._history_items[index - number_of_spilled_items]
+        return self._load_spilled_item(self._spilled_item_ids[index])
+
+    @property
+    def number_of_items_in_memory(self):
+        return len(self._history_items)
+
+    def _iter_items(self, spilled_item_ids, history_items):
+        """Iterates over spilled and in-memory history items
+
+        Spilled items are paged in one after the other and linked to their neighbours, so that the `next` field of
+        a yielded item is always valid.
+        """
+        previous_item = None
+        for history_item_id in spilled_item_ids:
+            history_item = self._load_spilled_item(history_item_id)
+            if previous_item is not None:
+                previous_item.next = history_item
+                history_item.prev = previous_item
+                yield previous_item
+            previous_item = history_item
+        if previous_item is not None:
+            if history_items:
+                previous_item.next = history_items[0]
+            yield previous_item
+        for history_item in history_items:
+            yield history_item
+
+    def _apply_retention_policy(self):
+        if self.max_items_in_memory is None and self.max_age_in_memory is None:
+            return
+        min_timestamp = None if self.max_age_in_memory is None else time.time() - self.max_age_in_memory
+        if self.max_items_in_memory is not None:
+            while len(self._history_items) > max(self.MIN_ITEMS_IN_MEMORY, self.max_items_in_memory):
+                self._spill_oldest_item()
+        if min_timestamp is not None:
+            while len(self._history_items) > self.MIN_ITEMS_IN_MEMORY and \
+                    self._history_items[0].timestamp < min_timestamp:
+                self._spill_oldest_item()
+
+    def _spill_oldest_item(self):
+        history_item = self._history_items.pop(0)
+        # the link to the spilled item is removed to free its memory
+        self._history_items[0].prev = None
+        if self._state_machine is None and history_item.state_reference is not None:
+            state_machine = history_item.state_reference.get_state_machine()
+            if state_machine is not None:
+                self._state_machine = ref(state_machine)
+        try:
+            data = pickle.dumps(history_item, protocol=2)
+        except Exception as e:
+            logger.debug("History item {0} is kept in memory, as it cannot be pickled: {1}".format(history_item, e))
+            self._unspillable_items[history_item.history_item_id] = history_item
+        else:
+            if self._spill_storage is None:
+                if not os.path.exists(SPILL_PATH):
+                    os.makedirs(SPILL_PATH)
+                self._spill_storage = ExecutionHistoryStorage(os.path.join(SPILL_PATH, uuid4().hex))
+            self._spill_storage.store_item(history_item.history_item_id, data)
+            if isinstance(history_item, ConcurrencyItem):
+                # the items of the child histories are part of the pickled concurrency item
+                for execution_history in history_item.execution_histories:
+                    execution_history._remove_spill_storage()
+        self._spilled_item_ids.append(history_item.history_item_id)
+
+    def _load_spilled_item(self, history_item_id):
+        if history_item_id in self._unspillable_items:
+            return self._unspillable_items[history_item_id]
+        history_item = pickle.loads(self._spill_storage.get_item(history_item_id))
+        state_machine = None if self._state_machine is None else self._state_machine()
+        if state_machine is not None:
+            history_item.restore_state_reference(state_machine)
+        return history_item
+
+    def _page_in_last_spilled_item(self):
+        history_item_id = self._spilled_item_ids[-1]
+        history_item = self._load_spilled_item(history_item_id)
+        self._spilled_item_ids.pop()
+        if self._unspillable_items.pop(history_item_id, None) is None:
+            self._spill_storage.remove_item(history_item_id)
+        if not self._spilled_item_ids:
+            history_item.prev = self.initial_prev
+        if self._history_items:
+            history_item.next = self._history_items[0]
+            self._history_items[0].prev = history_item
+        self._history_items.insert(0, history_item)
+
+    def _remove_spill_storage(self):
+        if self._spill_storage is not None:
+            self._spill_storage.close()
+            for filename in glob.glob(self._spill_storage.filename + '*'):
+                os.remove(filename)
+            self._spill_storage = None
 
     def get_last_history_item(self):
         """Returns the history item that was added last
@@ -157,7 +539,7 @@ class ExecutionHistory(Observable, Iterable, Sized):
         if last_history_item is not None:
             last_history_item.next = current_item
         if self.execution_history_storage is not None:
-            self.execution_history_storage.store_item(current_item.history_item_id, current_item.to_dict())
+            self.execution_history_storage.store_history_item(current_item)
         try:
             self._history_items.append(current_item)
         except AttributeError:
@@ -165,6 +547,8 @@ class ExecutionHistory(Observable, Iterable, Sized):
                 pass # this is fine
             else:
                 raise
+        else:
+            self._apply_retention_policy()
         return current_item
 
     @Observable.observed
@@ -223,15 +607,17 @@ class ExecutionHistory(Observable, Iterable, Sized):
         last_history_item = self.get_last_history_item()
         return_item = ConcurrencyItem(state, self.get_last_history_item(),
                                       number_concurrent_threads, state.run_id,
-                                      self.execution_history_storage)
+                                      self.execution_history_storage,
+                                      self.max_items_in_memory, self.max_age_in_memory)
         return self._push_item(last_history_item, return_item)
 
     @Observable.observed
     def push_state_machine_start_history_item(self, state_machine, run_id):
         return_item = StateMachineStartItem(state_machine, run_id)
         if self.execution_history_storage is not None:
-            self.execution_history_storage.store_item(return_item.history_item_id, return_item.to_dict())
+            self.execution_history_storage.store_history_item(return_item)
         self._history_items.append(return_item)
+        self._apply_retention_policy()
         return return_item
 
     @Observable.observed
@@ -241,11 +627,17 @@ class ExecutionHistory(Observable, Iterable, Sized):
         :return: History item added last
         :rtype: HistoryItem
         """
+        if not self._history_items and self._spilled_item_ids:
+            self._page_in_last_spilled_item()
         try:
-            return self._history_items.pop()
+            last_item = self._history_items.pop()
         except IndexError:
             logger.error("No item left in the history item list in the execution history.")
             return None
+        # keep the latest items in memory, as they are accessed during backward stepping
+        while len(self._history_items) < self.MIN_ITEMS_IN_MEMORY and self._spilled_item_ids:
+            self._page_in_last_spilled_item()
+        return last_item
 
 
 class HistoryItem(object):
@@ -263,7 +655,7 @@ class HistoryItem(object):
 
     def __init__(self, state, prev, run_id):
         self._state_reference = state
-        self.path = copy.deepcopy(state.get_path())
+        self.path = state.get_path()
         self.timestamp = time.time()
         self.run_id = run_id
         self.prev = prev
@@ -287,14 +679,59 @@ class HistoryItem(object):
         """
         return self._state_reference
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the state reference and the links to other items are restored when the item is paged in again
+        state['_state_reference'] = None
+        state['prev'] = None
+        state['next'] = None
+        return state
+
+    def restore_state_reference(self, state_machine):
+        """Restores the state reference of an unpickled history item from its path
+
+        :param rafcon.core.state_machine.StateMachine state_machine: the state machine the history belongs to
+        """
+        self._state_reference = state_machine.get_state_by_path(self.path)
+
     def __str__(self):
         return "HistoryItem with reference state name %s (time: %s)" % (self.state_reference.name, self.timestamp)
 
-    def to_dict(self):
+    def to_dict(self, static_fields=True):
+        """Returns the record of the history item, which is stored in the execution log
+
+        :param bool static_fields: whether the record contains the static metadata of the state (see
+            :meth:`get_static_fields`)
+        :rtype: dict
+        """
         record = dict()
 
         # here always the correct path is desired
         record['path'] = self.state_reference.get_path()
+        if static_fields:
+            record.update(self.get_static_fields())
+        record['timestamp'] = self.timestamp
+        record['run_id'] = self.run_id  # library state and state copy have the same run_id
+        record['history_item_id'] = self.history_item_id
+
+        if self.prev is not None:
+            record['prev_history_item_id'] = self.prev.history_item_id
+        else:
+            record['prev_history_item_id'] = None
+        # store the specialized class name as item_type,
+        # e.g. CallItem, ReturnItem, StatemachineStartItem when saved
+        record['item_type'] = self.__class__.__name__
+        return record
+
+    def get_static_fields(self):
+        """Returns the static metadata of the state of the history item
+
+        These are the fields listed in :data:`rafcon.utils.execution_log.STATE_CATALOGUE_FIELDS`, which only depend on
+        the state and are thus stored in the state catalogue of the execution log, if enabled.
+
+        :rtype: dict
+        """
+        record = dict()
         record['path_by_name'] = self.state_reference.get_path(by_name=True)
         record['state_type'] = str(type(self.state_reference).__name__)
 
@@ -316,9 +753,6 @@ class HistoryItem(object):
         # there are 3 names of interest:
         # library_name (= library key), library_state_name (name of the user), state_name (name of the developer)
         record['state_name'] = target_state.name
-        record['timestamp'] = self.timestamp
-        record['run_id'] = self.run_id  # library state and state copy have the same run_id
-        record['history_item_id'] = self.history_item_id
 
         # semantic data
         semantic_data_dict = {}
@@ -330,14 +764,6 @@ class HistoryItem(object):
         record['semantic_data'] = semantic_data_dict
 
         record['description'] = target_state.description
-
-        if self.prev is not None:
-            record['prev_history_item_id'] = self.prev.history_item_id
-        else:
-            record['prev_history_item_id'] = None
-        # store the specialized class name as item_type,
-        # e.g. CallItem, ReturnItem, StatemachineStartItem when saved
-        record['item_type'] = self.__class__.__name__
         return record
 
 
@@ -352,21 +778,27 @@ class StateMachineStartItem(HistoryItem):
     def __str__(self):
         return "StateMachineStartItem with name %s (time: %s)" % (self.sm_dict['root_state_storage_id'], self.timestamp)
 
-    def to_dict(self):
-        record = HistoryItem.to_dict(self)
-        record.update(self.sm_dict)
+    def to_dict(self, static_fields=True):
+        record = HistoryItem.to_dict(self, static_fields)
         record['call_type'] = 'EXECUTE'
-        record['state_name'] = 'StateMachineStartItem'
-        record['state_type'] = 'StateMachine'
         record['path'] = ''
-        record['path_by_name'] = ''
-        record['os_environment'] = self.os_environment
+        # the run ids and history item ids of the log are only unique together with the id of the generating process
+        record['experiment_id'] = experiment_id
         if self.prev is not None:
             record['prev_history_item_id'] = self.prev.history_item_id
         else:
             record['prev_history_item_id'] = None
         return record
 
+    def get_static_fields(self):
+        record = HistoryItem.get_static_fields(self)
+        record.update(self.sm_dict)
+        record['state_name'] = 'StateMachineStartItem'
+        record['state_type'] = 'StateMachine'
+        record['path_by_name'] = ''
+        record['os_environment'] = self.os_environment
+        return record
+
 
 class ScopedDataItem(HistoryItem):
     """A abstract class to represent history items which contains the scoped data of a state
@@ -383,11 +815,30 @@ class ScopedDataItem(HistoryItem):
         else:
             raise Exception('unkown calltype, neither CONTAINER nor EXECUTE')
         self.call_type = call_type
-        self.scoped_data = {} if state_for_scoped_data is None else copy.deepcopy(state_for_scoped_data._scoped_data)
-        self.child_state_input_output_data = copy.deepcopy(child_state_input_output_data)
-
-    def to_dict(self):
-        record = HistoryItem.to_dict(self)
+        # the snapshot shares all scoped data entries, which did not change since the previous history item, and the
+        # memo lets the input/output data share values that were already copied for the snapshot
+        memo = {}
+        self.scoped_data = {} if state_for_scoped_data is None else \
+            state_for_scoped_data.get_scoped_data_snapshot(memo)
+        self.child_state_input_output_data = copy.deepcopy(child_state_input_output_data, memo)
+
+    def __getstate__(self):
+        state = HistoryItem.__getstate__(self)
+        # scoped data elements are observable and reference their parent, thus only their content is pickled
+        state['scoped_data'] = {key: (ScopedData.state_element_to_dict(scoped_data), scoped_data.timestamp)
+                                for key, scoped_data in self.scoped_data.items()}
+        return state
+
+    def __setstate__(self, state):
+        scoped_data = {}
+        for key, (scoped_data_dict, timestamp) in state['scoped_data'].items():
+            scoped_data[key] = ScopedData.from_dict(scoped_data_dict)
+            scoped_data[key].timestamp = timestamp
+        state['scoped_data'] = scoped_data
+        self.__dict__.update(state)
+
+    def to_dict(self, static_fields=True):
+        record = HistoryItem.to_dict(self, static_fields)
         scoped_data_dict = {}
         for k, v in self.scoped_data.items():
             try:
@@ -439,8 +890,8 @@ class CallItem(ScopedDataItem):
     def __str__(self):
         return "CallItem %s" % (ScopedDataItem.__str__(self))
 
-    def to_dict(self):
-        record = ScopedDataItem.to_dict(self)
+    def to_dict(self, static_fields=True):
+        record = ScopedDataItem.to_dict(self, static_fields)
         return record
 
 
@@ -451,11 +902,22 @@ class ReturnItem(ScopedDataItem):
         ScopedDataItem.__init__(self, state, prev, call_type, state_for_scoped_data, output_data, run_id)
         self.outcome = copy.deepcopy(state.final_outcome)
 
+    def __getstate__(self):
+        state = ScopedDataItem.__getstate__(self)
+        if self.outcome is not None:
+            state['outcome'] = Outcome.state_element_to_dict(self.outcome)
+        return state
+
+    def __setstate__(self, state):
+        if state['outcome'] is not None:
+            state['outcome'] = Outcome.from_dict(state['outcome'])
+        ScopedDataItem.__setstate__(self, state)
+
     def __str__(self):
         return "ReturnItem %s" % (ScopedDataItem.__str__(self))
 
-    def to_dict(self):
-        record = ScopedDataItem.to_dict(self)
+    def to_dict(self, static_fields=True):
+        record = ScopedDataItem.to_dict(self, static_fields)
         if self.outcome is not None:
             record['outcome_name'] = self.outcome.to_dict()['name']
             record['outcome_id'] = self.outcome.to_dict()['outcome_id']
@@ -468,20 +930,48 @@ class ReturnItem(ScopedDataItem):
 class ConcurrencyItem(HistoryItem):
     """A class to hold all the data for an invocation of several concurrent threads.
     """
-    def __init__(self, container_state, prev, number_concurrent_threads, run_id, execution_history_storage):
+    def __init__(self, container_state, prev, number_concurrent_threads, run_id, execution_history_storage,
+                 max_items_in_memory=None, max_age_in_memory=None):
         HistoryItem.__init__(self, container_state, prev, run_id)
         self.execution_histories = []
 
         for i in range(number_concurrent_threads):
-            execution_history = ExecutionHistory(initial_prev=self)
+            execution_history = ExecutionHistory(initial_prev=self, max_items_in_memory=max_items_in_memory,
+                                                 max_age_in_memory=max_age_in_memory)
             execution_history.set_execution_history_storage(execution_history_storage)
             self.execution_histories.append(execution_history)
 
+    def __getstate__(self):
+        state = HistoryItem.__getstate__(self)
+        state['execution_histories'] = [list(execution_history) for execution_history in self.execution_histories]
+        return state
+
+    def __setstate__(self, state):
+        execution_histories = []
+        for history_items in state['execution_histories']:
+            execution_history = ExecutionHistory(initial_prev=self)
+            prev = self
+            for history_item in history_items:
+                history_item.prev = prev
+                if isinstance(prev, HistoryItem) and prev is not self:
+                    prev.next = history_item
+                prev = history_item
+            execution_history._history_items = history_items
+            execution_histories.append(execution_history)
+        state['execution_histories'] = execution_histories
+        self.__dict__.update(state)
+
+    def restore_state_reference(self, state_machine):
+        HistoryItem.restore_state_reference(self, state_machine)
+        for execution_history in self.execution_histories:
+            for history_item in execution_history:
+                history_item.restore_state_reference(state_machine)
+
     def __str__(self):
         return "ConcurrencyItem %s" % (HistoryItem.__str__(self))
 
-    def to_dict(self):
-        record = HistoryItem.to_dict(self)
+    def to_dict(self, static_fields=True):
+        record = HistoryItem.to_dict(self, static_fields)
         record['call_type'] = 'CONTAINER'
         return record
 
@@ -0,0 +1,354 @@
+# Copyright (C) 2019 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: process_pool
+   :synopsis: A module holding a pool of persistent worker processes for the execution of CPU-bound scripts
+
+"""
+import imp
+import multiprocessing
+import os
+import pickle
+import time
+import traceback
+from threading import Lock
+
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+# interval in seconds in which the executing thread forwards preemption and pause requests to the worker process
+POLL_INTERVAL = 0.01
+
+
+def _get_multiprocessing_context():
+    """Worker processes are spawned, as forking a process with running threads (e.g. the GUI) is not safe"""
+    if hasattr(multiprocessing, "get_context"):
+        return multiprocessing.get_context("spawn")
+    return multiprocessing  # Python 2 only supports forking
+
+
+def _sync_event(event, is_set):
+    if is_set and not event.is_set():
+        event.set()
+    elif not is_set and event.is_set():
+        event.clear()
+
+
+class GlobalVariableManagerProxy(object):
+    """Forwards all calls of a script executed in a worker process to the global variable manager of RAFCON
+
+    The arguments and return values of the calls are pickled, thus variables cannot be accessed per reference.
+
+    :param connection: the connection of the worker process to the process executing the state machine
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._lock = Lock()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def forward(*args, **kwargs):
+            with self._lock:
+                self._connection.send(('gvm', name, args, kwargs))
+                success, value = self._connection.recv()
+            if not success:
+                raise value
+            return value
+        return forward
+
+
+class ScriptStateProxy(object):
+    """Stands in for the execution state (`self`) in a script executed in a worker process
+
+    Only a subset of the state interface is available: the name, id and path of the state, its logger, its persistent
+    variables (which are kept per worker process) and the preemption and pause handling.
+    """
+
+    def __init__(self, name, state_id, path, persistent_variables, preempted_event, paused_event):
+        self.name = name
+        self.state_id = state_id
+        self._path = path
+        self.logger = log.get_logger(name)
+        self.persistent_variables = persistent_variables
+        self._preempted_event = preempted_event
+        self._paused_event = paused_event
+
+    def get_path(self):
+        return self._path
+
+    @property
+    def preempted(self):
+        return self._preempted_event.is_set()
+
+    @property
+    def paused(self):
+        return self._paused_event.is_set()
+
+    def _wait(self, condition, timeout):
+        end_time = None if timeout is None else time.time() + timeout
+        while not condition():
+            if end_time is None:
+                wait_time = POLL_INTERVAL
+            else:
+                wait_time = min(POLL_INTERVAL, end_time - time.time())
+                if wait_time <= 0:
+                    return False
+            self._preempted_event.wait(wait_time)
+        return True
+
+    def wait_for_interruption(self, timeout=None):
+        """Wait for the state to be paused or preempted
+
+        :param float timeout: Maximum time to wait, None if infinitely
+        :return: True, is an event was set, False if the timeout was reached
+        :rtype: bool
+        """
+        return self._wait(lambda: self.preempted or self.paused, timeout)
+
+    def wait_for_unpause(self, timeout=None):
+        """Wait for the state to be resumed or preempted
+
+        :param float timeout: Maximum time to wait, None if infinitely
+        :return: True, is an event was set, False if the timeout was reached
+        :rtype: bool
+        """
+        return self._wait(lambda: self.preempted or not self.paused, timeout)
+
+
+def _build_module(script_text, filename, module_name):
+    try:
+        imp.acquire_lock()
+        module = imp.new_module(module_name)
+        code = compile(script_text, '%s (%s)' % (filename, module_name), 'exec')
+        exec(code, module.__dict__)
+        return module
+    finally:
+        imp.release_lock()
+
+
+def _worker_main(connection, preempted_event, paused_event):
+    """Main loop of a worker process
+
+    The process receives scripts to be executed, runs them and sends back the outcome and the output data. The
+    compiled modules and persistent variables are kept per state path for subsequent executions.
+    """
+    gvm_proxy = GlobalVariableManagerProxy(connection)
+    modules = {}
+    persistent_variables = {}
+    while True:
+        try:
+            task = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if task is None:
+            break
+        name, state_id, path, script_text, script_hash, filename, recompile, inputs, outputs, backward_execution = task
+        try:
+            if recompile or path not in modules or modules[path][0] != script_hash:
+                module_name = "{0}_{1}".format(os.path.splitext(filename)[0], len(modules))
+                modules[path] = (script_hash, _build_module(script_text, filename, module_name))
+            module = modules[path][1]
+            state = ScriptStateProxy(name, state_id, path, persistent_variables.setdefault(path, {}),
+                                     preempted_event, paused_event)
+            if backward_execution:
+                if hasattr(module, "backward_execute"):
+                    outcome = module.backward_execute(state, inputs, outputs, gvm_proxy)
+                else:
+                    outcome = None
+            else:
+                outcome = module.execute(state, inputs, outputs, gvm_proxy)
+            result = ('result', outcome, outputs)
+            # the result is pickled in advance, so that a non-picklable output is reported as error of the script
+            pickle.dumps(result)
+        except Exception as e:
+            formatted_exc = traceback.format_exc()
+            try:
+                pickle.dumps(e)
+            except Exception:
+                e = RuntimeError("{0}: {1}".format(type(e).__name__, e))
+            result = ('error', e, formatted_exc)
+        connection.send(result)
+
+
+class ProcessWorker(object):
+    """A persistent worker process executing scripts
+
+    :param context: the multiprocessing context used to create the process
+    :param str name: the name of the process
+    """
+
+    def __init__(self, context, name):
+        self.connection, worker_connection = context.Pipe()
+        self.preempted_event = context.Event()
+        self.paused_event = context.Event()
+        self.process = context.Process(target=_worker_main, name=name,
+                                       args=(worker_connection, self.preempted_event, self.paused_event))
+        self.process.daemon = True
+        self.process.start()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        """Lets the process terminate after its current task"""
+        try:
+            self.connection.send(None)
+        except (IOError, OSError):
+            pass
+        self.process.join(1.)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+class ProcessPool(object):
+    """A pool of persistent worker processes, in which the scripts of execution states are executed
+
+    CPU-bound scripts executed in threads are serialized by the global interpreter lock, which is circumvented by
+    executing them in a separate process. The inputs and outputs of the scripts are pickled. The preemption and pause
+    requests of the state as well as all accesses of the global variable manager are forwarded between the executing
+    thread and the worker process.
+
+    The number of processes kept in the pool is bounded by `max_workers`. Just like in the
+    :class:`rafcon.core.execution.worker_pool.WorkerPool`, scripts are not queued behind busy workers: if all
+    workers of a full pool are busy, an additional process is started, which is not kept afterwards.
+
+    :param int max_workers: the maximum number of processes kept in the pool
+    """
+
+    def __init__(self, max_workers):
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("The maximum number of workers has to be a positive integer")
+        self._max_workers = max_workers
+        self._context = _get_multiprocessing_context()
+        self._lock = Lock()
+        self._workers = []
+        self._idle_workers = []
+        self._executed_scripts = 0
+        self._overflow_processes = 0
+        self._shut_down = False
+
+    def _acquire_worker(self):
+        with self._lock:
+            if self._shut_down:
+                raise RuntimeError("Cannot execute a script in a process pool that was shut down")
+            self._executed_scripts += 1
+            while self._idle_workers:
+                worker = self._idle_workers.pop()
+                if worker.is_alive():
+                    return worker, True
+                self._workers.remove(worker)
+            keep_worker = len(self._workers) < self._max_workers
+            if not keep_worker:
+                self._overflow_processes += 1
+            worker = ProcessWorker(self._context, "RAFCON-process-worker-{0}".format(len(self._workers)))
+            if keep_worker:
+                self._workers.append(worker)
+            return worker, keep_worker
+
+    def _release_worker(self, worker, keep_worker):
+        with self._lock:
+            if keep_worker and not self._shut_down and worker.is_alive():
+                self._idle_workers.append(worker)
+                return
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.stop()
+
+    def execute_script(self, state, inputs, outputs, backward_execution=False, recompile=False):
+        """Executes the script of an execution state in a worker process
+
+        The call blocks until the script has finished. The output data returned by the script are written to
+        `outputs`.
+
+        :param rafcon.core.states.execution_state.ExecutionState state: the state, whose script is executed
+        :param dict inputs: the input data of the script
+        :param dict outputs: the output data of the script
+        :param bool backward_execution: Flag whether to run the script in backwards mode
+        :param bool recompile: Flag whether the worker has to compile the script anew
+        :return: Return value of the execute script
+        :rtype: str | int
+        :raises exceptions.RuntimeError: if the pool was already shut down or the worker process died
+        """
+        from rafcon.core.singleton import global_variable_manager
+        script = state.script
+        task = (state.name, state.state_id, state.get_path(), script.script, script.script_hash, script.filename,
+                recompile, inputs, outputs, backward_execution)
+        worker, keep_worker = self._acquire_worker()
+        try:
+            worker.connection.send(task)
+            while True:
+                _sync_event(worker.preempted_event, state.preempted)
+                _sync_event(worker.paused_event, state.paused)
+                if not worker.connection.poll(POLL_INTERVAL):
+                    if not worker.is_alive():
+                        keep_worker = False
+                        raise RuntimeError("The worker process executing {0} terminated unexpectedly".format(state))
+                    continue
+                message = worker.connection.recv()
+                if message[0] == 'gvm':
+                    _, method_name, args, kwargs = message
+                    try:
+                        reply = (True, getattr(global_variable_manager, method_name)(*args, **kwargs))
+                    except Exception as e:
+                        reply = (False, e)
+                    worker.connection.send(reply)
+                elif message[0] == 'result':
+                    outputs.clear()
+                    outputs.update(message[2])
+                    return message[1]
+                else:
+                    _, exception, formatted_exc = message
+                    logger.error("Error in the worker process executing {0}:\n{1}".format(state, formatted_exc))
+                    raise exception
+        except (EOFError, IOError, OSError):
+            keep_worker = False
+            raise
+        finally:
+            worker.preempted_event.clear()
+            worker.paused_event.clear()
+            self._release_worker(worker, keep_worker)
+
+    def shutdown(self):
+        """Terminates all idle workers and lets busy workers terminate after their current script"""
+        with self._lock:
+            self._shut_down = True
+            idle_workers = self._idle_workers
+            self._idle_workers = []
+            for worker in idle_workers:
+                self._workers.remove(worker)
+        for worker in idle_workers:
+            worker.stop()
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    @property
+    def is_shut_down(self):
+        return self._shut_down
+
+    @property
+    def statistics(self):
+        """Current usage metrics of the pool
+
+        :return: the number of worker processes (all, idle and busy ones), the number of executed scripts and the
+            number of additional processes started because the pool was exhausted
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'workers': len(self._workers),
+                'idle_workers': len(self._idle_workers),
+                'busy_workers': len(self._workers) - len(self._idle_workers),
+                'executed_scripts': self._executed_scripts,
+                'overflow_processes': self._overflow_processes
+            }
@@ -0,0 +1,148 @@
+# Copyright (C) 2019 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: worker_pool
+   :synopsis: A module holding a pool of reusable threads for the execution of states
+
+"""
+from future import standard_library
+standard_library.install_aliases()
+import queue
+import threading
+from threading import Lock
+
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+
+class WorkerTask(object):
+    """Handle of a function executed by the :class:`WorkerPool`
+
+    The task offers the same `join` and `is_alive` interface as a :class:`threading.Thread`, so that it can be used
+    as a replacement for the thread of a state.
+
+    :param function: the function to be executed
+    """
+
+    def __init__(self, function):
+        self._function = function
+        self._finished = threading.Event()
+
+    def run(self):
+        try:
+            self._function()
+        except Exception:
+            logger.exception("Error while executing worker task {0}".format(self._function))
+        finally:
+            self._finished.set()
+
+    def join(self, timeout=None):
+        """Waits until the task is finished
+
+        :param float timeout: Maximum time to wait or None for infinitely
+        """
+        self._finished.wait(timeout)
+
+    def is_alive(self):
+        return not self._finished.is_set()
+
+
+class WorkerPool(object):
+    """A pool of reusable worker threads
+
+    The number of threads kept in the pool is bounded by `max_workers`. Submitted tasks are never queued behind busy
+    tasks, as concurrent states may depend on each other (e.g. a concurrency state waiting for its children). Thus,
+    if all workers of a full pool are busy, the task is executed in an additional thread that is not kept afterwards.
+
+    :param int max_workers: the maximum number of threads kept in the pool
+    """
+
+    def __init__(self, max_workers):
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("The maximum number of workers has to be a positive integer")
+        self._max_workers = max_workers
+        self._lock = Lock()
+        self._tasks = queue.Queue(maxsize=0)
+        self._workers = []
+        self._idle_workers = 0
+        self._submitted_tasks = 0
+        self._overflow_threads = 0
+        self._shut_down = False
+
+    def submit(self, function):
+        """Executes the given function in a worker thread
+
+        :param function: the function to be executed
+        :return: the handle of the task
+        :rtype: WorkerTask
+        :raises exceptions.RuntimeError: if the pool was already shut down
+        """
+        task = WorkerTask(function)
+        with self._lock:
+            if self._shut_down:
+                raise RuntimeError("Cannot submit a task to a worker pool that was shut down")
+            self._submitted_tasks += 1
+            if self._idle_workers > 0:
+                # the idle worker is reserved for this task by decreasing the counter
+                self._idle_workers -= 1
+                self._tasks.put(task)
+            elif len(self._workers) < self._max_workers:
+                worker = threading.Thread(target=self._work, args=(task,),
+                                          name="RAFCON-worker-{0}".format(len(self._workers)))
+                worker.daemon = True
+                self._workers.append(worker)
+                worker.start()
+            else:
+                self._overflow_threads += 1
+                overflow_thread = threading.Thread(target=task.run)
+                overflow_thread.daemon = True
+                overflow_thread.start()
+        return task
+
+    def _work(self, task):
+        while task is not None:
+            task.run()
+            with self._lock:
+                if self._shut_down:
+                    break
+                self._idle_workers += 1
+            task = self._tasks.get()
+        with self._lock:
+            self._workers.remove(threading.current_thread())
+
+    def shutdown(self):
+        """Terminates all idle workers and lets busy workers terminate after their current task"""
+        with self._lock:
+            self._shut_down = True
+            for _ in range(self._idle_workers):
+                self._tasks.put(None)
+            self._idle_workers = 0
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    @property
+    def statistics(self):
+        """Current usage metrics of the pool
+
+        :return: the number of worker threads (all, idle and busy ones), the number of tasks handed over to idle
+            workers but not yet picked up, the number of submitted tasks and the number of additional threads started
+            because the pool was exhausted
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'workers': len(self._workers),
+                'idle_workers': self._idle_workers,
+                'busy_workers': len(self._workers) - self._idle_workers,
+                'queued_tasks': self._tasks.qsize(),
+                'submitted_tasks': self._submitted_tasks,
+                'overflow_threads': self._overflow_threads
+            }
@@ -19,6 +19,7 @@
 
 from builtins import str
 from builtins import range
+import itertools
 import string
 import random
 import uuid
@@ -31,9 +32,11 @@ state_machine_id_counter = 0
 transition_id_counter = 0
 data_flow_id_counter = 0
 script_id_counter = 0
-run_id_counter = 0
-history_item_id_counter = 0
 semantic_data_id_counter = 0
+# run ids and history item ids are generated concurrently by many execution threads; next() on an itertools.count is
+# atomic, thus no lock is needed
+_run_id_counter = itertools.count(1)
+_history_item_id_counter = itertools.count(1)
 
 used_run_ids = []
 used_global_variable_ids = []
@@ -109,17 +112,46 @@ def generate_script_id():
 
 
 def run_id_generator():
-    global run_id_counter
-    run_id_counter += 1
-    final_run_id = experiment_id + ".run_id." + '%020d' % run_id_counter
-    return final_run_id
+    """Generates a new run id for the execution of a state
+
+    Run ids are integers, which are unique within the process. Together with the :data:`experiment_id`, which is
+    stored once per execution log, they are globally unique.
+
+    :rtype: int
+    :return: a new run id
+    """
+    return next(_run_id_counter)
 
 
 def history_item_id_generator():
-    global history_item_id_counter
-    history_item_id_counter += 1
-    final_id = experiment_id + ".history_item_id." + '%020d' % history_item_id_counter
-    return final_id
+    """Generates a new history item id, see :func:`run_id_generator`
+
+    :rtype: int
+    :return: a new history item id
+    """
+    return next(_history_item_id_counter)
+
+
+def run_id_to_str(run_id, experiment_id=experiment_id):
+    """Renders a run id as globally unique string, e.g. for display or the export of execution logs
+
+    :param int run_id: the run id
+    :param str experiment_id: the experiment id of the process that generated the run id
+    :rtype: str
+    :return: the run id in the format `<experiment_id>.run_id.<20 digit run id>`
+    """
+    return experiment_id + ".run_id." + '%020d' % run_id
+
+
+def history_item_id_to_str(history_item_id, experiment_id=experiment_id):
+    """Renders a history item id as globally unique string, see :func:`run_id_to_str`
+
+    :param int history_item_id: the history item id
+    :param str experiment_id: the experiment id of the process that generated the history item id
+    :rtype: str
+    :return: the history item id in the format `<experiment_id>.history_item_id.<20 digit history item id>`
+    """
+    return experiment_id + ".history_item_id." + '%020d' % history_item_id
 
 
 def state_id_generator(size=STATE_ID_LENGTH, chars=string.ascii_uppercase, used_state_ids=None):
@@ -0,0 +1,249 @@
+# Copyright (C) 2019 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: library_index
+   :synopsis: A module holding a persistent index of the libraries found in the library root paths
+
+"""
+
+import json
+import os
+import stat
+import time
+import zipfile
+
+from rafcon.core.storage import storage
+from rafcon.utils import log
+from rafcon.utils.filesystem import RACY_MTIME_INTERVAL
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    OrderedDict = dict
+
+logger = log.get_logger(__name__)
+
+INDEX_FORMAT_VERSION = 2
+
+
+class LibraryIndex(object):
+    """A persistent index of the folders and libraries within library root paths
+
+    The index stores for each folder its modification time and its sub folders and for each library its modification
+    time, the name of its state machine file, its version and the storage id of its root state. As the modification
+    time of a folder changes whenever an entry is added, removed or renamed, a folder with an unchanged modification
+    time does not have to be listed again. Thus, validating an unchanged tree of libraries requires only one `stat` call
+    per folder and library instead of listing all folders and checking each entry.
+
+    :param str index_file_path: the file the index is loaded from and saved to, None for an index only kept in memory
+    """
+
+    def __init__(self, index_file_path=None):
+        self._index_file_path = index_file_path
+        self._roots = {}
+        self._dirty = False
+        if index_file_path is not None:
+            self.load()
+
+    @property
+    def index_file_path(self):
+        return self._index_file_path
+
+    def load(self):
+        """Loads the index from its file, an invalid or outdated file is ignored"""
+        self._roots = {}
+        self._dirty = False
+        if not os.path.exists(self._index_file_path):
+            return
+        try:
+            with open(self._index_file_path) as index_file:
+                index = json.load(index_file)
+            if index.get('format_version') == INDEX_FORMAT_VERSION:
+                self._roots = index['roots']
+            else:
+                logger.info("Ignoring library index {0} of another format version".format(self._index_file_path))
+        except (IOError, OSError, ValueError, KeyError, AttributeError) as e:
+            logger.warning("Could not load library index {0}: {1}".format(self._index_file_path, e))
+
+    def save(self):
+        """Saves the index to its file, if it changed since it was loaded
+
+        The file is written atomically, so that concurrently started RAFCON instances never read a partial index.
+        """
+        if self._index_file_path is None or not self._dirty:
+            return
+        index_folder = os.path.dirname(self._index_file_path)
+        tmp_file_path = "{0}.{1}.tmp".format(self._index_file_path, os.getpid())
+        try:
+            if index_folder and not os.path.exists(index_folder):
+                os.makedirs(index_folder)
+            with open(tmp_file_path, 'w') as index_file:
+                json.dump({'format_version': INDEX_FORMAT_VERSION, 'roots': self._roots}, index_file)
+            os.rename(tmp_file_path, self._index_file_path)
+            self._dirty = False
+        except (IOError, OSError) as e:
+            logger.warning("Could not save library index {0}: {1}".format(self._index_file_path, e))
+
+    def scan(self, library_root_path, sub_path_elements=(), force=False, check_entry=None):
+        """Returns the libraries within a library root path or within one of its sub folders
+
+        Folders and libraries, whose modification time did not change since the last scan, are taken from the index.
+
+        :param str library_root_path: the library root path
+        :param sub_path_elements: the names of the nested folders of the scanned folder within the root path
+        :param bool force: if True, all folders of the scanned tree are listed again, regardless of their modification
+            time
+        :param check_entry: optional function called with the folder path and name of each entry of a listed folder
+        :return: the libraries as nested dictionaries of folder names and library paths (see
+            :attr:`rafcon.core.library_manager.LibraryManager.libraries`), None if the folder does not exist
+        :rtype: OrderedDict
+        """
+        parent_node = None
+        node = self._roots.get(library_root_path)
+        path = library_root_path
+        for name in sub_path_elements:
+            parent_node = node if node is not None and 'entries' in node else None
+            node = parent_node['entries'].get(name) if parent_node is not None else None
+            path = os.path.join(path, name)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._set_node(library_root_path, sub_path_elements, parent_node, None)
+            return None
+        node, libraries = self._scan_folder(path, node, mtime, force, check_entry)
+        self._set_node(library_root_path, sub_path_elements, parent_node, node)
+        return libraries
+
+    def _set_node(self, library_root_path, sub_path_elements, parent_node, node):
+        if not sub_path_elements:
+            if node is None:
+                self._dirty |= self._roots.pop(library_root_path, None) is not None
+            elif self._roots.get(library_root_path) is not node:
+                self._roots[library_root_path] = node
+                self._dirty = True
+        elif parent_node is not None:
+            entries = parent_node['entries']
+            if node is None:
+                self._dirty |= entries.pop(sub_path_elements[-1], None) is not None
+            elif entries.get(sub_path_elements[-1]) is not node:
+                entries[sub_path_elements[-1]] = node
+                self._dirty = True
+
+    @staticmethod
+    def _trusted_mtime(mtime):
+        return None if abs(time.time() - mtime) < RACY_MTIME_INTERVAL else mtime
+
+    def _scan_folder(self, folder_path, node, mtime, force, check_entry):
+        """Scans a folder, which is no library, and returns its index node and its libraries"""
+        if force or node is None or node.get('library') or node.get('mtime') is None or node['mtime'] != mtime:
+            old_entries = node.get('entries', {}) if node is not None and not force else {}
+            entries = {}
+            for name in os.listdir(folder_path):
+                if check_entry is not None:
+                    check_entry(folder_path, name)
+                if name[0] != '.':
+                    old_entry = old_entries.get(name)
+                    entries[name] = None if old_entry is not None and old_entry.get('file') else old_entry
+            node = {'mtime': self._trusted_mtime(mtime), 'entries': entries}
+            self._dirty = True
+
+        libraries = OrderedDict()
+        entries = node['entries']
+        for name in sorted(entries):
+            entry = entries[name]
+            if entry is not None and entry.get('file'):
+                # files can only become folders by changes, which also change the modification time of the folder
+                continue
+            entry_path = os.path.join(folder_path, name)
+            try:
+                entry_stat = os.stat(entry_path)
+            except OSError:
+                # the entry was removed after the folder was listed
+                del entries[name]
+                self._dirty = True
+                continue
+            if not stat.S_ISDIR(entry_stat.st_mode):
+                if name.endswith(storage.PACKED_STATE_MACHINE_EXTENSION):
+                    # libraries in the packed format are files
+                    if force or entry is None or entry.get('mtime') is None or entry['mtime'] != entry_stat.st_mtime:
+                        entries[name] = self._get_packed_library_entry(entry_path, entry_stat.st_mtime)
+                        self._dirty = True
+                    # a library folder of the same name takes precedence
+                    libraries.setdefault(name[:-len(storage.PACKED_STATE_MACHINE_EXTENSION)], entry_path)
+                    continue
+                entries[name] = {'file': True}
+                self._dirty = True
+                continue
+            if not force and entry is not None and entry.get('library') and entry.get('mtime') is not None and \
+                    entry['mtime'] == entry_stat.st_mtime:
+                libraries[name] = entry_path
+                continue
+            if force or entry is None or entry.get('library') or entry.get('mtime') != entry_stat.st_mtime:
+                library_entry = self._get_library_entry(entry_path, entry_stat.st_mtime)
+                if library_entry is not None:
+                    entries[name] = library_entry
+                    self._dirty = True
+                    libraries[name] = entry_path
+                    continue
+                if entry is not None and entry.get('library'):
+                    entry = None
+            entries[name], sub_libraries = self._scan_folder(entry_path, entry, entry_stat.st_mtime, force,
+                                                             check_entry)
+            libraries[name] = sub_libraries
+        return node, libraries
+
+    def _get_library_entry(self, library_path, mtime):
+        """Returns the index node of the library in the given folder or None, if the folder holds no library"""
+        for state_machine_file in (storage.STATEMACHINE_FILE, storage.STATEMACHINE_FILE_OLD):
+            state_machine_file_path = os.path.join(library_path, state_machine_file)
+            if os.path.exists(state_machine_file_path):
+                break
+        else:
+            return None
+        entry = {'library': True, 'mtime': self._trusted_mtime(mtime), 'state_machine_file': state_machine_file,
+                 'version': None, 'root_state_storage_id': None}
+        try:
+            with open(state_machine_file_path) as state_machine_file:
+                state_machine_dict = json.load(state_machine_file)
+            entry['version'] = state_machine_dict.get('version', state_machine_dict.get('state_machine_version'))
+            entry['root_state_storage_id'] = state_machine_dict.get('root_state_storage_id',
+                                                                    state_machine_dict.get('root_state_id'))
+        except (IOError, OSError, ValueError, AttributeError):
+            pass
+        return entry
+
+    def _get_packed_library_entry(self, library_path, mtime):
+        """Returns the index node of a library in the packed format"""
+        entry = {'library': True, 'packed': True, 'mtime': self._trusted_mtime(mtime),
+                 'state_machine_file': storage.STATEMACHINE_FILE, 'version': None, 'root_state_storage_id': None}
+        try:
+            with zipfile.ZipFile(library_path) as archive:
+                state_machine_dict = json.loads(archive.read(storage.STATEMACHINE_FILE).decode('utf-8'))
+            entry['version'] = state_machine_dict.get('version', state_machine_dict.get('state_machine_version'))
+            entry['root_state_storage_id'] = state_machine_dict.get('root_state_storage_id',
+                                                                    state_machine_dict.get('root_state_id'))
+        except (zipfile.BadZipfile, KeyError, IOError, OSError, ValueError, AttributeError):
+            pass
+        return entry
+
+    def get_library_entry(self, library_root_path, sub_path_elements):
+        """Returns the index node of a library
+
+        :param str library_root_path: the library root path
+        :param sub_path_elements: the names of the nested folders and the name of the library within the root path
+        :return: the modification time, the state machine file name, the version and the root state storage id of the
+            library or None if the library is not in the index
+        :rtype: dict
+        """
+        node = self._roots.get(library_root_path)
+        for name in sub_path_elements:
+            if node is None or 'entries' not in node:
+                return None
+            entries = node['entries']
+            node = entries.get(name, entries.get(name + storage.PACKED_STATE_MACHINE_EXTENSION))
+        return dict(node) if node is not None and node.get('library') else None
@@ -21,10 +21,12 @@ import os
 import shutil
 import copy
 import warnings
+from threading import Lock, RLock
 from gtkmvc3.observable import Observable
 
 from rafcon.core import interface
 from rafcon.core.storage import storage
+from rafcon.core.library_index import LibraryIndex
 from rafcon.core.custom_exceptions import LibraryNotFoundException
 import rafcon.core.config as config
 
@@ -65,13 +67,19 @@ class LibraryManager(Observable):
 
         # loaded libraries
         self._loaded_libraries = {}
-        self._libraries_instances = {}
+        self._library_interfaces = {}
+        # the libraries are loaded by at most one thread at a time, but different libraries can be loaded concurrently
+        self._library_loading_locks = {}
+        self._library_loading_locks_lock = Lock()
+        # the persistent index of the libraries, if enabled in the config
+        self._library_index = None
 
     def prepare_destruction(self):
         self.clean_loaded_libraries()
 
     def clean_loaded_libraries(self):
         self._loaded_libraries.clear()
+        self._library_interfaces.clear()
 
     def initialize(self):
         """Initializes the library manager
@@ -82,6 +90,7 @@ class LibraryManager(Observable):
         singleton.py before the state*.pys are loaded
         """
         logger.debug("Initializing LibraryManager: Loading libraries ... ")
+        self._update_library_index()
         self._libraries = {}
         self._library_root_paths = {}
         self._replaced_libraries = {}
@@ -123,8 +132,28 @@ class LibraryManager(Observable):
             logger.debug("Adding library '{1}' from {0}".format(library_root_path, library_root_key))
 
         self._libraries = OrderedDict(sorted(self._libraries.items()))
+        if self._library_index is not None:
+            self._library_index.save()
         logger.debug("Initialization of LibraryManager done")
 
+    def _update_library_index(self):
+        """Takes over the library index file from the config, the index is only reloaded if the file changed"""
+        index_file_path = config.global_config.get_config_value("LIBRARY_INDEX_FILE", None)
+        if index_file_path is None or index_file_path == "None":
+            self._library_index = None
+            return
+        index_file_path = self._clean_path(index_file_path)
+        if self._library_index is None or self._library_index.index_file_path != index_file_path:
+            self._library_index = LibraryIndex(index_file_path)
+
+    @property
+    def library_index(self):
+        """The persistent index of the libraries or None, if no index file is configured
+
+        :rtype: rafcon.core.library_index.LibraryIndex
+        """
+        return self._library_index
+
     @staticmethod
     def _clean_path(path):
         """Create a fully fissile absolute system path with no symbolic links and environment variables"""
@@ -145,9 +174,20 @@ class LibraryManager(Observable):
 
     def _load_libraries_from_root_path(self, library_root_key, library_root_path):
         self._library_root_paths[library_root_key] = library_root_path
-        self._libraries[library_root_key] = {}
-        self._load_nested_libraries(library_root_path, self._libraries[library_root_key])
-        self._libraries[library_root_key] = OrderedDict(sorted(self._libraries[library_root_key].items()))
+        self._libraries[library_root_key] = self._load_libraries_from_path(library_root_path)
+
+    def _load_libraries_from_path(self, library_root_path, sub_path_elements=(), force=False):
+        """Returns the libraries within a library root path or one of its sub folders
+
+        If a library index is used, only changed folders are listed, unless a refresh is forced.
+        """
+        if self._library_index is not None:
+            libraries = self._library_index.scan(library_root_path, sub_path_elements, force,
+                                                 check_entry=self.check_clean_path_of_library)
+            return OrderedDict() if libraries is None else libraries
+        libraries = {}
+        self._load_nested_libraries(os.path.join(library_root_path, *sub_path_elements), libraries)
+        return OrderedDict(sorted(libraries.items()))
 
     def check_clean_path_of_library(self, folder_path, folder_name):
         library_root_path = self._library_root_paths[self._get_library_root_key_for_os_path(folder_path)]
@@ -172,7 +212,11 @@ class LibraryManager(Observable):
         for library_name in os.listdir(library_path):
             library_folder_path, library_name = self.check_clean_path_of_library(library_path, library_name)
             full_library_path = os.path.join(library_path, library_name)
-            if os.path.isdir(full_library_path) and library_name[0] != '.':
+            if library_name[0] != '.' and library_name.endswith(storage.PACKED_STATE_MACHINE_EXTENSION) and \
+                    os.path.isfile(full_library_path):
+                # a library folder of the same name takes precedence
+                target_dict.setdefault(library_name[:-len(storage.PACKED_STATE_MACHINE_EXTENSION)], full_library_path)
+            elif os.path.isdir(full_library_path) and library_name[0] != '.':
                 if os.path.exists(os.path.join(full_library_path, storage.STATEMACHINE_FILE)) \
                         or os.path.exists(os.path.join(full_library_path, storage.STATEMACHINE_FILE_OLD)):
                     target_dict[library_name] = full_library_path
@@ -182,10 +226,52 @@ class LibraryManager(Observable):
                     target_dict[library_name] = OrderedDict(sorted(target_dict[library_name].items()))
 
     @Observable.observed
-    def refresh_libraries(self):
+    def refresh_libraries(self, library_path=None):
         """Deletes all loaded libraries and reloads them from the file system
+
+        :param str library_path: if given, only the libraries within this library path (a library root key optionally
+            followed by sub folders) are reloaded, whereby all folders of this path are listed again
         """
-        self.initialize()
+        if library_path is None:
+            self.initialize()
+            return
+        path_elements = [element for element in library_path.split(os.sep) if element]
+        library_root_key = path_elements[0] if path_elements else None
+        if library_root_key not in self._library_root_paths:
+            raise LibraryNotFoundException("There is no library root key '{0}'".format(library_root_key))
+        library_root_path = self._library_root_paths[library_root_key]
+        sub_path_elements = path_elements[1:]
+        if not sub_path_elements:
+            self._libraries[library_root_key] = self._load_libraries_from_path(library_root_path, force=True)
+        else:
+            # find the dictionary holding the refreshed folder, missing folders are created
+            parent_dict = self._libraries[library_root_key]
+            for element in sub_path_elements[:-1]:
+                if not isinstance(parent_dict.get(element), dict):
+                    parent_dict[element] = OrderedDict()
+                parent_dict = parent_dict[element]
+            name = sub_path_elements[-1]
+            os_path = os.path.join(library_root_path, *sub_path_elements)
+            if os.path.isfile(os_path + storage.PACKED_STATE_MACHINE_EXTENSION):
+                # the path points to a packed library, thus its folder is refreshed
+                self.refresh_libraries(os.path.dirname(library_path.rstrip(os.sep)))
+                return
+            elif not os.path.isdir(os_path):
+                parent_dict.pop(name, None)
+                if self._library_index is not None:
+                    self._library_index.scan(library_root_path, sub_path_elements)
+            elif os.path.exists(os.path.join(os_path, storage.STATEMACHINE_FILE)) or \
+                    os.path.exists(os.path.join(os_path, storage.STATEMACHINE_FILE_OLD)):
+                # the path points to a library, thus its folder is refreshed
+                self.refresh_libraries(os.path.dirname(library_path.rstrip(os.sep)))
+                return
+            else:
+                parent_dict[name] = self._load_libraries_from_path(library_root_path, sub_path_elements, force=True)
+            parent_items = sorted(parent_dict.items())
+            parent_dict.clear()
+            parent_dict.update(parent_items)
+        if self._library_index is not None:
+            self._library_index.save()
 
     #########################################################################
     # Properties for all class fields that must be observed by gtkmvc3
@@ -361,6 +447,8 @@ class LibraryManager(Observable):
             library_root_path = self._library_root_paths[library_root_key]
             path_elements_without_library_root = path[len(library_root_path)+1:].split(os.sep)
             library_name = path_elements_without_library_root[-1]
+            if library_name.endswith(storage.PACKED_STATE_MACHINE_EXTENSION) and os.path.isfile(path):
+                library_name = library_name[:-len(storage.PACKED_STATE_MACHINE_EXTENSION)]
             sub_library_path = ''
             if len(path_elements_without_library_root[:-1]):
                 sub_library_path = os.sep + os.sep.join(path_elements_without_library_root[:-1])
@@ -378,30 +466,59 @@ class LibraryManager(Observable):
     def get_library_state_copy_instance(self, lib_os_path):
         """ A method to get a state copy of the library specified via the lib_os_path.
 
+        Deprecated: library states share the template of the library (see :meth:`get_library_template`) and create
+        their private copy only when needed. This method returns a deep copy of this template.
+
         :param lib_os_path: the location of the library to get a copy for
-        :return:
+        :return: the version of the library and the copy of its root state
+        """
+        warnings.warn("LibraryManager.get_library_state_copy_instance is deprecated, use get_library_template and "
+                      "copy the template, if it is modified", log.RAFCONDeprecationWarning)
+        version, template = self.get_library_template(lib_os_path)
+        if config.global_config.get_config_value("NO_PROGRAMMATIC_CHANGE_OF_LIBRARY_STATES_PERFORMED", False):
+            return version, template
+        return version, copy.deepcopy(template)
+
+    def get_library_template(self, lib_os_path):
+        """Returns the shared template of the library specified via the lib_os_path
+
+        The template is the root state of the loaded library state machine. It is shared by all library states
+        referencing the library and must not be modified. Library states create their private copy of the template
+        only when it is needed (see :attr:`rafcon.core.states.library_state.LibraryState.state_copy`).
+
+        :param str lib_os_path: the location of the library
+        :return: the version of the library and its template
+        :rtype: str, rafcon.core.states.state.State
+        """
+        if lib_os_path not in self._loaded_libraries:
+            with self._get_library_loading_lock(lib_os_path):
+                if lib_os_path not in self._loaded_libraries:
+                    self._loaded_libraries[lib_os_path] = storage.load_state_machine_from_path(lib_os_path)
+        state_machine = self._loaded_libraries[lib_os_path]
+        return state_machine.version, state_machine.root_state
+
+    def _get_library_loading_lock(self, lib_os_path):
+        with self._library_loading_locks_lock:
+            if lib_os_path not in self._library_loading_locks:
+                self._library_loading_locks[lib_os_path] = RLock()
+            return self._library_loading_locks[lib_os_path]
+
+    def get_library_interface(self, lib_os_path):
+        """Returns the interface of the library specified via the lib_os_path
+
+        The interface is the root state of the library without its child states, i.e. its name, outcomes and data
+        ports. If the library was already loaded, its template is returned instead. Like the template, the interface is
+        shared and must not be modified.
+
+        :param str lib_os_path: the location of the library
+        :return: the version of the library and its interface
+        :rtype: str, rafcon.core.states.state.State
         """
-
-        # originally libraries were called like this; DO NOT DELETE; interesting for performance tests
-        # state_machine = storage.load_state_machine_from_path(lib_os_path)
-        # return state_machine.version, state_machine.root_state
-
-        # TODO observe changes on file system and update data
         if lib_os_path in self._loaded_libraries:
-            # this list can also be taken to open library state machines TODO -> implement it -> because faster
-            state_machine = self._loaded_libraries[lib_os_path]
-            # logger.info("Take copy of {0}".format(lib_os_path))
-            # as long as the a library state root state is never edited so the state first has to be copied here
-            state_copy = copy.deepcopy(state_machine.root_state)
-            return state_machine.version, state_copy
-        else:
-            state_machine = storage.load_state_machine_from_path(lib_os_path)
-            self._loaded_libraries[lib_os_path] = state_machine
-            if config.global_config.get_config_value("NO_PROGRAMMATIC_CHANGE_OF_LIBRARY_STATES_PERFORMED", False):
-                return state_machine.version, state_machine.root_state
-            else:
-                state_copy = copy.deepcopy(state_machine.root_state)
-                return state_machine.version, state_copy
+            return self.get_library_template(lib_os_path)
+        if lib_os_path not in self._library_interfaces:
+            self._library_interfaces[lib_os_path] = storage.load_root_state_interface_from_path(lib_os_path)
+        return self._library_interfaces[lib_os_path]
 
     def remove_library_from_file_system(self, library_path, library_name):
         """Remove library from hard disk."""
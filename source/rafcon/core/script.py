@@ -20,6 +20,7 @@ from future.utils import string_types
 from builtins import str
 import os
 import imp
+import hashlib
 import yaml
 from gtkmvc3.observable import Observable
 
@@ -45,6 +46,8 @@ class Script(Observable, yaml.YAMLObject):
     :ivar path: the path where the script resides
     :ivar filename: the full name of the script file
     :ivar _compiled_module: the compiled module
+    :ivar _compiled_module_hash: the hash of the script text the compiled module was built from
+    :ivar _template_script: the script of a library template, whose compiled module is shared
     :ivar _script_id: the id of the script
     :ivar check_path: a flag to indicate if the path should be checked for existence
 
@@ -58,6 +61,10 @@ class Script(Observable, yaml.YAMLObject):
         self._path = None
         self._filename = None
         self._compiled_module = None
+        self._compiled_module_hash = None
+        self._script_hash = None
+        self._script_file_mtime = None
+        self._template_script = None
         self._script_id = generate_script_id()
         self._parent = None
         self._check_path = check_path
@@ -76,7 +83,22 @@ class Script(Observable, yaml.YAMLObject):
     def script(self, value):
         if not isinstance(value, string_types):
             raise ValueError("The script text needs to be string")
-        self._script = value
+        if value != self._script:
+            # the in-memory script now differs from the one loaded from the file system
+            self._script_hash = None
+            self._script_file_mtime = None
+            self._script = value
+            # the script is part of the hash of its execution state
+            if self.parent is not None:
+                self.parent.invalidate_hash_digest()
+
+    @property
+    def script_hash(self):
+        """Hash of the current script text, used to decide whether the compiled module is still valid"""
+        if self._script_hash is None:
+            script = self._script if isinstance(self._script, bytes) else self._script.encode('utf-8')
+            self._script_hash = hashlib.md5(script).hexdigest()
+        return self._script_hash
 
     def execute(self, state, inputs=None, outputs=None, backward_execution=False):
         """Execute the user 'execute' function specified in the script
@@ -115,6 +137,60 @@ class Script(Observable, yaml.YAMLObject):
             raise IOError("Script file could not be opened or was empty: {0}"
                           "".format(os.path.join(self.path, self.filename)))
         self.script = script_text
+        self._script_file_mtime = self._get_script_file_mtime()
+
+    def _get_script_file_mtime(self):
+        """Returns the modification time of the script file or None if it does not exist"""
+        try:
+            return os.path.getmtime(os.path.join(self.path, self.filename))
+        except (OSError, TypeError):
+            return None
+
+    def _script_file_changed(self):
+        """Checks whether the script file was modified on disk since it has been loaded
+
+        Only scripts that were loaded from the file system and not modified in memory afterwards are considered.
+        """
+        if self._script_file_mtime is None:
+            return False
+        mtime = self._get_script_file_mtime()
+        return mtime is not None and mtime != self._script_file_mtime
+
+    def reload_script_if_changed(self):
+        """Reloads the script if it was loaded from the file system and the file was modified since then"""
+        if self._script_file_changed():
+            logger.info("Script file of {0} changed on disk and is reloaded".format(self.parent))
+            self._load_script()
+
+    def build_module_if_required(self):
+        """Builds the module only if the compiled module is missing or outdated
+
+        The compiled module is reused as long as the script text did not change. If the script was loaded from the
+        file system and the file was modified since then, the script is reloaded before.
+
+        :raises exceptions.IOError: if the compilation of the script module failed
+        """
+        self.reload_script_if_changed()
+        if self._compiled_module is None or self._compiled_module_hash != self.script_hash:
+            template_script = self._template_script
+            if template_script is not None and template_script.script_hash == self.script_hash:
+                template_script.build_module_if_required()
+                self.compiled_module = template_script.compiled_module
+                self._compiled_module_hash = template_script._compiled_module_hash
+            else:
+                self.build_module()
+
+    def share_compiled_module(self, template_script):
+        """Shares the compiled module of the script of a library template
+
+        The private copies of a library template use the module compiled for the template, as long as their script
+        equals the one of the template. Thus, a library script is compiled only once for all library states and its
+        module globals are shared by them.
+
+        :param Script template_script: the script of the template
+        """
+        self._template_script = template_script
+        self._script_hash = template_script._script_hash
 
     def build_module(self):
         """Builds a temporary module from the script file
@@ -123,6 +199,7 @@ class Script(Observable, yaml.YAMLObject):
         """
         try:
             imp.acquire_lock()
+            script_hash = self.script_hash
             module_name = os.path.splitext(self.filename)[0] + str(self._script_id)
 
             # load module
@@ -137,6 +214,7 @@ class Script(Observable, yaml.YAMLObject):
 
             # return the module
             self.compiled_module = tmp_module
+            self._compiled_module_hash = script_hash
         finally:
             imp.release_lock()
 
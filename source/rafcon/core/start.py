@@ -28,7 +28,6 @@ import argparse
 from os.path import realpath, dirname, join, exists
 import signal
 import time
-from queue import Empty
 import threading
 import sys
 
@@ -39,7 +38,6 @@ import rafcon.utils.filesystem as filesystem
 from rafcon.core.config import global_config
 import rafcon.core.singleton as core_singletons
 from rafcon.core.storage import storage
-from rafcon.core.states.state import StateExecutionStatus
 
 from rafcon.utils import plugins
 from rafcon.utils import log
@@ -134,6 +132,18 @@ def setup_argument_parser():
                         help="path within a state machine to the state that should be launched. The state path "
                              "consists of state ids (e.g. QPOXGD/YVWJKZ whereof QPOXGD is the root state and YVWJKZ "
                              "it's child state to start from).")
+    parser.add_argument('-b', '--batch', metavar='path', dest='batch_table_path', default=None,
+                        help="execute the state machine once for each row of the given parameter table (CSV file with "
+                             "the names of the root state's input data ports as header or JSON file with a list of "
+                             "dictionaries) in parallel worker processes")
+    parser.add_argument('--batch_results', metavar='path', dest='batch_results_path', default=None,
+                        help="file to which the final outcome, the output data and the duration of each run of the "
+                             "batch is appended. Default: the path of the parameter table with suffix "
+                             "'_results.jsonl'")
+    parser.add_argument('--batch_processes', type=int, metavar='number', dest='batch_processes', default=None,
+                        help="number of worker processes executing the batch. Default: number of CPUs")
+    parser.add_argument('--batch_resume', action='store_true', dest='batch_resume',
+                        help="skip all runs of the batch that are already recorded in the results file")
     return parser
 
 
@@ -180,21 +190,10 @@ def wait_for_state_machine_finished(state_machine):
     """
     global _user_abort
 
-    from rafcon.core.states.execution_state import ExecutionState
-    if not isinstance(state_machine.root_state, ExecutionState):
-        while len(state_machine.execution_histories[0]) < 1:
-            time.sleep(0.1)
-    else:
-        time.sleep(0.5)
-
-    while state_machine.root_state.state_execution_status is not StateExecutionStatus.INACTIVE:
-        try:
-            state_machine.root_state.concurrency_queue.get(timeout=1)
-            # this check triggers if the state machine could not be stopped in the signal handler
-            if _user_abort:
-                return
-        except Empty:
-            pass
+    while not state_machine.wait_for_execution_finished(timeout=1):
+        # this check triggers if the state machine could not be stopped in the signal handler
+        if _user_abort:
+            return
         # no logger output here to make it easier for the parser
         logger.verbose("RAFCON live signal")
 
@@ -247,6 +246,27 @@ def register_signal_handlers(callback):
         signal.signal(signal_code, callback)
 
 
+def run_batch(user_input):
+    """Executes the state machine for all rows of a parameter table
+
+    :param user_input: the parsed arguments
+    """
+    from rafcon.core.batch_execution import run_batch as execute_batch
+    if len(user_input.state_machine_path) != 1:
+        logger.error("A batch can only be executed for exactly one state machine")
+        exit(-1)
+    results_path = user_input.batch_results_path
+    if results_path is None:
+        results_path = os.path.splitext(user_input.batch_table_path)[0] + "_results.jsonl"
+    start_time = time.time()
+    records = execute_batch(user_input.state_machine_path[0], user_input.batch_table_path, results_path,
+                            processes=user_input.batch_processes, resume=user_input.batch_resume,
+                            config_path=user_input.config_path, parser_result=vars(user_input),
+                            abort_check=lambda: _user_abort)
+    logger.info("Executed {0} runs of the batch in {1:.3f} s, results are stored in {2}".format(
+        len(records), time.time() - start_time, results_path))
+
+
 def main():
     register_signal_handlers(signal_handler)
 
@@ -263,6 +283,10 @@ def main():
         logger.error("You have to specify a valid state machine path")
         exit(-1)
 
+    if user_input.batch_table_path:
+        run_batch(user_input)
+        return
+
     setup_configuration(user_input.config_path)
 
     post_setup_plugins(user_input)
@@ -100,6 +100,11 @@ class DataFlow(StateElement):
     def state_element_id(self):
         return self._data_flow_id
 
+    def _invalidate_parent_data_flow_index(self):
+        """Informs the parent that the ports of the data flow changed and its data flow index is outdated"""
+        if self.parent is not None:
+            self.parent._invalidate_data_flow_index()
+
     @classmethod
     def from_dict(cls, dictionary):
         from_state = dictionary['from_state']
@@ -147,6 +152,7 @@ class DataFlow(StateElement):
             self._from_state = old_from_state
             self._from_key = old_from_key
             raise ValueError("The data flow origin could not be changed: {0}".format(message))
+        self._invalidate_parent_data_flow_index()
 
     @property
     def from_state(self):
@@ -162,6 +168,7 @@ class DataFlow(StateElement):
             raise ValueError("from_state must be a string")
 
         self._change_property_with_validity_check('_from_state', from_state)
+        self._invalidate_parent_data_flow_index()
 
     @property
     def from_key(self):
@@ -177,6 +184,7 @@ class DataFlow(StateElement):
             raise ValueError("from_key must be of type int")
 
         self._change_property_with_validity_check('_from_key', from_key)
+        self._invalidate_parent_data_flow_index()
 
     @lock_state_machine
     @Observable.observed
@@ -202,6 +210,7 @@ class DataFlow(StateElement):
             self._to_state = old_to_state
             self._to_key = old_to_key
             raise ValueError("The data flow target could not be changed: {0}".format(message))
+        self._invalidate_parent_data_flow_index()
 
     @property
     def to_state(self):
@@ -217,6 +226,7 @@ class DataFlow(StateElement):
             raise ValueError("to_state must be a string")
 
         self._change_property_with_validity_check('_to_state', to_state)
+        self._invalidate_parent_data_flow_index()
 
     @property
     def to_key(self):
@@ -232,6 +242,7 @@ class DataFlow(StateElement):
             raise ValueError("to_key must be of type int")
 
         self._change_property_with_validity_check('_to_key', to_key)
+        self._invalidate_parent_data_flow_index()
 
     @property
     def data_flow_id(self):
@@ -44,6 +44,8 @@ class StateElement(Observable, YAMLObject, JSONObject, Hashable):
     :ivar rafcon.core.states.state.State StateElement.parent: Parent state of the state element
     """
     _parent = None
+    # the digest is invalidated by every observed method (see _notify_method_after)
+    cache_hash_digest = True
 
     yaml_tag = u'!StateElement'
 
@@ -145,6 +147,19 @@ class StateElement(Observable, YAMLObject, JSONObject, Hashable):
     def update_hash(self, obj_hash):
         return Hashable.update_hash_from_dict(obj_hash, self.to_dict())
 
+    @lock_state_machine
+    def get_hash_digest(self):
+        return super(StateElement, self).get_hash_digest()
+
+    def get_hash_parent(self):
+        return self.parent
+
+    def _notify_method_after(self, instance, name, res_val, args, kwargs):
+        # the data fields of the state element may have been changed by any observed method, the observers are
+        # notified afterwards, as they might hash the state element
+        self.invalidate_hash_digest()
+        super(StateElement, self)._notify_method_after(instance, name, res_val, args, kwargs)
+
     @classmethod
     def from_dict(cls, dictionary):
         raise NotImplementedError()
@@ -84,6 +84,11 @@ class Transition(StateElement):
     def state_element_id(self):
         return self._transition_id
 
+    def _invalidate_parent_transition_index(self):
+        """Informs the parent that the origin of the transition changed and its transition index is outdated"""
+        if self.parent is not None:
+            self.parent._invalidate_transition_index()
+
     @classmethod
     def from_dict(cls, dictionary):
         transition_id = dictionary['transition_id']
@@ -132,6 +137,7 @@ class Transition(StateElement):
             self._from_state = old_from_state
             self._from_outcome = old_from_outcome
             raise ValueError("The transition origin could not be changed: {0}".format(message))
+        self._invalidate_parent_transition_index()
 
     @lock_state_machine
     @Observable.observed
@@ -175,6 +181,7 @@ class Transition(StateElement):
             raise ValueError("from_state must be a string")
 
         self._change_property_with_validity_check('_from_state', from_state)
+        self._invalidate_parent_transition_index()
 
     @property
     def from_outcome(self):
@@ -191,6 +198,7 @@ class Transition(StateElement):
             raise ValueError("from_outcome must be of type int")
 
         self._change_property_with_validity_check('_from_outcome', from_outcome)
+        self._invalidate_parent_transition_index()
 
     @property
     def to_state(self):
@@ -26,14 +26,15 @@ from future.utils import string_types
 from builtins import range
 from contextlib import contextmanager
 from copy import copy
-from threading import RLock
+from threading import RLock, Event
 from datetime import datetime
 
 from gtkmvc3.observable import Observable
 from jsonconversion.jsonobject import JSONObject
 
 import rafcon
-from rafcon.core.execution.execution_history import ExecutionHistory, ExecutionHistoryStorage
+from rafcon.core.execution.execution_history import ExecutionHistory, ExecutionHistoryStorage, \
+    BufferedExecutionHistoryStorage, StreamExecutionHistoryStorage, BufferedStreamExecutionHistoryStorage
 from rafcon.core.id_generator import generate_state_machine_id, run_id_generator
 from rafcon.utils import log
 from rafcon.utils.hashable import Hashable
@@ -70,6 +71,11 @@ class StateMachine(Observable, JSONObject, Hashable):
         Observable.__init__(self)
 
         self._modification_lock = RLock()
+        # the execution engine, which executes the state machine; None for the default execution engine
+        self.execution_engine = None
+        # set as long as the state machine is not executed
+        self._execution_finished = Event()
+        self._execution_finished.set()
 
         if state_machine_id is None:
             self.state_machine_id = generate_state_machine_id()
@@ -138,12 +144,17 @@ class StateMachine(Observable, JSONObject, Hashable):
     def start(self):
         """Starts the execution of the root state.
         """
-        # load default input data for the state
-        self._root_state.input_data = self._root_state.get_default_input_values_for_state(self._root_state)
-        self._root_state.output_data = self._root_state.create_output_dictionary_for_state(self._root_state)
-        new_execution_history = self._add_new_execution_history()
-        new_execution_history.push_state_machine_start_history_item(self, run_id_generator())
-        self._root_state.start(new_execution_history)
+        self._execution_finished.clear()
+        try:
+            # load default input data for the state
+            self._root_state.input_data = self._root_state.get_default_input_values_for_state(self._root_state)
+            self._root_state.output_data = self._root_state.create_output_dictionary_for_state(self._root_state)
+            new_execution_history = self._add_new_execution_history()
+            new_execution_history.push_state_machine_start_history_item(self, run_id_generator())
+            self._root_state.start(new_execution_history)
+        except Exception:
+            self._execution_finished.set()
+            raise
 
     def join(self):
         """Wait for root state to finish execution"""
@@ -155,6 +166,24 @@ class StateMachine(Observable, JSONObject, Hashable):
                 self._execution_histories[-1].execution_history_storage.close(set_read_and_writable_for_all)
         from rafcon.core.states.state import StateExecutionStatus
         self._root_state.state_execution_status = StateExecutionStatus.INACTIVE
+        self._execution_finished.set()
+
+    def wait_for_execution_finished(self, timeout=None):
+        """Wait for the execution of the state machine to finish
+
+        The execution is finished as soon as the root state finished, was stopped or aborted due to an error and the
+        execution log was closed. If the state machine is not executed, the method returns immediately.
+
+        :param float timeout: Maximum time to wait, None if infinitely
+        :return: True if the execution finished, False if the timeout was reached
+        :rtype: bool
+        """
+        return self._execution_finished.wait(timeout)
+
+    @property
+    def execution_finished(self):
+        """Whether the state machine is currently not executed"""
+        return self._execution_finished.is_set()
 
     def get_modification_lock(self):
         return self._modification_lock
@@ -225,7 +254,11 @@ class StateMachine(Observable, JSONObject, Hashable):
 
     @Observable.observed
     def _add_new_execution_history(self):
-        new_execution_history = ExecutionHistory()
+        max_items_in_memory = global_config.get_config_value("EXECUTION_HISTORY_MAX_ITEMS_IN_MEMORY", None)
+        max_age_in_memory = global_config.get_config_value("EXECUTION_HISTORY_MAX_AGE_IN_MEMORY", None)
+        new_execution_history = ExecutionHistory(
+            max_items_in_memory=None if max_items_in_memory == "None" else max_items_in_memory,
+            max_age_in_memory=None if max_age_in_memory == "None" else max_age_in_memory)
 
         if global_config.get_config_value("EXECUTION_LOG_ENABLE", False):
             base_dir = global_config.get_config_value("EXECUTION_LOG_PATH", "%RAFCON_TEMP_PATH_BASE/execution_logs")
@@ -233,12 +266,32 @@ class StateMachine(Observable, JSONObject, Hashable):
                 base_dir = base_dir.replace('%RAFCON_TEMP_PATH_BASE', RAFCON_TEMP_PATH_BASE)
             if not os.path.exists(base_dir):
                 os.makedirs(base_dir)
-            shelve_name = os.path.join(base_dir, '%s_rafcon_execution_log_%s.shelve' %
+            stream_log = global_config.get_config_value("EXECUTION_LOG_FORMAT", "shelve") == "stream"
+            shelve_name = os.path.join(base_dir, '%s_rafcon_execution_log_%s.%s' %
                                        (time.strftime('%Y-%m-%d-%H:%M:%S', time.localtime()),
-                                        self.root_state.name.replace(' ', '-')))
-            execution_history_store = ExecutionHistoryStorage(shelve_name)
+                                        self.root_state.name.replace(' ', '-'),
+                                        'log' if stream_log else 'shelve'))
+            state_catalogue = global_config.get_config_value("EXECUTION_LOG_STATE_CATALOGUE", False)
+            if global_config.get_config_value("EXECUTION_LOG_ASYNCHRONOUS_WRITER", False):
+                storage_class = BufferedStreamExecutionHistoryStorage if stream_log else BufferedExecutionHistoryStorage
+                execution_history_store = storage_class(
+                    shelve_name,
+                    queue_size=global_config.get_config_value("EXECUTION_LOG_QUEUE_SIZE", 1000),
+                    flush_interval=global_config.get_config_value("EXECUTION_LOG_FLUSH_INTERVAL", 1.),
+                    back_pressure=global_config.get_config_value("EXECUTION_LOG_BACK_PRESSURE", "block"),
+                    state_catalogue=state_catalogue)
+            elif stream_log:
+                execution_history_store = StreamExecutionHistoryStorage(shelve_name, state_catalogue)
+            else:
+                execution_history_store = ExecutionHistoryStorage(shelve_name, state_catalogue)
             new_execution_history.set_execution_history_storage(execution_history_store)
         self._execution_histories.append(new_execution_history)
+
+        # the histories of past executions are destroyed, if more than the maximum number of histories are kept
+        max_histories_in_memory = global_config.get_config_value("EXECUTION_HISTORY_MAX_HISTORIES_IN_MEMORY", None)
+        if max_histories_in_memory not in (None, "None"):
+            while len(self._execution_histories) > max(int(max_histories_in_memory), 1):
+                self._execution_histories.pop(0).destroy()
         return new_execution_history
 
     @Observable.observed
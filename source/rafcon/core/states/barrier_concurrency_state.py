@@ -70,6 +70,7 @@ class BarrierConcurrencyState(ConcurrencyState):
         if decider_state is not None:
             if isinstance(decider_state, DeciderState):
                 decider_state._state_id = UNIQUE_DECIDER_STATE_ID
+                decider_state._invalidate_path_cache()
                 states[UNIQUE_DECIDER_STATE_ID] = decider_state
             else:
                 logger.warning("Argument decider_state has to be instance of DeciderState not {}".format(decider_state))
@@ -195,8 +196,8 @@ class BarrierConcurrencyState(ConcurrencyState):
         # standard state execution
         decider_state.input_data = self.get_inputs_for_state(decider_state)
         decider_state.output_data = self.create_output_dictionary_for_state(decider_state)
-        decider_state.start(self.execution_history, backward_execution=False)
-        decider_state.join()
+        self.execution_engine.run_child_state(decider_state, self.execution_history,
+                                              backward_execution=False)
         decider_state_error = None
         if decider_state.final_outcome.outcome_id == -1:
             if 'error' in decider_state.output_data:
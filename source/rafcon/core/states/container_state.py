@@ -29,7 +29,6 @@ from rafcon.core.custom_exceptions import RecoveryModeException
 from rafcon.core.decorators import lock_state_machine
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
 from rafcon.core.id_generator import *
-from rafcon.core.singleton import state_machine_execution_engine
 from rafcon.core.state_elements.data_flow import DataFlow
 from rafcon.core.state_elements.logical_port import Outcome
 from rafcon.core.state_elements.scope import ScopedData, ScopedVariable
@@ -73,9 +72,16 @@ class ContainerState(State):
 
         self._states = OrderedDict()
         self._transitions = {}
+        # index (from_state, from_outcome) -> transition, built lazily and reset on structural changes
+        self._transitions_by_origin = None
         self._data_flows = {}
+        # indices (from_state, from_key) -> [data flows] and (to_state, to_key) -> [data flows], built lazily and
+        # reset on structural changes
+        self._data_flows_by_port = None
         self._scoped_variables = {}
         self._scoped_data = {}
+        # key -> (scoped data entry, immutable copy of the entry) of the last scoped data snapshot
+        self._scoped_data_snapshots = {}
         self._current_state = None
         # condition variable to wait for not connected states
         self._transitions_cv = Condition()
@@ -249,6 +255,7 @@ class ContainerState(State):
         super(ContainerState, self).setup_run()
         # reset the scoped data
         self._scoped_data = {}
+        self._scoped_data_snapshots = {}
         self._start_state_modified = False
         self.add_default_values_of_scoped_variables_to_scoped_data()
         self.add_input_data_to_scoped_data(self.input_data)
@@ -283,7 +290,7 @@ class ContainerState(State):
                 return None
 
             # depending on the execution mode pause execution
-            execution_signal = state_machine_execution_engine.handle_execution_mode(self)
+            execution_signal = self.execution_engine.handle_execution_mode(self)
             if execution_signal is StateMachineExecutionStatus.STOPPED:
                 # this will be caught at the end of the run method
                 self.last_child.state_execution_status = StateExecutionStatus.INACTIVE
@@ -310,7 +317,7 @@ class ContainerState(State):
         start_state = self.get_start_state(set_final_outcome=True)
         while not start_state:
             # depending on the execution mode pause execution
-            execution_signal = state_machine_execution_engine.handle_execution_mode(self)
+            execution_signal = self.execution_engine.handle_execution_mode(self)
             if execution_signal is StateMachineExecutionStatus.STOPPED:
                 # this will be caught at the end of the run method
                 return None
@@ -1089,10 +1096,11 @@ class ContainerState(State):
         """
 
         # overwrite the start state in the case that a specific start state is specific e.g. by start_from_state
-        if self.get_path() in state_machine_execution_engine.start_state_paths:
+        start_state_paths = self.execution_engine.start_state_paths
+        if self.get_path() in start_state_paths:
             for state_id, state in self.states.items():
-                if state.get_path() in state_machine_execution_engine.start_state_paths:
-                    state_machine_execution_engine.start_state_paths.remove(self.get_path())
+                if state.get_path() in start_state_paths:
+                    start_state_paths.remove(self.get_path())
                     self._start_state_modified = True
                     return state
 
@@ -1209,6 +1217,7 @@ class ContainerState(State):
         else:
             self.transitions[transition_id] = \
                 Transition(None, None, to_state_id, to_outcome, transition_id, self)
+        self._invalidate_transition_index()
 
         # notify all states waiting for transition to be connected
         with self._transitions_cv:
@@ -1239,6 +1248,7 @@ class ContainerState(State):
 
         new_transition = Transition(from_state_id, from_outcome, to_state_id, to_outcome, transition_id, self)
         self.transitions[transition_id] = new_transition
+        self._invalidate_transition_index()
 
         # notify all states waiting for transition to be connected
         with self._transitions_cv:
@@ -1258,11 +1268,27 @@ class ContainerState(State):
             raise TypeError("state must be of type State")
         if not isinstance(outcome, Outcome):
             raise TypeError("outcome must be of type Outcome")
-        result_transition = None
-        for key, transition in self.transitions.items():
-            if transition.from_state == state.state_id and transition.from_outcome == outcome.outcome_id:
-                result_transition = transition
-        return result_transition
+        return self._get_transition_index().get((state.state_id, outcome.outcome_id))
+
+    def _get_transition_index(self):
+        """Returns the index mapping the origin (from_state, from_outcome) of each transition to the transition
+
+        The index is built on first usage after it was invalidated.
+
+        :return: the transition index
+        :rtype: dict
+        """
+        transition_index = self._transitions_by_origin
+        if transition_index is None:
+            transition_index = {(transition.from_state, transition.from_outcome): transition
+                                for transition in list(self._transitions.values())}
+            self._transitions_by_origin = transition_index
+        return transition_index
+
+    def _invalidate_transition_index(self):
+        """Resets the transition index, which has to be done after each change of the transitions or their origins
+        """
+        self._transitions_by_origin = None
 
     @lock_state_machine
     @Observable.observed
@@ -1278,7 +1304,9 @@ class ContainerState(State):
             raise AttributeError("The transition_id %s does not exist" % str(transition_id))
 
         self.transitions[transition_id].parent = None
-        return self.transitions.pop(transition_id)
+        transition = self.transitions.pop(transition_id)
+        self._invalidate_transition_index()
+        return transition
 
     @lock_state_machine
     def remove_outcome_hook(self, outcome_id):
@@ -1329,6 +1357,7 @@ class ContainerState(State):
 
         self.data_flows[data_flow_id] = DataFlow(from_state_id, from_data_port_id, to_state_id, to_data_port_id,
                                                  data_flow_id, self)
+        self._invalidate_data_flow_index()
         return data_flow_id
 
     @lock_state_machine
@@ -1343,7 +1372,33 @@ class ContainerState(State):
             raise AttributeError("The data_flow_id %s does not exist" % str(data_flow_id))
 
         self._data_flows[data_flow_id].parent = None
-        return self._data_flows.pop(data_flow_id)
+        data_flow = self._data_flows.pop(data_flow_id)
+        self._invalidate_data_flow_index()
+        return data_flow
+
+    def _get_data_flow_index(self):
+        """Returns the indices mapping the origin and the target ports of all data flows to these data flows
+
+        The indices are built on first usage after they were invalidated.
+
+        :return: the dicts (from_state, from_key) -> [data flows] and (to_state, to_key) -> [data flows]
+        :rtype: tuple
+        """
+        data_flow_index = self._data_flows_by_port
+        if data_flow_index is None:
+            data_flows_by_origin = {}
+            data_flows_by_target = {}
+            for data_flow in list(self._data_flows.values()):
+                data_flows_by_origin.setdefault((data_flow.from_state, data_flow.from_key), []).append(data_flow)
+                data_flows_by_target.setdefault((data_flow.to_state, data_flow.to_key), []).append(data_flow)
+            data_flow_index = data_flows_by_origin, data_flows_by_target
+            self._data_flows_by_port = data_flow_index
+        return data_flow_index
+
+    def _invalidate_data_flow_index(self):
+        """Resets the data flow indices, which has to be done after each change of the data flows or their ports
+        """
+        self._data_flows_by_port = None
 
     @lock_state_machine
     def remove_data_flows_with_data_port_id(self, data_port_id):
@@ -1505,26 +1560,53 @@ class ContainerState(State):
         tmp_dict = self.get_default_input_values_for_state(state)
         result_dict.update(tmp_dict)
 
+        _, data_flows_by_target = self._get_data_flow_index()
         for input_port_key, value in state.input_data_ports.items():
             # for all input keys fetch the correct data_flow connection and read data into the result_dict
             actual_value = None
             actual_value_time = 0
-            for data_flow_key, data_flow in self.data_flows.items():
-
-                if data_flow.to_key == input_port_key:
-                    if data_flow.to_state == state.state_id:
-                        # fetch data from the scoped_data list: the key is the data_port_key + the state_id
-                        key = str(data_flow.from_key) + data_flow.from_state
-                        if key in self.scoped_data:
-                            if actual_value is None or actual_value_time < self.scoped_data[key].timestamp:
-                                actual_value = deepcopy(self.scoped_data[key].value)
-                                actual_value_time = self.scoped_data[key].timestamp
+            for data_flow in data_flows_by_target.get((state.state_id, input_port_key), ()):
+                # fetch data from the scoped_data list: the key is the data_port_key + the state_id
+                key = str(data_flow.from_key) + data_flow.from_state
+                if key in self.scoped_data:
+                    if actual_value is None or actual_value_time < self.scoped_data[key].timestamp:
+                        actual_value = deepcopy(self.scoped_data[key].value)
+                        actual_value_time = self.scoped_data[key].timestamp
 
             if actual_value is not None:
                 result_dict[value.name] = actual_value
 
         return result_dict
 
+    def get_scoped_data_snapshot(self, memo=None):
+        """Creates a snapshot of the current scoped data
+
+        The scoped data entries are never modified in place, but replaced by new :class:`ScopedData` objects whenever
+        a value is written. Thus, only entries that were replaced since the last snapshot are deep copied; all other
+        entries share the copy made for the previous snapshot. The entries of the returned dictionary must be
+        treated as immutable.
+
+        :param dict memo: an optional deepcopy memo dictionary, which is extended by the mapping of the ids of the
+            current scoped data values to their copies in the snapshot, so that other copies can share these values
+        :return: a new dictionary mapping the scoped data keys to copies of the scoped data entries
+        :rtype: dict
+        """
+        previous_snapshots = self._scoped_data_snapshots
+        snapshots = {}
+        snapshot = {}
+        for key, scoped_data in list(self._scoped_data.items()):
+            previous_snapshot = previous_snapshots.get(key)
+            if previous_snapshot is not None and previous_snapshot[0] is scoped_data:
+                snapshot_entry = previous_snapshot[1]
+            else:
+                snapshot_entry = deepcopy(scoped_data)
+            snapshots[key] = (scoped_data, snapshot_entry)
+            snapshot[key] = snapshot_entry
+            if memo is not None:
+                memo[id(scoped_data.value)] = snapshot_entry.value
+        self._scoped_data_snapshots = snapshots
+        return snapshot
+
     # ---------------------------------------------------------------------------------------------
     # ---------------------------- functions to modify the scoped data ----------------------------
     # ---------------------------------------------------------------------------------------------
@@ -1539,19 +1621,22 @@ class ContainerState(State):
         :param dictionary: The dictionary that is added to the scoped data
         :param state: The state to which the input_data was passed (should be self in most cases)
         """
+        data_flows_by_origin, _ = self._get_data_flow_index()
+        input_data_ports_by_name = {data_port.name: (data_port_key, data_port)
+                                    for data_port_key, data_port in list(self.input_data_ports.items())}
         for dict_key, value in dictionary.items():
-            for input_data_port_key, data_port in list(self.input_data_ports.items()):
-                if dict_key == data_port.name:
-                    self.scoped_data[str(input_data_port_key) + self.state_id] = \
-                        ScopedData(data_port.name, value, type(value), self.state_id, ScopedVariable, parent=self)
-                    # forward the data to scoped variables
-                    for data_flow_key, data_flow in self.data_flows.items():
-                        if data_flow.from_key == input_data_port_key and data_flow.from_state == self.state_id:
-                            if data_flow.to_state == self.state_id and data_flow.to_key in self.scoped_variables:
-                                current_scoped_variable = self.scoped_variables[data_flow.to_key]
-                                self.scoped_data[str(data_flow.to_key) + self.state_id] = \
-                                    ScopedData(current_scoped_variable.name, value, type(value), self.state_id,
-                                               ScopedVariable, parent=self)
+            if dict_key not in input_data_ports_by_name:
+                continue
+            input_data_port_key, data_port = input_data_ports_by_name[dict_key]
+            self.scoped_data[str(input_data_port_key) + self.state_id] = \
+                ScopedData(data_port.name, value, type(value), self.state_id, ScopedVariable, parent=self)
+            # forward the data to scoped variables
+            for data_flow in data_flows_by_origin.get((self.state_id, input_data_port_key), ()):
+                if data_flow.to_state == self.state_id and data_flow.to_key in self.scoped_variables:
+                    current_scoped_variable = self.scoped_variables[data_flow.to_key]
+                    self.scoped_data[str(data_flow.to_key) + self.state_id] = \
+                        ScopedData(current_scoped_variable.name, value, type(value), self.state_id,
+                                   ScopedVariable, parent=self)
 
     @lock_state_machine
     def add_state_execution_output_to_scoped_data(self, dictionary, state):
@@ -1560,17 +1645,20 @@ class ContainerState(State):
         :param dictionary: The dictionary that is added to the scoped data
         :param state: The state that finished execution and provide the dictionary
         """
+        output_data_ports_by_name = {data_port.name: (data_port_key, data_port)
+                                     for data_port_key, data_port in list(state.output_data_ports.items())}
         for output_name, value in dictionary.items():
-            for output_data_port_key, data_port in list(state.output_data_ports.items()):
-                if output_name == data_port.name:
-                    if not isinstance(value, data_port.data_type):
-                        if (not ((type(value) is float or type(value) is int) and
-                                     (data_port.data_type is float or data_port.data_type is int)) and
-                                not (isinstance(value, type(None)))):
-                            logger.error("The data type of output port {0} should be of type {1}, but is of type {2}".
-                                         format(output_name, data_port.data_type, type(value)))
-                    self.scoped_data[str(output_data_port_key) + state.state_id] = \
-                        ScopedData(data_port.name, value, type(value), state.state_id, OutputDataPort, parent=self)
+            if output_name not in output_data_ports_by_name:
+                continue
+            output_data_port_key, data_port = output_data_ports_by_name[output_name]
+            if not isinstance(value, data_port.data_type):
+                if (not ((type(value) is float or type(value) is int) and
+                             (data_port.data_type is float or data_port.data_type is int)) and
+                        not (isinstance(value, type(None)))):
+                    logger.error("The data type of output port {0} should be of type {1}, but is of type {2}".
+                                 format(output_name, data_port.data_type, type(value)))
+            self.scoped_data[str(output_data_port_key) + state.state_id] = \
+                ScopedData(data_port.name, value, type(value), state.state_id, OutputDataPort, parent=self)
 
     @lock_state_machine
     def add_default_values_of_scoped_variables_to_scoped_data(self):
@@ -1589,25 +1677,23 @@ class ContainerState(State):
         :param: the dictionary to update the scoped variables with
         :param: the state the output dictionary belongs to
         """
+        data_flows_by_origin, _ = self._get_data_flow_index()
+        output_data_port_keys_by_name = {o_port.name: o_key for o_key, o_port in state.output_data_ports.items()}
         for key, value in dictionary.items():
-            output_data_port_key = None
             # search for the correct output data port key of the source state
-            for o_key, o_port in state.output_data_ports.items():
-                if o_port.name == key:
-                    output_data_port_key = o_key
-                    break
+            output_data_port_key = output_data_port_keys_by_name.get(key)
             if output_data_port_key is None:
                 if not key == "error":
                     logger.warning("Output variable %s was written during state execution, "
                                    "that has no data port connected to it.", str(key))
-            for data_flow_key, data_flow in self.data_flows.items():
-                if data_flow.from_key == output_data_port_key and data_flow.from_state == state.state_id:
-                    if data_flow.to_state == self.state_id:  # is target of data flow own state id?
-                        if data_flow.to_key in self.scoped_variables.keys():  # is target data port scoped?
-                            current_scoped_variable = self.scoped_variables[data_flow.to_key]
-                            self.scoped_data[str(data_flow.to_key) + self.state_id] = \
-                                ScopedData(current_scoped_variable.name, value, type(value), state.state_id,
-                                           ScopedVariable, parent=self)
+                continue
+            for data_flow in data_flows_by_origin.get((state.state_id, output_data_port_key), ()):
+                if data_flow.to_state == self.state_id:  # is target of data flow own state id?
+                    if data_flow.to_key in self.scoped_variables:  # is target data port scoped?
+                        current_scoped_variable = self.scoped_variables[data_flow.to_key]
+                        self.scoped_data[str(data_flow.to_key) + self.state_id] = \
+                            ScopedData(current_scoped_variable.name, value, type(value), state.state_id,
+                                       ScopedVariable, parent=self)
 
     # ---------------------------------------------------------------------------------------------
     # ------------------------ functions to modify the scoped data end ----------------------------
@@ -1628,15 +1714,26 @@ class ContainerState(State):
         for transition in self.transitions.values():
             if transition.from_state == old_state_id:
                 transition._from_state = self.state_id
+                transition.invalidate_hash_digest()
             if transition.to_state == old_state_id:
                 transition._to_state = self.state_id
+                transition.invalidate_hash_digest()
+        self._invalidate_transition_index()
 
         # change id in all data_flows
         for data_flow in self.data_flows.values():
             if data_flow.from_state == old_state_id:
                 data_flow._from_state = self.state_id
+                data_flow.invalidate_hash_digest()
             if data_flow.to_state == old_state_id:
                 data_flow._to_state = self.state_id
+                data_flow.invalidate_hash_digest()
+        self._invalidate_data_flow_index()
+
+    def _invalidate_path_cache(self):
+        super(ContainerState, self)._invalidate_path_cache()
+        for child_state in self.states.values():
+            child_state._invalidate_path_cache()
 
     def get_state_for_transition(self, transition):
         """Calculate the target state of a transition
@@ -2168,10 +2265,12 @@ class ContainerState(State):
                         transition_ids_to_delete.append(transition.transition_id)
                 else:
                     self._transitions = old_transitions
+                    self._invalidate_transition_index()
                     raise
 
         self._transitions = dict((transition_id, t) for (transition_id, t) in self._transitions.items()
                                  if transition_id not in transition_ids_to_delete)
+        self._invalidate_transition_index()
 
         # check that all old_transitions are no more referencing self as there parent
         for old_transition in old_transitions.values():
@@ -2225,10 +2324,12 @@ class ContainerState(State):
                         data_flow_ids_to_delete.append(data_flow.data_flow_id)
                 else:
                     self._data_flows = old_data_flows
+                    self._invalidate_data_flow_index()
                     raise
 
         self._data_flows = dict((data_flow_id, d) for (data_flow_id, d) in self._data_flows.items()
                                 if data_flow_id not in data_flow_ids_to_delete)
+        self._invalidate_data_flow_index()
 
         # check that all old_data_flows are no more referencing self as there parent
         for old_data_flow in old_data_flows.values():
@@ -2350,7 +2451,8 @@ class ContainerState(State):
         for key, s in scoped_data.items():
             if not isinstance(s, ScopedData):
                 raise TypeError("element of scoped_data must be of type ScopedData")
-        self._scoped_data = scoped_data
+        # the dictionary might be a snapshot of an execution history item, which must not be changed
+        self._scoped_data = dict(scoped_data)
 
     @property
     def child_execution(self):
@@ -26,6 +26,7 @@ from copy import copy, deepcopy
 
 from gtkmvc3.observable import Observable
 
+from rafcon.core.config import global_config
 from rafcon.core.states.state import State
 from rafcon.core.decorators import lock_state_machine
 from rafcon.core.state_elements.logical_port import Outcome
@@ -55,6 +56,7 @@ class ExecutionState(State):
         self.logger = log.get_logger(self.name)
         # here all persistent variables that should be available for the next state run should be stored
         self.persistent_variables = {}
+        self._execute_in_process = False
 
     def __hash__(self):
         return id(self)
@@ -74,6 +76,7 @@ class ExecutionState(State):
         state.description = deepcopy(self.description)
         state.semantic_data = deepcopy(self.semantic_data)
         state._file_system_path = self.file_system_path
+        state._execute_in_process = self._execute_in_process
         return state
 
     def __deepcopy__(self, memo=None, _nil=[]):
@@ -83,6 +86,8 @@ class ExecutionState(State):
     def update_hash(self, obj_hash):
         super(ExecutionState, self).update_hash(obj_hash)
         obj_hash.update(self.get_object_hash_string(self.script.script))
+        if self.execute_in_process:
+            obj_hash.update(self.get_object_hash_string(self.execute_in_process))
 
     @classmethod
     def from_dict(cls, dictionary):
@@ -99,15 +104,32 @@ class ExecutionState(State):
             import traceback
             formatted_lines = traceback.format_exc().splitlines()
             logger.warning("Erroneous description for state '{1}': {0}".format(formatted_lines[-1], dictionary['name']))
+        state.execute_in_process = dictionary.get('execute_in_process', False)
         return state
 
+    @staticmethod
+    def state_to_dict(state):
+        dict_representation = State.state_to_dict(state)
+        # the flag is only stored if set, so that the files of other states stay unchanged
+        if state.execute_in_process:
+            dict_representation['execute_in_process'] = True
+        return dict_representation
+
     def _execute(self, execute_inputs, execute_outputs, backward_execution=False):
         """Calls the custom execute function of the script.py of the state
 
         """
-        self._script.build_module()
-
-        outcome_item = self._script.execute(self, execute_inputs, execute_outputs, backward_execution)
+        recompile = global_config.get_config_value("SCRIPT_RECOMPILATION_ON_STATE_EXECUTION", False)
+        if self.execute_in_process:
+            self._script.reload_script_if_changed()
+            outcome_item = self.execution_engine.process_pool.execute_script(self, execute_inputs, execute_outputs,
+                                                                             backward_execution, recompile)
+        else:
+            if recompile:
+                self._script.build_module()
+            else:
+                self._script.build_module_if_required()
+            outcome_item = self._script.execute(self, execute_inputs, execute_outputs, backward_execution)
 
         # in the case of backward execution the outcome is not relevant
         if backward_execution:
@@ -200,6 +222,25 @@ class ExecutionState(State):
             raise AttributeError("The script of a ExecutionState has to reference the state it-self.")
         self._script = script
 
+    @property
+    def execute_in_process(self):
+        """Whether the script is executed in a separate worker process
+
+        This is beneficial for CPU-bound scripts, which would otherwise block other states due to the global
+        interpreter lock. The inputs and outputs of the script are pickled and the script does not get the state
+        itself as `self`, but a proxy offering its name, id, path, logger, persistent variables and the preemption
+        and pause handling (see :class:`rafcon.core.execution.process_pool.ScriptStateProxy`).
+        """
+        return self._execute_in_process
+
+    @execute_in_process.setter
+    @lock_state_machine
+    @Observable.observed
+    def execute_in_process(self, execute_in_process):
+        if not isinstance(execute_in_process, bool):
+            raise TypeError("execute_in_process must be of type bool")
+        self._execute_in_process = execute_in_process
+
     @property
     def script_text(self):
         return self._script.script
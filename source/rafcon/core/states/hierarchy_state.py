@@ -23,7 +23,6 @@ import copy
 from rafcon.utils import log
 from rafcon.core.states.container_state import ContainerState
 from rafcon.core.state_elements.logical_port import Outcome
-import rafcon.core.singleton as singleton
 from rafcon.core.execution.execution_history import CallItem, ReturnItem
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
 from rafcon.core.states.state import StateExecutionStatus
@@ -96,7 +95,7 @@ class HierarchyState(ContainerState):
             while self.child_state is not self:
                 # print("hs1", self.name)
                 self.handling_execution_mode = True
-                execution_mode = singleton.state_machine_execution_engine.handle_execution_mode(self, self.child_state)
+                execution_mode = self.execution_engine.handle_execution_mode(self, self.child_state)
 
                 # in the case of starting the sm from a specific state not the transitions define the logic flow
                 # but the the execution_engine.run_to_states; thus, do not alter the next state in this case
@@ -202,10 +201,9 @@ class HierarchyState(ContainerState):
         if not self.backward_execution:  # only add history item if it is not a backward execution
             self.execution_history.push_call_history_item(
                 self.child_state, CallType.EXECUTE, self, self.child_state.input_data)
-        self.child_state.start(self.execution_history, backward_execution=self.backward_execution,
-                               generate_run_id=False)
-
-        self.child_state.join()
+        self.execution_engine.run_child_state(
+            self.child_state, self.execution_history, backward_execution=self.backward_execution,
+            generate_run_id=False)
 
         # this line is important to indicate the parent the current execution status
         # it may also change during the execution of an hierarchy state
@@ -282,7 +280,7 @@ class HierarchyState(ContainerState):
             self.final_outcome = self.outcomes[transition.to_outcome]
 
         if self.child_state is self:
-            singleton.state_machine_execution_engine._modify_run_to_states(self)
+            self.execution_engine._modify_run_to_states(self)
         return False
 
     def _finalize_hierarchy(self):
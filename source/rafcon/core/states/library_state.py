@@ -20,10 +20,12 @@
 from future.utils import string_types
 from builtins import str
 from copy import copy, deepcopy
+from threading import RLock
 
 from gtkmvc3.observable import Observable
 from rafcon.core.states.state import StateExecutionStatus
 from rafcon.core.singleton import library_manager
+from rafcon.core.config import global_config
 from rafcon.core.states.state import State, PATH_SEPARATOR
 from rafcon.core.decorators import lock_state_machine
 from rafcon.utils import log
@@ -59,6 +61,9 @@ class LibraryState(State):
     _library_name = None
     _version = None
     _state_copy = None
+    _template = None
+    _interface = None
+    _state_copy_lock = None
 
     _input_data_port_runtime_values = {}
     _use_runtime_value_input_data_ports = {}
@@ -76,6 +81,8 @@ class LibraryState(State):
         # this variable is set to true if the state initialization is finished! after initialization no change to the
         # library state is allowed any more
         self.initialized = False
+        # serializes the loading of the library template and the creation of the private copy of this library state
+        self._state_copy_lock = RLock()
         State.__init__(self, name, state_id, None, None, income, outcomes)
 
         self.library_path = library_path
@@ -94,22 +101,25 @@ class LibraryState(State):
             logger.info("Old library name '{0}' was located at {1}".format(library_name, library_path))
             logger.info("New library name '{0}' is located at {1}".format(new_library_name, new_library_path))
 
-        # key = load_library_root_state_timer.start()
-        lib_version, state_copy = library_manager.get_library_state_copy_instance(self.lib_os_path)
-        self.state_copy = state_copy
-        # load_library_root_state_timer.stop(key)
-        self.state_copy.parent = self
+        # the template is shared by all library states of the library, the private copy of the template is only
+        # created when it is needed, e.g. for the execution or a modification
+        # in the lazy loading mode, only the interface of the library is loaded until the template is needed
+        if global_config.get_config_value("LIBRARY_LOADING", "preload") == "lazy":
+            lib_version, self._interface = library_manager.get_library_interface(self.lib_os_path)
+        else:
+            lib_version, self._template = library_manager.get_library_template(self.lib_os_path)
+            self._interface = self._template
         if not str(lib_version) == version and not str(lib_version) == "None":
             raise AttributeError("Library does not have the correct version!")
 
         if name is None:
-            self.name = self.state_copy.name
+            self.name = self._interface.name
 
-        # copy all ports and outcomes of self.state_copy to let the library state appear like the container state
+        # copy all ports and outcomes of the interface to let the library state appear like the container state
         # this will also set the parent of all outcomes and data ports to self
-        self.outcomes = self.state_copy.outcomes
-        self.input_data_ports = self.state_copy.input_data_ports
-        self.output_data_ports = self.state_copy.output_data_ports
+        self.outcomes = {elem_id: copy(elem) for elem_id, elem in self._interface.outcomes.items()}
+        self.input_data_ports = {elem_id: copy(elem) for elem_id, elem in self._interface.input_data_ports.items()}
+        self.output_data_ports = {elem_id: copy(elem) for elem_id, elem in self._interface.output_data_ports.items()}
 
         # handle input runtime values
         self.input_data_port_runtime_values = input_data_port_runtime_values
@@ -176,7 +186,12 @@ class LibraryState(State):
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
-        return str(self) == str(other) and self._state_copy == other.state_copy
+        if str(self) != str(other):
+            return False
+        if self.library_loaded and other.library_loaded:
+            return self.library_root_state == other.library_root_state
+        # the contents of libraries, which are not loaded yet, are identified by the location of the library
+        return self.lib_os_path == other.lib_os_path and self._interface == other._interface
 
     def __copy__(self):
         income = self._income
@@ -201,11 +216,13 @@ class LibraryState(State):
     def destroy(self, recursive=True):
         super(LibraryState, self).destroy(recursive)
         if recursive:
-            if self.state_copy:
-                self.state_copy.destroy(recursive)
-            else:
+            if self._state_copy:
+                self._state_copy.destroy(recursive)
+            elif self._interface is None:
                 logger.verbose("Multiple calls of destroy {0}".format(self))
             self._state_copy = None
+            self._template = None
+            self._interface = None
 
     def run(self):
         """ This defines the sequence of actions that are taken when the library state is executed
@@ -221,6 +238,7 @@ class LibraryState(State):
         self.state_copy.output_data = self.output_data
         self.state_copy.execution_history = self.execution_history
         self.state_copy.backward_execution = self.backward_execution
+        self.state_copy._execution_engine = self._execution_engine
         self.state_copy.run()
         logger.debug("Exiting library state '{0}' with name '{1}'".format(self.library_name, self.name))
         self.state_execution_status = StateExecutionStatus.WAIT_FOR_NEXT_STATE
@@ -230,19 +248,22 @@ class LibraryState(State):
         """Preempt the state and all of it child states.
         """
         super(LibraryState, self).recursively_preempt_states()
-        self.state_copy.recursively_preempt_states()
+        if self.state_copy_initialized:
+            self._state_copy.recursively_preempt_states()
 
     def recursively_pause_states(self):
         """Pause the state and all of it child states.
         """
         super(LibraryState, self).recursively_pause_states()
-        self.state_copy.recursively_pause_states()
+        if self.state_copy_initialized:
+            self._state_copy.recursively_pause_states()
 
     def recursively_resume_states(self):
         """Resume the state and all of it child states.
         """
         super(LibraryState, self).recursively_resume_states()
-        self.state_copy.recursively_resume_states()
+        if self.state_copy_initialized:
+            self._state_copy.recursively_resume_states()
 
     @lock_state_machine
     def add_outcome(self, name, outcome_id=None):
@@ -376,7 +397,13 @@ class LibraryState(State):
 
     def update_hash(self, obj_hash):
         super(LibraryState, self).update_hash(obj_hash)
-        self.state_copy.update_hash(obj_hash)
+        if self.library_loaded:
+            # the digest of the shared template is computed only once for all library states
+            self.update_hash_from_dict(obj_hash, self.library_root_state)
+        else:
+            # hashing must not load the library in the lazy loading mode, thus the location and the interface are used
+            obj_hash.update(self.get_object_hash_string(self.lib_os_path))
+            self.update_hash_from_dict(obj_hash, self._interface)
 
     @staticmethod
     def state_to_dict(state):
@@ -397,16 +424,22 @@ class LibraryState(State):
     def get_states_statistics(self, hierarchy_level):
         """
         Returns the numer of child states. As per default states do not have child states return 1.
+        The contents of a library, which is not loaded yet, are not counted.
         :return:
         """
-        return self.state_copy.get_states_statistics(hierarchy_level)
+        if not self.library_loaded:
+            return State.get_states_statistics(self, hierarchy_level)
+        return self.library_root_state.get_states_statistics(hierarchy_level)
 
     def get_number_of_transitions(self):
         """
         Return the number of transitions for a state. Per default states do not have transitions.
+        The transitions of a library, which is not loaded yet, are not counted.
         :return:
         """
-        return self.state_copy.get_number_of_transitions()
+        if not self.library_loaded:
+            return State.get_number_of_transitions(self)
+        return self.library_root_state.get_number_of_transitions()
 
     #########################################################################
     # Properties for all class fields that must be observed by gtkmvc3
@@ -464,7 +497,21 @@ class LibraryState(State):
     def state_copy(self):
         """Property for the _state_copy field
 
+        The private copy of the library template is created on first access. The root state of the copy shares its
+        outcomes and data ports with the library state. The states of the copy share the semantic data and the
+        compiled script modules of the template, only the states and their elements are copied.
         """
+        if self._state_copy is None and self._interface is not None:
+            with self._state_copy_lock:
+                if self._state_copy is None and self._interface is not None:
+                    template = self.library_template
+                    state_copy = deepcopy(template)
+                    _share_template_contents(state_copy, template)
+                    state_copy._outcomes = self._outcomes
+                    state_copy._input_data_ports = self._input_data_ports
+                    state_copy._output_data_ports = self._output_data_ports
+                    state_copy.parent = self
+                    self._state_copy = state_copy
         return self._state_copy
 
     @state_copy.setter
@@ -476,6 +523,41 @@ class LibraryState(State):
 
         self._state_copy = state_copy
 
+    @property
+    def state_copy_initialized(self):
+        """Whether the private copy of the library template was already created"""
+        return self._state_copy is not None
+
+    @property
+    def library_loaded(self):
+        """Whether the template of the library was already loaded (see config option ``LIBRARY_LOADING``)"""
+        return self._template is not None or self._state_copy is not None
+
+    @property
+    def library_template(self):
+        """The shared template of the library, which is loaded on first access in the lazy loading mode
+
+        :rtype: rafcon.core.states.state.State
+        """
+        if self._template is None and self._interface is not None:
+            with self._state_copy_lock:
+                if self._template is None and self._interface is not None:
+                    _, self._template = library_manager.get_library_template(self.lib_os_path)
+                    # the hash covers the contents of the library from now on
+                    self.invalidate_hash_digest()
+        return self._template
+
+    @property
+    def library_root_state(self):
+        """The root state of the library for read-only access
+
+        This is the private copy of the library, if it was already created, and otherwise the shared template.
+        Thus, accessing this property never creates the private copy.
+
+        :rtype: rafcon.core.states.state.State
+        """
+        return self._state_copy if self._state_copy is not None else self.library_template
+
     @property
     def input_data_port_runtime_values(self):
         """Property for the _input_data_port_runtime_values field
@@ -557,6 +639,11 @@ class LibraryState(State):
         else:
             return False
 
+    def _invalidate_path_cache(self):
+        super(LibraryState, self)._invalidate_path_cache()
+        if self._state_copy is not None:
+            self._state_copy._invalidate_path_cache()
+
     def get_storage_path(self, appendix=None):
         if appendix is None:
             return super(LibraryState, self).get_storage_path(appendix)
@@ -578,3 +665,21 @@ class LibraryState(State):
             current_library_hierarchy_depth += 1
             library_root_state = library_root_state.parent.get_next_upper_library_root_state()
         return current_library_hierarchy_depth
+
+
+def _share_template_contents(state_copy, template):
+    """Lets the states of a private copy of a library template share the contents of the template states
+
+    The semantic data is shared until it is modified and the scripts use the modules compiled for the template.
+
+    :param rafcon.core.states.state.State state_copy: the (root) state of the copy
+    :param rafcon.core.states.state.State template: the corresponding state of the template
+    """
+    from rafcon.core.states.execution_state import ExecutionState
+    from rafcon.core.states.container_state import ContainerState
+    state_copy.share_semantic_data(template)
+    if isinstance(template, ExecutionState):
+        state_copy.script.share_compiled_module(template.script)
+    elif isinstance(template, ContainerState):
+        for state_id, child_state in template.states.items():
+            _share_template_contents(state_copy.states[state_id], child_state)
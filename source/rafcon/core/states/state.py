@@ -37,6 +37,7 @@ from gtkmvc3.observable import Observable
 from jsonconversion.jsonobject import JSONObject
 from yaml import YAMLObject
 
+from rafcon.core.config import global_config
 from rafcon.core.id_generator import *
 from rafcon.core.state_elements.state_element import StateElement
 from rafcon.core.state_elements.data_port import DataPort, InputDataPort, OutputDataPort
@@ -73,12 +74,22 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
     """
 
     _parent = None
+    _execution_engine = None
     _state_element_attrs = ['income', 'outcomes', 'input_data_ports', 'output_data_ports']
+    # the digest is invalidated by every observed method (see _notify_method_after), except for those only setting the
+    # following execution time attributes, which are not hashed by update_hash
+    cache_hash_digest = True
+    _unhashed_execution_attrs = frozenset(['state_execution_status', 'input_data', 'output_data', 'scoped_data',
+                                           'concurrency_queue', 'final_outcome'])
+    # the semantic data may be shared with a library template until it is modified (see share_semantic_data)
+    _semantic_data_shared = False
 
     def __init__(self, name=None, state_id=None, input_data_ports=None, output_data_ports=None,
                  income=None, outcomes=None, parent=None):
 
         Observable.__init__(self)
+        # the paths of the state are cached, as they are requested several times per execution step
+        self._path_cache = {}
         self._state_id = None
         self._name = None
         self._input_data_ports = {}
@@ -197,6 +208,20 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         Hashable.update_hash_from_dict(obj_hash, self.semantic_data)
         return obj_hash
 
+    @lock_state_machine
+    def get_hash_digest(self):
+        return super(State, self).get_hash_digest()
+
+    def get_hash_parent(self):
+        return self.parent
+
+    def _notify_method_after(self, instance, name, res_val, args, kwargs):
+        # the data fields of the state may have been changed by any other observed method, the observers are notified
+        # afterwards, as they might hash the state
+        if name not in self._unhashed_execution_attrs:
+            self.invalidate_hash_digest()
+        super(State, self)._notify_method_after(instance, name, res_val, args, kwargs)
+
     @classmethod
     def from_dict(cls, dictionary):
         """ An abstract method each state has to implement.
@@ -255,9 +280,37 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         if generate_run_id:
             self._run_id = run_id_generator()
         self.backward_execution = copy.copy(backward_execution)
+        self._execution_engine = self._resolve_execution_engine()
         self.thread = threading.Thread(target=self.run)
         self.thread.start()
 
+    def start_in_worker_pool(self, worker_pool, execution_history, backward_execution=False, generate_run_id=True):
+        """ Starts the execution of the state in a thread of the given worker pool.
+
+        The state can be joined in the same way as after calling :meth:`start`.
+
+        :param rafcon.core.execution.worker_pool.WorkerPool worker_pool: the pool executing the state
+        """
+        self.execution_history = execution_history
+        if generate_run_id:
+            self._run_id = run_id_generator()
+        self.backward_execution = copy.copy(backward_execution)
+        self._execution_engine = self._resolve_execution_engine()
+        self.thread = worker_pool.submit(self.run)
+
+    def run_inline(self, execution_history, backward_execution=False, generate_run_id=True):
+        """ Executes the state in the calling thread and returns after the execution finished.
+
+        A subsequent call of :meth:`join` is not required.
+        """
+        self.execution_history = execution_history
+        if generate_run_id:
+            self._run_id = run_id_generator()
+        self.backward_execution = copy.copy(backward_execution)
+        self._execution_engine = self._resolve_execution_engine()
+        self.thread = None
+        self.run()
+
     def generate_run_id(self):
         self._run_id = run_id_generator()
 
@@ -539,21 +592,18 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         :rtype: str
         :return: the full path to the root state
         """
-        if by_name:
-            state_identifier = self.name
-        else:
-            state_identifier = self.state_id
-
-        if not self.is_root_state:
-            if appendix is None:
-                return self.parent.get_path(state_identifier, by_name)
-            else:
-                return self.parent.get_path(state_identifier + PATH_SEPARATOR + appendix, by_name)
-        else:
-            if appendix is None:
-                return state_identifier
+        path = self._path_cache.get(by_name)
+        if path is None:
+            state_identifier = self.name if by_name else self.state_id
+            if self.is_root_state:
+                path = state_identifier
             else:
-                return state_identifier + PATH_SEPARATOR + appendix
+                path = self.parent.get_path(state_identifier, by_name)
+            self._path_cache[by_name] = path
+
+        if appendix is None:
+            return path
+        return path + PATH_SEPARATOR + appendix
 
     def get_storage_path(self, appendix=None):
         """ Recursively create the storage path of the state.
@@ -565,18 +615,30 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         :rtype: str
         :return: the full path to the root state
         """
-        state_identifier = storage.get_storage_id_for_state(self)
-
-        if not self.is_root_state:
-            if appendix is None:
-                return self.parent.get_storage_path(state_identifier)
-            else:
-                return self.parent.get_storage_path(state_identifier + PATH_SEPARATOR + appendix)
-        else:
-            if appendix is None:
-                return state_identifier
+        # the storage id depends on the configuration, which thus is part of the cache key
+        cache_key = ('storage', global_config.get_config_value('STORAGE_PATH_WITH_STATE_NAME'),
+                     global_config.get_config_value('MAX_LENGTH_FOR_STATE_NAME_IN_STORAGE_PATH'))
+        storage_path = self._path_cache.get(cache_key)
+        if storage_path is None:
+            state_identifier = storage.get_storage_id_for_state(self)
+            if self.is_root_state:
+                storage_path = state_identifier
             else:
-                return state_identifier + PATH_SEPARATOR + appendix
+                storage_path = self.parent.get_storage_path(state_identifier)
+            self._path_cache[cache_key] = storage_path
+
+        if appendix is None:
+            return storage_path
+        return storage_path + PATH_SEPARATOR + appendix
+
+    def _invalidate_path_cache(self):
+        """Clears the cached paths and the cached execution engine of the state
+
+        Must be called whenever the state id, the name or the parent of the state changes. Container states also clear
+        the caches of all their child states.
+        """
+        self._path_cache.clear()
+        self._execution_engine = None
 
     def get_state_machine(self):
         """Get a reference of the state_machine the state belongs to
@@ -592,6 +654,30 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
 
         return None
 
+    @property
+    def execution_engine(self):
+        """The execution engine controlling the execution of the state
+
+        This is the engine of the state machine the state belongs to, or the default execution engine. It is resolved
+        once, when the state is started, as it is accessed in every execution step.
+
+        :rtype: rafcon.core.execution.execution_engine.ExecutionEngine
+        """
+        if self._execution_engine is not None:
+            return self._execution_engine
+        return self._resolve_execution_engine()
+
+    def _resolve_execution_engine(self):
+        # a started parent already resolved the engine, which avoids walking up to the root state
+        parent = self.parent
+        if isinstance(parent, State) and parent._execution_engine is not None:
+            return parent._execution_engine
+        state_machine = self.get_state_machine()
+        if state_machine is not None and state_machine.execution_engine is not None:
+            return state_machine.execution_engine
+        from rafcon.core.singleton import state_machine_execution_engine
+        return state_machine_execution_engine
+
     @property
     def file_system_path(self):
         """Provides the path in the file system where the state is stored
@@ -893,6 +979,8 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
                 state_id = state_id_generator(used_state_ids=used_ids)
 
         self._state_id = state_id
+        self._invalidate_path_cache()
+        self.invalidate_hash_digest()
 
     def get_states_statistics(self, hierarchy_level):
         """Get states statistic tuple
@@ -936,6 +1024,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         :return:
         """
         assert isinstance(key, string_types)
+        self._unshare_semantic_data()
         target_dict = self.get_semantic_data(path_as_list)
         target_dict[key] = value
         return path_as_list + [key]
@@ -950,11 +1039,28 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         if len(path_as_list) == 0:
             raise AttributeError("The argument path_as_list is empty but but the method remove_semantic_data needs a "
                                  "valid path to remove a vividict item.")
+        self._unshare_semantic_data()
         target_dict = self.get_semantic_data(path_as_list[0:-1])
         removed_element = target_dict[path_as_list[-1]]
         del target_dict[path_as_list[-1]]
         return removed_element
 
+    def share_semantic_data(self, state):
+        """Shares the semantic data of the given state instead of holding an own copy
+
+        This is used by the private copies of library templates. The shared data is copied before it is modified via
+        :meth:`add_semantic_data` or :meth:`remove_semantic_data`.
+
+        :param State state: the state, whose semantic data is shared
+        """
+        self._semantic_data = state.semantic_data
+        self._semantic_data_shared = True
+
+    def _unshare_semantic_data(self):
+        if self._semantic_data_shared:
+            self._semantic_data = copy.deepcopy(self._semantic_data)
+            self._semantic_data_shared = False
+
     @lock_state_machine
     def destroy(self, recursive):
         """ Removes all the state elements.
@@ -1008,6 +1114,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
                 raise ValueError("Name must have at least one character")
 
         self._name = name
+        self._invalidate_path_cache()
 
     @property
     def parent(self):
@@ -1033,6 +1140,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
                 raise TypeError("parent must be of type State or StateMachine or None")
 
             self._parent = ref(parent)
+        self._invalidate_path_cache()
 
     @property
     def input_data_ports(self):
@@ -1504,6 +1612,8 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
     def semantic_data(self):
         """Property for the _semantic_data field
 
+        The semantic data should be modified via :meth:`add_semantic_data` and :meth:`remove_semantic_data`, in-place
+        modifications are not observed and have to be followed by a call of :meth:`invalidate_hash_digest`.
         """
         return self._semantic_data
 
@@ -1517,6 +1627,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
             self._semantic_data = Vividict(semantic_data)
         else:
             self._semantic_data = semantic_data
+        self._semantic_data_shared = False
 
 
 StateType = Enum('STATE_TYPE', 'EXECUTION HIERARCHY BARRIER_CONCURRENCY PREEMPTION_CONCURRENCY LIBRARY DECIDER_STATE')
@@ -26,14 +26,19 @@ import glob
 import copy
 import yaml
 import warnings
+import zipfile
 from distutils.version import StrictVersion
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+from collections import OrderedDict
+import time
 
 import rafcon
 
-from rafcon.utils.filesystem import read_file, write_file
+from rafcon.utils.filesystem import read_file, write_file_if_changed, RACY_MTIME_INTERVAL
 from rafcon.utils import storage_utils
 from rafcon.utils import log
-from rafcon.utils.timer import measure_time
+from rafcon.utils.timer import measure_time, Timer
 
 from rafcon.core.custom_exceptions import LibraryNotFoundException
 from rafcon.core.constants import DEFAULT_SCRIPT_PATH
@@ -53,11 +58,27 @@ SCRIPT_FILE = 'script.py'
 SEMANTIC_DATA_FILE = 'semantic_data.json'
 STATEMACHINE_FILE = 'statemachine.json'
 STATEMACHINE_FILE_OLD = 'statemachine.yaml'
+#: File extension of state machines packed into a single (zip) file
+PACKED_STATE_MACHINE_EXTENSION = '.rafcon'
 ID_NAME_DELIMITER = "_"
 
 REPLACED_CHARACTERS_FOR_NO_OS_LIMITATION = {'/': '', r'\0': '', '<': '', '>': '', ':': '_',
                                             '\\': '', '|': '_', '?': '', '*': '_'}
 
+# the maximum number of state folders, whose saved child state folders are remembered
+MAX_SAVED_CHILD_STATE_FOLDERS = 10000
+
+# the storage ids of the child states saved to a state folder by folder path, together with the modification time of
+# the folder after the save and the time this was recorded at, to skip the search for obsolete state folders, if
+# neither changed since then
+_saved_child_state_folders = OrderedDict()
+
+# the pool of threads reading state files, shared by all loads of state machines, as starting and stopping a pool
+# costs more than loading a small state machine
+_loading_thread_pool = None
+_loading_thread_pool_size = 0
+_loading_thread_pool_lock = Lock()
+
 # clean the DEFAULT_SCRIPT_PATH folder at each program start
 if os.path.exists(DEFAULT_SCRIPT_PATH):
     files = glob.glob(os.path.join(DEFAULT_SCRIPT_PATH, "*"))
@@ -145,20 +166,32 @@ def clean_path(base_path):
     return base_path
 
 
-def save_state_machine_to_path(state_machine, base_path, delete_old_state_machine=False, as_copy=False):
+def save_state_machine_to_path(state_machine, base_path, delete_old_state_machine=False, as_copy=False,
+                               force=False):
     """Saves a state machine recursively to the file system
 
     The `as_copy` flag determines whether the state machine is saved as copy. If so (`as_copy=True`), some state
     machine attributes will be left untouched, such as the `file_system_path` or the `dirty_flag`.
 
+    Only the files, whose content changed, are written. Each file is written atomically.
+
+    If the `base_path` ends with :data:`PACKED_STATE_MACHINE_EXTENSION`, the state machine is saved in the packed
+    format, i.e. all files are stored in a single zip file (see :func:`save_packed_state_machine_to_path`).
+
     :param rafcon.core.state_machine.StateMachine state_machine: the state_machine to be saved
     :param str base_path: base_path to which all further relative paths refers to
     :param bool delete_old_state_machine: Whether to delete any state machine existing at the given path
     :param bool as_copy: Whether to use a copy storage for the state machine
+    :param bool force: Whether to write all files and search all folders for obsolete state folders, regardless of
+        whether they changed
     """
     # warns the user in the logger when using deprecated names
     clean_path_from_deprecated_naming(base_path)
 
+    if is_packed_state_machine_path(base_path):
+        save_packed_state_machine_to_path(state_machine, base_path, as_copy)
+        return
+
     state_machine.acquire_modification_lock()
     try:
         root_state = state_machine.root_state
@@ -175,7 +208,8 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
         old_update_time = state_machine.last_update
         state_machine.last_update = storage_utils.get_current_time_string()
         state_machine_dict = state_machine.to_dict()
-        storage_utils.write_dict_to_json(state_machine_dict, os.path.join(base_path, STATEMACHINE_FILE))
+        write_file_if_changed(os.path.join(base_path, STATEMACHINE_FILE),
+                              storage_utils.dict_to_json_string(state_machine_dict), force)
 
         # set the file_system_path of the state machine
         if not as_copy:
@@ -185,7 +219,7 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
 
         # add root state recursively
         remove_obsolete_folders([root_state], base_path)
-        save_state_recursively(root_state, base_path, "", as_copy)
+        save_state_recursively(root_state, base_path, "", as_copy, force)
 
         if state_machine.marked_dirty and not as_copy:
             state_machine.marked_dirty = False
@@ -196,7 +230,108 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
         state_machine.release_modification_lock()
 
 
-def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=False):
+def is_packed_state_machine_path(path):
+    """Checks whether the path refers to a state machine in the packed (single file) format
+
+    :param str path: the path of a state machine
+    :rtype: bool
+    """
+    return path.endswith(PACKED_STATE_MACHINE_EXTENSION) and not os.path.isdir(path)
+
+
+def save_packed_state_machine_to_path(state_machine, archive_path, as_copy=False):
+    """Saves a state machine into a single zip file
+
+    The zip file holds the same files and folders as a state machine saved to a folder, whereby the central directory
+    of the zip file serves as table of contents. The file is written to a temporary file first, which is then renamed,
+    so that the archive is never partially written. The paths of the states refer to the folders within the archive.
+
+    :param rafcon.core.state_machine.StateMachine state_machine: the state_machine to be saved
+    :param str archive_path: the path of the zip file
+    :param bool as_copy: Whether to use a copy storage for the state machine
+    """
+    from rafcon.core.states.execution_state import ExecutionState
+    from rafcon.core.states.container_state import ContainerState
+
+    def add_state_recursively(archive, state, parent_path):
+        state_path = os.path.join(parent_path, get_storage_id_for_state(state))
+        state_path_full = os.path.join(archive_path, state_path)
+        archive.writestr(os.path.join(state_path, FILE_NAME_CORE_DATA), storage_utils.dict_to_json_string(state))
+        if isinstance(state, ExecutionState):
+            archive.writestr(os.path.join(state_path, SCRIPT_FILE), state.script_text)
+        archive.writestr(os.path.join(state_path, SEMANTIC_DATA_FILE),
+                         storage_utils.dict_to_json_string(state.semantic_data))
+        if not as_copy:
+            state.file_system_path = state_path_full
+            if isinstance(state, ExecutionState):
+                state.script.filename = SCRIPT_FILE
+                state.script.path = state_path_full
+        if isinstance(state, ContainerState):
+            for child_state in state.states.values():
+                add_state_recursively(archive, child_state, state_path)
+
+    state_machine.acquire_modification_lock()
+    try:
+        archive_folder = os.path.dirname(archive_path)
+        if archive_folder and not os.path.exists(archive_folder):
+            os.makedirs(archive_folder)
+        old_update_time = state_machine.last_update
+        state_machine.last_update = storage_utils.get_current_time_string()
+        tmp_archive_path = "{0}.{1}.tmp".format(archive_path, os.getpid())
+        try:
+            with zipfile.ZipFile(tmp_archive_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(STATEMACHINE_FILE, storage_utils.dict_to_json_string(state_machine.to_dict()))
+                add_state_recursively(archive, state_machine.root_state, "")
+            getattr(os, 'replace', os.rename)(tmp_archive_path, archive_path)
+        finally:
+            if os.path.exists(tmp_archive_path):
+                os.remove(tmp_archive_path)
+
+        if not as_copy:
+            state_machine.file_system_path = copy.copy(archive_path)
+            if state_machine.marked_dirty:
+                state_machine.marked_dirty = False
+        else:
+            state_machine.last_update = old_update_time
+        logger.debug("State machine with id {0} was saved packed at {1}".format(state_machine.state_machine_id,
+                                                                                archive_path))
+    finally:
+        state_machine.release_modification_lock()
+
+
+def pack_state_machine(folder_path, archive_path):
+    """Converts a state machine saved to a folder into the packed format
+
+    All files of the folder are stored in the zip file, including the meta data of the GUI.
+
+    :param str folder_path: the folder of the state machine
+    :param str archive_path: the path of the zip file to be created
+    """
+    tmp_archive_path = "{0}.{1}.tmp".format(archive_path, os.getpid())
+    try:
+        with zipfile.ZipFile(tmp_archive_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for current_folder_path, folder_names, file_names in os.walk(folder_path):
+                folder_names.sort()
+                for file_name in sorted(file_names):
+                    file_path = os.path.join(current_folder_path, file_name)
+                    archive.write(file_path, os.path.relpath(file_path, folder_path))
+        getattr(os, 'replace', os.rename)(tmp_archive_path, archive_path)
+    finally:
+        if os.path.exists(tmp_archive_path):
+            os.remove(tmp_archive_path)
+
+
+def unpack_state_machine(archive_path, folder_path):
+    """Converts a state machine in the packed format into a state machine saved to a folder
+
+    :param str archive_path: the path of the zip file
+    :param str folder_path: the folder of the state machine to be created
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        archive.extractall(folder_path)
+
+
+def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=False, force=False):
     """Saves the script file for a state to the directory of the state.
 
     The script name will be set to the SCRIPT_FILE constant.
@@ -204,6 +339,7 @@ def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=F
     :param state: The state of which the script file should be saved
     :param str state_path_full: The path to the file system storage location of the state
     :param bool as_copy: Temporary storage flag to signal that the given path is not the new file_system_path
+    :param bool force: Whether to write the file, even if it already holds the script
     """
     from rafcon.core.states.execution_state import ExecutionState
     if isinstance(state, ExecutionState):
@@ -211,7 +347,7 @@ def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=F
         destination_script_file = os.path.join(state_path_full, SCRIPT_FILE)
 
         try:
-            write_file(destination_script_file, state.script_text)
+            write_file_if_changed(destination_script_file, state.script_text, force)
         except Exception:
             logger.exception("Storing of script file failed: {0} -> {1}".format(state.get_path(),
                                                                                 destination_script_file))
@@ -222,32 +358,35 @@ def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=F
             state.script.path = state_path_full
 
 
-def save_semantic_data_for_state(state, state_path_full):
+def save_semantic_data_for_state(state, state_path_full, force=False):
     """Saves the semantic data in a separate json file.
 
     :param state: The state of which the script file should be saved
     :param str state_path_full: The path to the file system storage location of the state
+    :param bool force: Whether to write the file, even if it already holds the semantic data
     """
 
     destination_script_file = os.path.join(state_path_full, SEMANTIC_DATA_FILE)
 
     try:
-        storage_utils.write_dict_to_json(state.semantic_data, destination_script_file)
+        write_file_if_changed(destination_script_file, storage_utils.dict_to_json_string(state.semantic_data), force)
     except IOError:
         logger.exception("Storing of semantic data for state {0} failed! Destination path: {1}".
                          format(state.get_path(), destination_script_file))
         raise
 
 
-def save_state_recursively(state, base_path, parent_path, as_copy=False):
+def save_state_recursively(state, base_path, parent_path, as_copy=False, force=False):
     """Recursively saves a state to a json file
 
-    It calls this method on all its substates.
+    It calls this method on all its substates. Only files, whose content changed, are written and the folder of the
+    state is only searched for obsolete state folders, if the child states or the folder changed since the last save.
 
     :param state: State to be stored
     :param base_path: Path to the state machine
     :param parent_path: Path to the parent state
     :param bool as_copy: Temporary storage flag to signal that the given path is not the new file_system_path
+    :param bool force: Whether to write all files and search for obsolete state folders in any case
     :return:
     """
     from rafcon.core.states.execution_state import ExecutionState
@@ -255,35 +394,169 @@ def save_state_recursively(state, base_path, parent_path, as_copy=False):
 
     state_path = os.path.join(parent_path, get_storage_id_for_state(state))
     state_path_full = os.path.join(base_path, state_path)
-    if not os.path.exists(state_path_full):
+    try:
+        folder_mtime = os.stat(state_path_full).st_mtime
+    except OSError:
+        folder_mtime = None
         os.makedirs(state_path_full)
 
-    storage_utils.write_dict_to_json(state, os.path.join(state_path_full, FILE_NAME_CORE_DATA))
+    write_file_if_changed(os.path.join(state_path_full, FILE_NAME_CORE_DATA),
+                          storage_utils.dict_to_json_string(state), force)
     if not as_copy:
         state.file_system_path = state_path_full
 
     if isinstance(state, ExecutionState):
-        save_script_file_for_state_and_source_path(state, state_path_full, as_copy)
+        save_script_file_for_state_and_source_path(state, state_path_full, as_copy, force)
 
-    save_semantic_data_for_state(state, state_path_full)
+    save_semantic_data_for_state(state, state_path_full, force)
 
     # create yaml files for all children
     if isinstance(state, ContainerState):
-        remove_obsolete_folders(state.states.values(), os.path.join(base_path, state_path))
-        for state in state.states.values():
-            save_state_recursively(state, base_path, state_path, as_copy)
+        child_state_folders = frozenset(get_storage_id_for_state(child_state) for child_state in state.states.values())
+        saved_child_state_folders = _saved_child_state_folders.pop(state_path_full, None)
+        if force or saved_child_state_folders is None or \
+                saved_child_state_folders[:2] != (child_state_folders, folder_mtime) or \
+                saved_child_state_folders[2] - folder_mtime < RACY_MTIME_INTERVAL:
+            remove_obsolete_folders(state.states.values(), state_path_full)
+        for child_state in state.states.values():
+            save_state_recursively(child_state, base_path, state_path, as_copy, force)
+        _saved_child_state_folders[state_path_full] = (child_state_folders, os.stat(state_path_full).st_mtime,
+                                                       time.time())
+        while len(_saved_child_state_folders) > MAX_SAVED_CHILD_STATE_FOLDERS:
+            _saved_child_state_folders.popitem(last=False)
+
+
+def _get_loading_thread_pool(threads):
+    global _loading_thread_pool, _loading_thread_pool_size
+    with _loading_thread_pool_lock:
+        if _loading_thread_pool is None or _loading_thread_pool_size != threads:
+            if _loading_thread_pool is not None:
+                _loading_thread_pool.close()
+            _loading_thread_pool = ThreadPool(threads)
+            _loading_thread_pool_size = threads
+        return _loading_thread_pool
+
+
+class PrefetchedStateFiles(object):
+    """The folders and files of all states of a state machine, read in advance
+
+    The loading of a state machine is split into phases: First, the folder tree of the root state is scanned. Then,
+    the core data, script and semantic data files of all states are read concurrently by a pool of threads, as this
+    is bound by the latency of the file system, in particular for network file systems. Finally,
+    :func:`load_state_recursively` decodes the files and assembles the states from the read contents.
+
+    :param str root_state_path: the path of the root state of the state machine
+    :param int threads: the number of threads reading the files
+    """
+
+    def __init__(self, root_state_path, threads):
+        self._child_folders = {}
+        self._file_contents = {}
+        scan_timer = Timer(logger, "Scanning the state folders of {0}".format(root_state_path))
+        key = scan_timer.start()
+        file_paths = []
+        for folder_path, folder_names, file_names in os.walk(root_state_path, followlinks=True):
+            self._child_folders[folder_path] = [os.path.join(folder_path, name) for name in folder_names]
+            file_names = set(file_names)
+            for file_name in (FILE_NAME_CORE_DATA if FILE_NAME_CORE_DATA in file_names else FILE_NAME_CORE_DATA_OLD,
+                              SCRIPT_FILE, SEMANTIC_DATA_FILE):
+                if file_name in file_names:
+                    file_paths.append(os.path.join(folder_path, file_name))
+        self.scan_duration = scan_timer.stop(key)
+
+        read_timer = Timer(logger, "Reading {0} state files of {1}".format(len(file_paths), root_state_path))
+        key = read_timer.start()
+        self._file_contents = dict(zip(file_paths, _get_loading_thread_pool(threads).map(read_file, file_paths)))
+        self.read_duration = read_timer.stop(key)
+
+    def exists(self, file_path):
+        return file_path in self._file_contents or file_path in self._child_folders
+
+    def get_child_folders(self, folder_path):
+        """Returns the paths of all sub folders of a state folder"""
+        return self._child_folders.get(folder_path, [])
+
+    def read_file(self, folder_path, file_name):
+        """Returns the content of a file, which is read now, if it was not read in advance"""
+        file_path = os.path.join(folder_path, file_name)
+        if file_path in self._file_contents:
+            return self._file_contents[file_path]
+        return read_file(folder_path, file_name)
+
+    def load_data_file(self, path_of_file, as_dict=False):
+        """Decodes a data file like :func:`load_data_file`"""
+        if path_of_file in self._file_contents:
+            return storage_utils.load_objects_from_json_string(self._file_contents[path_of_file], as_dict)
+        if as_dict:
+            return storage_utils.load_objects_from_json(path_of_file, as_dict=True)
+        return load_data_file(path_of_file)
+
+
+class PackedStateFiles(PrefetchedStateFiles):
+    """The folders and files of a state machine in the packed format, which are all read from the zip file at once
+
+    The paths of the files and folders are the paths within the zip file joined to the path of the zip file.
+
+    :param str archive_path: the path of the zip file
+    :param member_names: if given, only these files are read from the zip file
+    :raises ValueError: if the file is no valid zip file
+    """
+
+    def __init__(self, archive_path, member_names=None):
+        self._child_folders = {archive_path: []}
+        self._file_contents = {}
+        read_timer = Timer(logger, "Reading the packed state machine {0}".format(archive_path))
+        key = read_timer.start()
+        try:
+            with zipfile.ZipFile(archive_path) as archive:
+                for member_name in archive.namelist() if member_names is None else member_names:
+                    path_elements = [element for element in member_name.split('/') if element]
+                    if not path_elements or member_name.endswith('/'):
+                        continue
+                    folder_path = archive_path
+                    for element in path_elements[:-1]:
+                        child_folder_path = os.path.join(folder_path, element)
+                        if child_folder_path not in self._child_folders:
+                            self._child_folders[folder_path].append(child_folder_path)
+                            self._child_folders[child_folder_path] = []
+                        folder_path = child_folder_path
+                    try:
+                        content = archive.read(member_name)
+                    except KeyError:
+                        continue
+                    self._file_contents[os.path.join(folder_path, path_elements[-1])] = content.decode('utf-8')
+        except (zipfile.BadZipfile, IOError, OSError) as e:
+            raise ValueError("Provided path doesn't contain a valid packed state machine: {0} ({1})".format(
+                archive_path, e))
+        self.scan_duration = 0.
+        self.read_duration = read_timer.stop(key)
+
+    def read_file(self, folder_path, file_name):
+        return self._file_contents.get(os.path.join(folder_path, file_name))
+
+    def load_data_file(self, path_of_file, as_dict=False):
+        if path_of_file in self._file_contents:
+            return storage_utils.load_objects_from_json_string(self._file_contents[path_of_file], as_dict)
+        raise ValueError("Data file not found: {0}".format(path_of_file))
 
 
 @measure_time
 def load_state_machine_from_path(base_path, state_machine_id=None):
     """Loads a state machine from the given path
 
+    State machines in the packed format (see :func:`save_packed_state_machine_to_path`) are loaded from the zip file.
+
     :param base_path: An optional base path for the state machine.
     :return: a tuple of the loaded container state, the version of the state and the creation time
     :raises ValueError: if the provided path does not contain a valid state machine
     """
     logger.debug("Loading state machine from path {0}...".format(base_path))
 
+    if is_packed_state_machine_path(base_path):
+        packed_files = PackedStateFiles(base_path)
+        state_machine_dict = packed_files.load_data_file(os.path.join(base_path, STATEMACHINE_FILE))
+        return _load_state_machine_from_dict(state_machine_dict, base_path, state_machine_id, packed_files)
+
     state_machine_file_path = os.path.join(base_path, STATEMACHINE_FILE)
     state_machine_file_path_old = os.path.join(base_path, STATEMACHINE_FILE_OLD)
 
@@ -300,6 +573,11 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
             raise ValueError("Provided path doesn't contain a valid state machine: {0}".format(base_path))
 
     state_machine_dict = storage_utils.load_objects_from_json(state_machine_file_path)
+    return _load_state_machine_from_dict(state_machine_dict, base_path, state_machine_id)
+
+
+def _load_state_machine_from_dict(state_machine_dict, base_path, state_machine_id=None, prefetched_files=None):
+    """Creates the state machine from the content of its state machine file and loads its states"""
     if 'used_rafcon_version' in state_machine_dict:
         previously_used_rafcon_version = StrictVersion(state_machine_dict['used_rafcon_version']).version
         active_rafcon_version = StrictVersion(rafcon.__version__).version
@@ -346,8 +624,18 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
     root_state_path = os.path.join(base_path, root_state_storage_id)
     state_machine.file_system_path = base_path
     dirty_states = []
+    if prefetched_files is None:
+        threads = global_config.get_config_value("STATE_MACHINE_LOADING_THREADS", 8)
+        prefetched_files = PrefetchedStateFiles(root_state_path, threads) if threads and threads > 1 else None
+    assemble_timer = Timer(logger, "Assembling the states of {0}".format(base_path))
+    key = assemble_timer.start()
     state_machine.root_state = load_state_recursively(parent=state_machine, state_path=root_state_path,
-                                                      dirty_states=dirty_states)
+                                                      dirty_states=dirty_states, prefetched_files=prefetched_files)
+    assemble_duration = assemble_timer.stop(key)
+    if prefetched_files is not None:
+        logger.debug("Loading phases of state machine ({0}): scanning {1:.3f}s, reading {2:.3f}s, "
+                     "assembling {3:.3f}s".format(base_path, prefetched_files.scan_duration,
+                                                  prefetched_files.read_duration, assemble_duration))
     if state_machine.root_state is None:
         return  # a corresponding exception has been handled with a proper error log in load_state_recursively
     if len(dirty_states) > 0:
@@ -365,6 +653,48 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
     return state_machine
 
 
+def load_root_state_interface_from_path(base_path):
+    """Loads the version of a state machine and the root state without its child states
+
+    Only the core data of the root state is loaded, i.e. its name, outcomes and data ports. Neither its script, nor
+    its semantic data, nor its child states are loaded. This is used to create library states without loading the
+    whole library (see config option ``LIBRARY_LOADING``).
+
+    :param str base_path: the path of the state machine
+    :return: the version of the state machine and the root state without child states
+    :rtype: str, rafcon.core.states.state.State
+    :raises ValueError: if the provided path does not contain a valid state machine
+    """
+    if is_packed_state_machine_path(base_path):
+        with zipfile.ZipFile(base_path) as archive:
+            state_machine_dict = storage_utils.load_objects_from_json_string(
+                archive.read(STATEMACHINE_FILE).decode('utf-8'))
+        root_state_storage_id = state_machine_dict.get('root_state_storage_id',
+                                                       state_machine_dict.get('root_state_id'))
+        packed_files = PackedStateFiles(base_path, ['/'.join([root_state_storage_id, FILE_NAME_CORE_DATA])])
+        state_info = packed_files.load_data_file(os.path.join(base_path, root_state_storage_id, FILE_NAME_CORE_DATA))
+        root_state = state_info[0] if isinstance(state_info, tuple) else state_info
+        return state_machine_dict.get('version', state_machine_dict.get('state_machine_version')), root_state
+
+    state_machine_file_path = os.path.join(base_path, STATEMACHINE_FILE)
+    if not os.path.exists(state_machine_file_path):
+        state_machine_file_path = os.path.join(base_path, STATEMACHINE_FILE_OLD)
+        if not os.path.exists(state_machine_file_path):
+            raise ValueError("Provided path doesn't contain a valid state machine: {0}".format(base_path))
+    state_machine_dict = storage_utils.load_objects_from_json(state_machine_file_path)
+    version = state_machine_dict['version'] if 'version' in state_machine_dict else \
+        state_machine_dict['state_machine_version']
+    root_state_storage_id = state_machine_dict.get('root_state_storage_id', state_machine_dict.get('root_state_id'))
+    root_state_path = os.path.join(base_path, root_state_storage_id)
+    path_core_data = os.path.join(root_state_path, FILE_NAME_CORE_DATA)
+    # TODO: Should be removed with next minor release
+    if not os.path.exists(path_core_data):
+        path_core_data = os.path.join(root_state_path, FILE_NAME_CORE_DATA_OLD)
+    state_info = load_data_file(path_core_data)
+    root_state = state_info[0] if isinstance(state_info, tuple) else state_info
+    return version, root_state
+
+
 def load_state_from_path(state_path):
     """Loads a state from a given path
 
@@ -374,7 +704,7 @@ def load_state_from_path(state_path):
     return load_state_recursively(parent=None, state_path=state_path)
 
 
-def load_state_recursively(parent, state_path=None, dirty_states=[]):
+def load_state_recursively(parent, state_path=None, dirty_states=[], prefetched_files=None):
     """Recursively loads the state
 
     It calls this method on each sub-state of a container state.
@@ -382,6 +712,7 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
     :param parent:  the root state of the last load call to which the loaded state will be added
     :param state_path: the path on the filesystem where to find the meta file for the state
     :param dirty_states: a dict of states which changed during loading
+    :param PrefetchedStateFiles prefetched_files: the folders and files of the states read in advance, if any
     :return:
     """
     from rafcon.core.states.execution_state import ExecutionState
@@ -393,18 +724,24 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
     logger.debug("Load state recursively: {0}".format(str(state_path)))
 
     # TODO: Should be removed with next minor release
-    if not os.path.exists(path_core_data):
+    if not (prefetched_files.exists(path_core_data) if prefetched_files else os.path.exists(path_core_data)):
         path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA_OLD)
 
     try:
-        state_info = load_data_file(path_core_data)
+        if prefetched_files is not None:
+            state_info = prefetched_files.load_data_file(path_core_data)
+        else:
+            state_info = load_data_file(path_core_data)
     except ValueError as e:
         logger.exception("Error while loading state data: {0}".format(e))
         return
     except LibraryNotFoundException as e:
         logger.error("Library could not be loaded: {0}\n"
                      "Skipping library and continuing loading the state machine".format(e))
-        state_info = storage_utils.load_objects_from_json(path_core_data, as_dict=True)
+        if prefetched_files is not None:
+            state_info = prefetched_files.load_data_file(path_core_data, as_dict=True)
+        else:
+            state_info = storage_utils.load_objects_from_json(path_core_data, as_dict=True)
         state_id = state_info["state_id"]
         dummy_state = HierarchyState(LIBRARY_NOT_FOUND_DUMMY_STATE_NAME, state_id=state_id)
         # set parent of dummy state
@@ -432,12 +769,18 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
 
     # read script file if an execution state
     if isinstance(state, ExecutionState):
-        script_text = read_file(state_path, state.script.filename)
+        if prefetched_files is not None:
+            script_text = prefetched_files.read_file(state_path, state.script.filename)
+        else:
+            script_text = read_file(state_path, state.script.filename)
         state.script_text = script_text
 
     # load semantic data
     try:
-        semantic_data = load_data_file(os.path.join(state_path, SEMANTIC_DATA_FILE))
+        if prefetched_files is not None:
+            semantic_data = prefetched_files.load_data_file(os.path.join(state_path, SEMANTIC_DATA_FILE))
+        else:
+            semantic_data = load_data_file(os.path.join(state_path, SEMANTIC_DATA_FILE))
         state.semantic_data = semantic_data
     except Exception as e:
         # semantic data file does not have to be there
@@ -446,14 +789,17 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
     one_of_my_child_states_not_found = False
 
     # load child states
-    for p in os.listdir(state_path):
-        child_state_path = os.path.join(state_path, p)
-        if os.path.isdir(child_state_path):
-            child_state = load_state_recursively(state, child_state_path, dirty_states)
-            if not child_state:
-                return None
-            if child_state.name is LIBRARY_NOT_FOUND_DUMMY_STATE_NAME:
-                one_of_my_child_states_not_found = True
+    if prefetched_files is not None:
+        child_state_paths = prefetched_files.get_child_folders(state_path)
+    else:
+        child_state_paths = [os.path.join(state_path, p) for p in os.listdir(state_path)
+                             if os.path.isdir(os.path.join(state_path, p))]
+    for child_state_path in child_state_paths:
+        child_state = load_state_recursively(state, child_state_path, dirty_states, prefetched_files)
+        if not child_state:
+            return None
+        if child_state.name is LIBRARY_NOT_FOUND_DUMMY_STATE_NAME:
+            one_of_my_child_states_not_found = True
 
     if one_of_my_child_states_not_found:
         # omit adding transitions and data flows in this case
@@ -14,7 +14,6 @@ from builtins import str
 from gi.repository import Gtk
 from gi.repository import Gdk
 from gi.repository import GObject
-import shelve
 import os.path
 
 import rafcon.utils.execution_log as log_helper
@@ -39,7 +38,7 @@ class ExecutionLogTreeController(ExtendedController):
             exit()
 
         self.run_id_to_select = run_id_to_select
-        self.hist_items = shelve.open(filename, 'r')
+        self.hist_items = log_helper.load_log(filename)
         self.start, self.next_, self.concurrent, self.hierarchy, self.items = \
             log_helper.log_to_collapsed_structure(self.hist_items,
                                                   throw_on_pickle_error=False,
@@ -47,6 +46,8 @@ class ExecutionLogTreeController(ExtendedController):
         # create a TreeStore with one string column to use as the model
         self.tree_store = Gtk.TreeStore(GObject.TYPE_STRING, GObject.TYPE_STRING)
         self.item_iter = {}
+        # the keys of the items by the strings stored in the tree store, as the run ids of the log are integers
+        self.item_keys = {}
         view.tree_view.set_model(self.tree_store)
 
     def register_view(self, view):
@@ -72,8 +73,10 @@ class ExecutionLogTreeController(ExtendedController):
         view.tree_view.connect('button_press_event', self.mouse_click)
 
         # optional select a element of generated tree
-        if self.run_id_to_select in self.item_iter:
-            item_iter_to_select = self.item_iter[self.run_id_to_select]
+        # the run id is passed as string, while the run ids of the log are integers (or strings for older logs)
+        item_iter_by_run_id = {str(run_id): item_iter for run_id, item_iter in self.item_iter.items()}
+        if self.run_id_to_select is not None and str(self.run_id_to_select) in item_iter_by_run_id:
+            item_iter_to_select = item_iter_by_run_id[str(self.run_id_to_select)]
             path_to_select = self.tree_store.get_path(item_iter_to_select)
             self.view.tree_view.expand_to_path(path_to_select)
             self.view.tree_view.get_selection().select_iter(item_iter_to_select)
@@ -82,6 +85,7 @@ class ExecutionLogTreeController(ExtendedController):
     def add_collapsed_key(self, parent, key):
         parent_iter = self.tree_store.append(parent, ["%s (%s)" % (self.items[key]['state_name'], self.items[key]['state_type']), str(key)])
         self.item_iter[key] = parent_iter
+        self.item_keys[str(key)] = key
 
         returns = []
         if key in self.next_:
@@ -104,6 +108,7 @@ class ExecutionLogTreeController(ExtendedController):
     def add_key(self, parent, key):
         parent_iter = self.tree_store.append(parent, [str(key)])
         self.item_iter[key] = parent_iter
+        self.item_keys[str(key)] = key
 
         if key in self.next_ and self.items[key]['call_type'] == 'EXECUTE':
             self.add_key(parent, self.next_[key])
@@ -123,7 +128,7 @@ class ExecutionLogTreeController(ExtendedController):
     def on_treeview_selection_changed(self, tree_selection):
         m, selected_tree_item_iter = tree_selection.get_selected()
         hist_item_id = m.get_value(selected_tree_item_iter, self.RUN_ID_STORAGE_ID)
-        item = self.items.get(hist_item_id)
+        item = self.items.get(self.item_keys.get(hist_item_id))
         import pprint as pp
         self.view.text_view.get_buffer().set_text(pp.pformat(item))
 
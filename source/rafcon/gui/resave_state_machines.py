@@ -26,6 +26,7 @@ from rafcon.utils.gui_functions import call_gui_callback
 
 from rafcon.core.config import global_config
 import rafcon.core.singleton as core_singletons
+from rafcon.core.storage import storage
 
 import rafcon.gui.start
 import rafcon.gui.singleton as gui_singletons
@@ -162,11 +163,53 @@ def convert_libraries_in_path(config_path, lib_path, target_path=None, gui_confi
                              "e.g. -> {0} -> full path is {1}".format(lib, child_lib_path))
 
 
+def convert_packed_format_in_path(lib_path, target_path=None, unpack=False):
+    """
+    This function converts all state machines found at the specified path into the packed format, in which a state
+    machine is stored in a single file, or with `unpack` from the packed format back into folders. The GUI is not
+    needed for the conversion and all files, including the meta data, are taken over.
+    :param lib_path: the path to look for state machines
+    :param target_path: the path to store the converted state machines to, by default next to the original ones
+    :param unpack: whether to convert from the packed format into folders
+    :return:
+    """
+    target_path = target_path or lib_path
+    if not os.path.exists(target_path):
+        os.makedirs(target_path)
+    for lib in os.listdir(lib_path):
+        child_lib_path = os.path.join(lib_path, lib)
+        if '.' == lib[0]:
+            continue
+        if unpack:
+            if storage.is_packed_state_machine_path(child_lib_path):
+                lib_target_path = os.path.join(target_path, lib[:-len(storage.PACKED_STATE_MACHINE_EXTENSION)])
+                logger.info("Unpacking {0} to {1}".format(child_lib_path, lib_target_path))
+                storage.unpack_state_machine(child_lib_path, lib_target_path)
+            elif os.path.isdir(child_lib_path):
+                convert_packed_format_in_path(child_lib_path, os.path.join(target_path, lib), unpack)
+        elif os.path.isdir(child_lib_path):
+            if os.path.exists(os.path.join(child_lib_path, storage.STATEMACHINE_FILE)):
+                lib_target_path = os.path.join(target_path, lib + storage.PACKED_STATE_MACHINE_EXTENSION)
+                logger.info("Packing {0} to {1}".format(child_lib_path, lib_target_path))
+                storage.pack_state_machine(child_lib_path, lib_target_path)
+            elif os.path.exists(os.path.join(child_lib_path, storage.STATEMACHINE_FILE_OLD)):
+                logger.warning("State machine {0} has to be resaved before it can be packed".format(child_lib_path))
+            else:
+                convert_packed_format_in_path(child_lib_path, os.path.join(target_path, lib), unpack)
+
+
 if __name__ == '__main__':
     import sys
+    if len(sys.argv) >= 3 and sys.argv[1] in ("--pack", "--unpack"):
+        folder_to_convert = sys.argv[2]
+        target_path = None if len(sys.argv) < 4 else sys.argv[3]
+        logger.info("folder to convert: " + folder_to_convert)
+        convert_packed_format_in_path(folder_to_convert, target_path, unpack=sys.argv[1] == "--unpack")
+        exit(0)
     if len(sys.argv) < 3:
         logger.error("Wrong number of arguments")
         logger.error("Usage: resave_state_machine.py config_path library_folder_to_convert optional_target_folder gui_config_path")
+        logger.error("Usage: resave_state_machine.py --pack|--unpack library_folder_to_convert optional_target_folder")
         exit(0)
     config_path = sys.argv[1]
     gui_config_path = None if len(sys.argv) < 5 else sys.argv[4]
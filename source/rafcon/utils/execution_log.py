@@ -10,16 +10,332 @@
 # Sebastian Brunner <sebastian.brunner@dlr.de>
 # Sebastian Riedel <sebastian.riedel@dlr.de>
 
+"""
+.. module:: execution_log
+   :synopsis: Functions to read and analyze execution log files
+
+Execution logs are either written as shelve, mapping the history item ids to the records, or as append-only stream
+log file. A stream log file starts with :data:`STREAM_LOG_HEADER`, followed by the records in the order they were
+written. Each record is pickled and prefixed by its length as 4 byte unsigned integer (big endian). A sidecar index
+file (the log file name with :data:`STREAM_LOG_INDEX_SUFFIX`) holds one tab separated line per record with the
+history item id, the run id and the offset of the record in the log file.
+
+The static metadata of the states (e.g. name, description and semantic data), which is equal for all executions of a
+state, can be written once into a state catalogue inside the log. Such a catalogue entry is a record with the item type
+:data:`STATE_CATALOGUE_ITEM_TYPE`, whose key starts with :data:`STATE_CATALOGUE_KEY_PREFIX` and is composed of the
+state path and the hash of the metadata. The history item records only reference it via their `state_catalogue_key`.
+The catalogue entry is always written before the first record referencing it. All reading functions of this module
+re-join the records with the catalogue entries.
+"""
+
 from future.utils import string_types, native_str
 from builtins import range
 from builtins import str
 import shelve
+import hashlib
 import json
 import pickle
+import struct
+import time
 
 from rafcon.utils import log
 logger = log.get_logger(__name__)
 
+STREAM_LOG_HEADER = b"RAFCON-EXECUTION-LOG 1\n"
+STREAM_LOG_INDEX_SUFFIX = ".index"
+_RECORD_LENGTH = struct.Struct(">I")
+
+STATE_CATALOGUE_ITEM_TYPE = 'StateCatalogueEntry'
+STATE_CATALOGUE_KEY_PREFIX = 'state_catalogue:'
+# the fields of a record, which only depend on the state (or state machine) and are thus stored in the state catalogue
+STATE_CATALOGUE_FIELDS = ('path_by_name', 'state_type', 'state_name', 'description', 'semantic_data', 'is_library',
+                          'library_state_name', 'library_name', 'library_path',
+                          # fields of the StateMachineStartItem
+                          'root_state_storage_id', 'state_machine_version', 'used_rafcon_version', 'creation_time',
+                          'last_update', 'os_environment')
+
+
+def pack_record(record):
+    """Serializes a record of an execution history item for a stream log file
+
+    :param dict record: the record
+    :return: the length prefixed and pickled record
+    :rtype: bytes
+    """
+    data = pickle.dumps(record, protocol=2)
+    return _RECORD_LENGTH.pack(len(data)) + data
+
+
+def index_line(history_item_id, run_id, offset):
+    """Creates the line of a record in the index file of a stream log file"""
+    return "{0}\t{1}\t{2}\n".format(history_item_id, run_id, offset)
+
+
+def split_state_catalogue_entry(record):
+    """Splits the static state metadata off a record of an execution history item
+
+    The fields in :data:`STATE_CATALOGUE_FIELDS` are moved from the record into a new catalogue entry, which is
+    referenced by the record.
+
+    :param dict record: the record, which is modified in place
+    :return: the key of the catalogue entry, the catalogue entry and the record
+    :rtype: tuple
+    """
+    static_data = {}
+    for field in STATE_CATALOGUE_FIELDS:
+        if field in record:
+            static_data[field] = record.pop(field)
+    content_hash = hashlib.md5(pickle.dumps(static_data, protocol=2)).hexdigest()
+    key = "{0}{1}:{2}".format(STATE_CATALOGUE_KEY_PREFIX, record['path'], content_hash)
+    entry = static_data
+    entry['item_type'] = STATE_CATALOGUE_ITEM_TYPE
+    entry['history_item_id'] = key
+    entry['run_id'] = None
+    entry['timestamp'] = record['timestamp']
+    entry['path'] = record['path']
+    record['state_catalogue_key'] = key
+    return key, entry, record
+
+
+def is_state_catalogue_entry(record):
+    """Checks whether the given record is an entry of the state catalogue"""
+    return record['item_type'] == STATE_CATALOGUE_ITEM_TYPE
+
+
+def join_state_catalogue_entry(record, state_catalogue):
+    """Re-joins a record with the static state metadata of its catalogue entry
+
+    :param dict record: the record of an execution history item
+    :param dict state_catalogue: the catalogue entries by their keys
+    :return: the record including the static state metadata
+    :rtype: dict
+    """
+    key = record.get('state_catalogue_key')
+    if key is None:
+        return record
+    entry = state_catalogue[key]
+    joined_record = {field: entry[field] for field in STATE_CATALOGUE_FIELDS if field in entry}
+    joined_record.update(record)
+    del joined_record['state_catalogue_key']
+    return joined_record
+
+
+def join_state_catalogue(execution_history_items):
+    """Re-joins all records of a log with the static state metadata of the state catalogue
+
+    :param execution_history_items: history items, in the simplest case directly the opened shelve log file
+    :return: the given history items, if the log has no state catalogue, otherwise a dict mapping the history item ids
+        to the joined records (without the catalogue entries)
+    """
+    catalogue_keys = set(key for key in execution_history_items.keys()
+                         if isinstance(key, string_types) and key.startswith(STATE_CATALOGUE_KEY_PREFIX))
+    if not catalogue_keys:
+        return execution_history_items
+    state_catalogue = {key: execution_history_items[key] for key in catalogue_keys}
+    return {key: join_state_catalogue_entry(record, state_catalogue)
+            for key, record in execution_history_items.items() if key not in catalogue_keys}
+
+
+def _records_by_history_item_id(execution_history_items):
+    """Maps the re-joined records by their history item ids
+
+    The keys of a shelve are strings, whereas the history item ids are integers (or strings for logs of former RAFCON
+    versions). Mapping the records by their ids allows to look up the records referenced by other records.
+    """
+    return {record['history_item_id']: record for record in join_state_catalogue(execution_history_items).values()}
+
+
+def _iter_joined_records(records):
+    """Re-joins records in the order they were written with the preceding catalogue entries"""
+    state_catalogue = {}
+    for record in records:
+        if is_state_catalogue_entry(record):
+            state_catalogue[record['history_item_id']] = record
+        else:
+            yield join_state_catalogue_entry(record, state_catalogue)
+
+
+def _record_order(history_items, key):
+    """The sort key of a shelve record; catalogue entries are ordered before the records with the same timestamp"""
+    return history_items[key]['timestamp'], not key.startswith(STATE_CATALOGUE_KEY_PREFIX), key
+
+
+def is_stream_log(filename):
+    """Checks whether the given file is a stream log file
+
+    :param str filename: the path of the log file
+    :rtype: bool
+    """
+    try:
+        with open(filename, 'rb') as log_file:
+            return log_file.read(len(STREAM_LOG_HEADER)) == STREAM_LOG_HEADER
+    except (IOError, OSError):
+        return False
+
+
+def _iter_records(log_file, follow=False, poll_interval=0.5):
+    """Yields the offsets and records of an opened stream log file, starting at the current position"""
+    while True:
+        offset = log_file.tell()
+        data = None
+        length_data = log_file.read(_RECORD_LENGTH.size)
+        if len(length_data) == _RECORD_LENGTH.size:
+            length, = _RECORD_LENGTH.unpack(length_data)
+            data = log_file.read(length)
+            if len(data) != length:
+                data = None
+        if data is None:
+            # the end of the file or a record that is still being written was reached
+            if not follow:
+                return
+            log_file.seek(offset)
+            time.sleep(poll_interval)
+            continue
+        yield offset, pickle.loads(data)
+
+
+def _open_stream_log(filename):
+    log_file = open(filename, 'rb')
+    if log_file.read(len(STREAM_LOG_HEADER)) != STREAM_LOG_HEADER:
+        log_file.close()
+        raise ValueError("{0} is not a stream execution log file".format(filename))
+    return log_file
+
+
+def stream_log_records(filename, follow=False, poll_interval=0.5):
+    """Yields the records of a stream log file in the order they were written
+
+    The records are yielded as written, i.e. including the entries of the state catalogue. Use
+    :func:`ordered_log_records` for re-joined records.
+
+    :param str filename: the path of the log file
+    :param bool follow: if True, the generator waits for new records at the end of the file (like ``tail -f``) and
+        never returns
+    :param float poll_interval: the time in seconds between two checks for new records, if `follow` is True
+    :return: a generator of the records
+    """
+    with _open_stream_log(filename) as log_file:
+        for _, record in _iter_records(log_file, follow, poll_interval):
+            yield record
+
+
+def read_log_index(filename):
+    """Reads the index of a stream log file
+
+    If the index file does not exist, the index is created from the log file itself.
+
+    :param str filename: the path of the log file
+    :return: a list of (history item id, run id, offset) tuples of all records
+    :rtype: list
+    """
+    index = []
+    try:
+        with open(filename + STREAM_LOG_INDEX_SUFFIX, 'r') as index_file:
+            for line in index_file:
+                if not line.endswith('\n'):
+                    break  # the line is still being written
+                history_item_id, run_id, offset = line.rstrip('\n').split('\t')
+                index.append((history_item_id, run_id, int(offset)))
+    except (IOError, OSError):
+        with _open_stream_log(filename) as log_file:
+            for offset, record in _iter_records(log_file):
+                index.append((native_str(record['history_item_id']), str(record['run_id']), offset))
+    return index
+
+
+def log_records_for_run_id(filename, run_id):
+    """Yields the records of a stream log file belonging to a run id, using the index to seek the records
+
+    :param str filename: the path of the log file
+    :param str run_id: the run id of the state execution
+    :return: a generator of the records
+    """
+    index = read_log_index(filename)
+    catalogue_offsets = [offset for key, _, offset in index if key.startswith(STATE_CATALOGUE_KEY_PREFIX)]
+    offsets = [offset for _, record_run_id, offset in index if record_run_id == str(run_id)]
+    with _open_stream_log(filename) as log_file:
+        def read_record(offset):
+            log_file.seek(offset)
+            for _, record in _iter_records(log_file):
+                return record
+
+        state_catalogue = {}
+        for offset in catalogue_offsets:
+            entry = read_record(offset)
+            state_catalogue[entry['history_item_id']] = entry
+        for offset in offsets:
+            yield join_state_catalogue_entry(read_record(offset), state_catalogue)
+
+
+def load_log(filename):
+    """Opens an execution log file of any format
+
+    The records are re-joined with the state catalogue.
+
+    :param str filename: the path of the log file
+    :return: a mapping of history item ids to records, which can be passed to the functions of this module
+    """
+    if is_stream_log(filename):
+        return join_state_catalogue({native_str(record['history_item_id']): record
+                                     for record in stream_log_records(filename)})
+    history_items = shelve.open(filename, 'r')
+    joined_history_items = join_state_catalogue(history_items)
+    if joined_history_items is not history_items:
+        history_items.close()
+    return joined_history_items
+
+
+def convert_shelve_log_to_stream_log(shelve_filename, stream_filename):
+    """Converts a shelve execution log file into a stream log file
+
+    The records are written in the order of their timestamps.
+
+    :param str shelve_filename: the path of the shelve log file
+    :param str stream_filename: the path of the stream log file to be created
+    """
+    history_items = shelve.open(shelve_filename, 'r')
+    try:
+        keys = sorted(history_items.keys(), key=lambda key: _record_order(history_items, key))
+        with open(stream_filename, 'wb') as log_file, \
+                open(stream_filename + STREAM_LOG_INDEX_SUFFIX, 'w') as index_file:
+            log_file.write(STREAM_LOG_HEADER)
+            for key in keys:
+                record = history_items[key]
+                index_file.write(index_line(key, record['run_id'], log_file.tell()))
+                log_file.write(pack_record(record))
+    finally:
+        history_items.close()
+
+
+def export_log_with_string_ids(filename, export_filename):
+    """Exports an execution log of any format as shelve with globally unique string ids
+
+    The integer run ids and history item ids of the records are rendered as strings including the experiment id of
+    the log (see :func:`rafcon.core.id_generator.run_id_to_str`), as used by former versions of RAFCON. The records
+    are re-joined with the state catalogue.
+
+    :param str filename: the path of the log file
+    :param str export_filename: the path of the shelve file to be created
+    """
+    # imported here, as the utils do not depend on the core otherwise
+    from rafcon.core.id_generator import run_id_to_str, history_item_id_to_str
+    history_items = shelve.open(export_filename, 'n', protocol=2)
+    try:
+        experiment_id = None
+        for record in ordered_log_records(filename):
+            if record['item_type'] == 'StateMachineStartItem':
+                experiment_id = record.get('experiment_id')
+            if experiment_id is not None:
+                record = dict(record)
+                record['run_id'] = run_id_to_str(record['run_id'], experiment_id)
+                record['history_item_id'] = history_item_id_to_str(record['history_item_id'], experiment_id)
+                if record['prev_history_item_id'] is not None:
+                    record['prev_history_item_id'] = history_item_id_to_str(record['prev_history_item_id'],
+                                                                            experiment_id)
+            history_items[native_str(record['history_item_id'])] = record
+    finally:
+        history_items.close()
+
 
 def log_to_raw_structure(execution_history_items):
     """
@@ -34,6 +350,7 @@ def log_to_raw_structure(execution_history_items):
              grouped, a dict mapping run_id --> []list of history items with this run_id
     :rtype: tuple
     """
+    execution_history_items = _records_by_history_item_id(execution_history_items)
     previous = {}
     next_ = {}
     concurrent = {}
@@ -45,7 +362,7 @@ def log_to_raw_structure(execution_history_items):
             start_item = v
         else:
             # connect the item to its predecessor
-            prev_item_id = native_str(v['prev_history_item_id'])
+            prev_item_id = v['prev_history_item_id']
 
             if prev_item_id in execution_history_items:
                 ## should always be the case except if shelve is broken/missing data
@@ -75,6 +392,92 @@ def log_to_raw_structure(execution_history_items):
     return start_item, previous, next_, concurrent, grouped_by_run_id
 
 
+def _unpickle_data(data_dict, throw_on_pickle_error=True, include_erroneous_data_ports=False, keys=None):
+    """Unpickles the values of a data dictionary of a log record
+
+    :param data_dict: the data dictionary of the record
+    :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
+    :param bool include_erroneous_data_ports: flag if to include erroneous data ports
+    :param keys: the keys of the data to be unpickled or None for all data
+    :return: the dictionary with the unpickled values
+    :rtype: dict
+    """
+    r = dict()
+    # support backward compatibility
+    if isinstance(data_dict, string_types):  # formerly data dict was a json string
+        r = json.loads(data_dict)
+        if keys is not None:
+            r = {k: v for k, v in r.items() if k in keys}
+    else:
+        for k, v in data_dict.items():
+            if not k.startswith('!'):  # ! indicates storage error
+                if keys is not None and k not in keys:
+                    continue
+                try:
+                    r[k] = pickle.loads(v)
+                except Exception as e:
+                    if throw_on_pickle_error:
+                        raise
+                    elif include_erroneous_data_ports:
+                        r['!' + k] = (str(e), v)
+                    else:
+                        pass  # ignore
+            elif include_erroneous_data_ports and (keys is None or k[1:] in keys):
+                r[k] = v
+
+    return r
+
+
+def _collapse_state_execution(call_item, return_item, throw_on_pickle_error=True, include_erroneous_data_ports=False,
+                              columns=None):
+    """Merges the call and return item of a state execution into a collapsed item
+
+    :param dict call_item: the call item of the state execution
+    :param dict return_item: the return item of the state execution
+    :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
+    :param bool include_erroneous_data_ports: flag if to include erroneous data ports
+    :param dict columns: optional mapping of the data keys ('data_ins', 'data_outs', 'scoped_data_ins',
+        'scoped_data_outs', 'semantic_data') to the names of the data to be unpickled; data keys not in the mapping
+        are unpickled completely
+    :return: the collapsed representation of the state execution
+    :rtype: dict
+    """
+    columns = {} if columns is None else columns
+    execution_item = {}
+    ## add base properties will throw if not existing
+    for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type', 'path']:
+        execution_item[l] = call_item[l]
+
+    ## add extended properties (added in later rafcon versions),
+    ## will add default value if not existing instead
+    for l, default in [('semantic_data', {}),
+                         ('is_library', None),
+                         ('library_state_name', None),
+                         ('library_name', None),
+                         ('library_path', None)]:
+        execution_item[l] = return_item.get(l, default)
+
+    for l in ['outcome_name', 'outcome_id']:
+        execution_item[l] = return_item[l]
+    for l in ['timestamp']:
+        execution_item[l+'_call'] = call_item[l]
+        execution_item[l+'_return'] = return_item[l]
+
+    for key, data_dict in [('data_ins', call_item['input_output_data']),
+                           ('data_outs', return_item['input_output_data']),
+                           ('scoped_data_ins', call_item['scoped_data']),
+                           ('scoped_data_outs', return_item['scoped_data']),
+                           ('semantic_data', execution_item['semantic_data'])]:
+        execution_item[key] = _unpickle_data(data_dict, throw_on_pickle_error, include_erroneous_data_ports,
+                                             columns.get(key))
+    return execution_item
+
+
+def _is_collapsed_state_type(state_type):
+    """Whether the executions of states of the given type are part of the collapsed structure"""
+    return state_type in ('ExecutionState', 'HierarchyState', 'LibraryState') or 'Concurrency' in state_type
+
+
 def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=True,
                                include_erroneous_data_ports=False, full_next=False):
     """
@@ -106,6 +509,7 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
     # for k, v in execution_history_items.items():
     #     execution_history_items_dict[k] = v
 
+    execution_history_items = _records_by_history_item_id(execution_history_items)
     start_item, previous, next_, concurrent, grouped = log_to_raw_structure(execution_history_items)
 
     start_item = None
@@ -168,10 +572,7 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
 
             collapsed_next[rid] = execution_history_items[next_[gitems[0]['history_item_id']]]['run_id']
             collapsed_items[rid] = execution_item
-        elif gitems[0]['state_type'] == 'ExecutionState' or \
-             gitems[0]['state_type'] == 'HierarchyState' or \
-             gitems[0]['state_type'] == 'LibraryState' or \
-             'Concurrency' in gitems[0]['state_type']:
+        elif _is_collapsed_state_type(gitems[0]['state_type']):
 
             # for item in gitems:
             #     if item["description"] is not None:
@@ -248,58 +649,84 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
                     else:
                         collapsed_concurrent[prev_rid] = [rid]
 
-            # assemble grouped item
-            execution_item = {}
-            ## add base properties will throw if not existing
-            for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type', 'path']:
-                execution_item[l] = call_item[l]
+            collapsed_items[rid] = _collapse_state_execution(call_item, return_item, throw_on_pickle_error,
+                                                             include_erroneous_data_ports)
 
-            ## add extended properties (added in later rafcon versions),
-            ## will add default value if not existing instead
-            for l, default in [('semantic_data', {}),
-                                 ('is_library', None),
-                                 ('library_state_name', None),
-                                 ('library_name', None),
-                                 ('library_path', None)]:
-                execution_item[l] = return_item.get(l, default)
-
-            for l in ['outcome_name', 'outcome_id']:
-                execution_item[l] = return_item[l]
-            for l in ['timestamp']:
-                execution_item[l+'_call'] = call_item[l]
-                execution_item[l+'_return'] = return_item[l]
-
-            def unpickle_data(data_dict):
-                r = dict()
-                # support backward compatibility
-                if isinstance(data_dict, string_types):  # formerly data dict was a json string
-                    r = json.loads(data_dict)
-                else:
-                    for k, v in data_dict.items():
-                        if not k.startswith('!'): # ! indicates storage error
-                            try:
-                                r[k] = pickle.loads(v)
-                            except Exception as e:
-                                if throw_on_pickle_error:
-                                    raise
-                                elif include_erroneous_data_ports:
-                                    r['!' + k] = (str(e), v)
-                                else:
-                                    pass # ignore
-                        elif include_erroneous_data_ports:
-                            r[k] = v
-
-                return r
-
-            execution_item['data_ins'] = unpickle_data(call_item['input_output_data'])
-            execution_item['data_outs'] = unpickle_data(return_item['input_output_data'])
-            execution_item['scoped_data_ins'] = unpickle_data(call_item['scoped_data'])
-            execution_item['scoped_data_outs'] = unpickle_data(return_item['scoped_data'])
-            execution_item['semantic_data'] = unpickle_data(execution_item['semantic_data'])
+    return start_item, collapsed_next, collapsed_concurrent, collapsed_hierarchy, collapsed_items
 
-            collapsed_items[rid] = execution_item
 
-    return start_item, collapsed_next, collapsed_concurrent, collapsed_hierarchy, collapsed_items
+def ordered_log_records(filename):
+    """Yields the records of an execution log file of any format in the order they were written
+
+    The records of a shelve are ordered by their timestamps, for which all records have to be read once. The records
+    are re-joined with the state catalogue.
+
+    :param str filename: the path of the log file
+    :return: a generator of the records
+    """
+    if is_stream_log(filename):
+        for record in _iter_joined_records(stream_log_records(filename)):
+            yield record
+        return
+    history_items = shelve.open(filename, 'r')
+    try:
+        keys = sorted(history_items.keys(), key=lambda key: _record_order(history_items, key))
+        for record in _iter_joined_records(history_items[key] for key in keys):
+            yield record
+    finally:
+        history_items.close()
+
+
+def iter_collapsed_structure(records, throw_on_pickle_error=True, include_erroneous_data_ports=False, run_ids=None,
+                             start_time=None, end_time=None, columns=None):
+    """
+    Generator variant of :func:`log_to_collapsed_structure`: The collapsed state executions are yielded as soon as
+    the state execution is completed, i.e. its return item was read. Only the call items of the currently running
+    states are kept in memory. The relations between the state executions (next, concurrent, hierarchy) are not
+    computed.
+
+    :param records: the records of an execution log in the order they were written, e.g. from
+           :func:`stream_log_records` or :func:`ordered_log_records`
+    :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
+    :param bool include_erroneous_data_ports: flag if to include erroneous data ports
+    :param run_ids: optional collection of the run ids of the state executions to be yielded
+    :param float start_time: optional minimum call timestamp of the state executions to be yielded
+    :param float end_time: optional maximum call timestamp of the state executions to be yielded
+    :param dict columns: optional mapping of the data keys ('data_ins', 'data_outs', 'scoped_data_ins',
+           'scoped_data_outs', 'semantic_data') to the names of the data to be unpickled; data keys not in the
+           mapping are unpickled completely
+    :return: a generator of (run_id, collapsed item) tuples
+    """
+    run_ids = None if run_ids is None else set(run_ids)
+    call_items = {}
+    # the call types of the first call items of the state executions, which are filtered out by their call timestamp
+    skipped_call_types = {}
+    for record in _iter_joined_records(records):
+        if record['item_type'] == 'CallItem':
+            run_id = record['run_id']
+            if run_ids is not None and run_id not in run_ids or not _is_collapsed_state_type(record['state_type']):
+                continue
+            # the EXECUTE call item is written before the CONTAINER call item, which is only used for the root state
+            if run_id in call_items or run_id in skipped_call_types:
+                continue
+            if start_time is not None and record['timestamp'] < start_time or \
+                    end_time is not None and record['timestamp'] > end_time:
+                skipped_call_types[run_id] = record['call_type']
+                continue
+            call_items[run_id] = record
+        elif record['item_type'] == 'ReturnItem':
+            run_id = record['run_id']
+            call_item = call_items.get(run_id)
+            if call_item is None:
+                if skipped_call_types.get(run_id) == record['call_type']:
+                    del skipped_call_types[run_id]
+                continue
+            # the CONTAINER return item of a child container state is followed by its EXECUTE return item
+            if record['call_type'] == 'CONTAINER' and call_item['call_type'] == 'EXECUTE':
+                continue
+            del call_items[run_id]
+            yield run_id, _collapse_state_execution(call_item, record, throw_on_pickle_error,
+                                                    include_erroneous_data_ports, columns)
 
 
 def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_columns=[], scoped_in_columns=[],
@@ -328,9 +755,17 @@ def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_colum
     if len(gitems) == 0:
         return pd.DataFrame()
 
+    return _collapsed_items_to_DataFrame(list(gitems.values()), data_in_columns, data_out_columns, scoped_in_columns,
+                                         scoped_out_columns, semantic_data_columns)
+
+
+def _collapsed_items_to_DataFrame(collapsed_items, data_in_columns=[], data_out_columns=[], scoped_in_columns=[],
+                                  scoped_out_columns=[], semantic_data_columns=[]):
+    import pandas as pd
+
     # remove columns which are not generic over all states (basically the
     # data flow stuff)
-    df_keys = list(list(gitems.values())[0].keys())
+    df_keys = list(collapsed_items[0].keys())
     df_keys.remove('data_ins')
     df_keys.remove('data_outs')
     df_keys.remove('scoped_data_ins')
@@ -340,7 +775,7 @@ def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_colum
 
     df_items = []
 
-    for rid, item in gitems.items():
+    for item in collapsed_items:
         row_data = [item[k] for k in df_keys]
 
         for key, selected_columns in [('data_ins', data_in_columns),
@@ -370,6 +805,42 @@ def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_colum
     return df_timed
 
 
+def log_to_DataFrame_chunks(execution_history_items, chunk_size=10000, data_in_columns=[], data_out_columns=[],
+                            scoped_in_columns=[], scoped_out_columns=[], semantic_data_columns=[],
+                            throw_on_pickle_error=True, run_ids=None, start_time=None, end_time=None):
+    """
+    Yields the table representation of :func:`log_to_DataFrame` in chunks of `chunk_size` state executions, so that
+    large logs can be processed without holding the complete table in memory. Only the selected data ports and
+    semantic data are unpickled. The rows of each chunk are sorted by their call timestamp.
+
+    :param execution_history_items: the path of a log file or the records of a log in the order they were written
+    :param int chunk_size: the maximum number of rows per DataFrame
+    :param run_ids: see :func:`iter_collapsed_structure`
+    :param float start_time: see :func:`iter_collapsed_structure`
+    :param float end_time: see :func:`iter_collapsed_structure`
+    :return: a generator of pandas.DataFrame objects
+    """
+    columns = {'data_ins': data_in_columns,
+               'data_outs': data_out_columns,
+               'scoped_data_ins': scoped_in_columns,
+               'scoped_data_outs': scoped_out_columns,
+               'semantic_data': semantic_data_columns}
+    if isinstance(execution_history_items, string_types):
+        execution_history_items = ordered_log_records(execution_history_items)
+    collapsed_items = []
+    for _, item in iter_collapsed_structure(execution_history_items, throw_on_pickle_error=throw_on_pickle_error,
+                                            run_ids=run_ids, start_time=start_time, end_time=end_time,
+                                            columns=columns):
+        collapsed_items.append(item)
+        if len(collapsed_items) >= chunk_size:
+            yield _collapsed_items_to_DataFrame(collapsed_items, data_in_columns, data_out_columns, scoped_in_columns,
+                                                scoped_out_columns, semantic_data_columns)
+            collapsed_items = []
+    if collapsed_items:
+        yield _collapsed_items_to_DataFrame(collapsed_items, data_in_columns, data_out_columns, scoped_in_columns,
+                                            scoped_out_columns, semantic_data_columns)
+
+
 def log_to_ganttplot(execution_history_items):
     """
     Example how to use the DataFrame representation
@@ -20,9 +20,23 @@ import os
 import tarfile
 import stat
 import shutil
+import hashlib
+import time
+from collections import OrderedDict
 from os.path import realpath, dirname, join, expanduser
 import shutil, errno
 
+# modification times closer to the time they were recorded at are not trusted, as further changes within the
+# resolution of the file system time stamps would go unnoticed
+RACY_MTIME_INTERVAL = 2.
+
+# the maximum number of files, whose written contents are remembered by write_file_if_changed
+MAX_WRITTEN_FILE_DIGESTS = 10000
+
+# the digests of the contents written by write_file_if_changed by file path, together with the size and modification
+# time of the written file and the time these were recorded at, to detect changes of the file by others
+_written_file_digests = OrderedDict()
+
 
 def create_path(path):
     """Creates a absolute path in the file system.
@@ -105,7 +119,56 @@ def write_file(file_path, content, create_full_path=False):
     with open(file_path, 'w') as file_pointer:
         file_pointer.write(content)
     
-        
+
+
+def write_file_if_changed(file_path, content, force=False):
+    """Atomically writes the content to a file, unless the file already holds this content
+
+    The content is written to a temporary file, which is then renamed to the file path. Thus, the file never holds
+    partial content. Whether the file holds the content is checked via the digest of the last content written to the
+    file, as long as the size and modification time of the file did not change since then, or else by reading the
+    file, which is still cheaper than writing it, in particular on network file systems. Modification times, which
+    were recorded less than :data:`RACY_MTIME_INTERVAL` after they had been set, are not trusted.
+
+    :param str file_path: the path of the file
+    :param str content: the content to be written
+    :param bool force: if True, the file is written in any case
+    :return: True if the file was written, False if it already held the content
+    :rtype: bool
+    """
+    file_path = os.path.realpath(file_path)
+    digest = hashlib.md5(content if isinstance(content, bytes) else content.encode('utf-8')).hexdigest()
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        file_stat = None
+    if not force and file_stat is not None:
+        written_file_digest = _written_file_digests.get(file_path)
+        if written_file_digest is not None and \
+                written_file_digest[:3] == (digest, file_stat.st_size, file_stat.st_mtime) and \
+                written_file_digest[3] - file_stat.st_mtime >= RACY_MTIME_INTERVAL:
+            return False
+        if read_file(file_path) == content:
+            _remember_written_file_digest(file_path, digest, file_stat)
+            return False
+
+    tmp_file_path = "{0}.{1}.tmp".format(file_path, os.getpid())
+    with open(tmp_file_path, 'w') as file_pointer:
+        file_pointer.write(content)
+    if file_stat is not None:
+        shutil.copymode(file_path, tmp_file_path)
+    getattr(os, 'replace', os.rename)(tmp_file_path, file_path)
+    _remember_written_file_digest(file_path, digest, os.stat(file_path))
+    return True
+
+
+def _remember_written_file_digest(file_path, digest, file_stat):
+    _written_file_digests.pop(file_path, None)
+    _written_file_digests[file_path] = (digest, file_stat.st_size, file_stat.st_mtime, time.time())
+    while len(_written_file_digests) > MAX_WRITTEN_FILE_DIGESTS:
+        _written_file_digests.popitem(last=False)
+
+
 def get_default_config_path():
     home_path = expanduser('~')
     if home_path:
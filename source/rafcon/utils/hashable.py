@@ -17,6 +17,20 @@ import hashlib
 
 
 class Hashable(object):
+    """Base class for objects, whose (im)mutable data fields can be hashed
+
+    Nested Hashables are added to a hash by their digest (see :meth:`get_hash_digest`), so that the hashes form a
+    Merkle tree. Classes setting :attr:`cache_hash_digest` cache their digest and have to call
+    :meth:`invalidate_hash_digest` whenever their data fields are modified. The invalidation is passed on to the
+    Hashable returned by :meth:`get_hash_parent`, as its digest depends on the digests of its children. Thus, hashing
+    an object after a local modification only recomputes the digests on the path from the modified object to the
+    object.
+    """
+
+    #: Whether the digest of the hash is cached until :meth:`invalidate_hash_digest` is called
+    cache_hash_digest = False
+    _hash_digest = None
+
     @staticmethod
     def update_hash_from_dict(obj_hash, object_):
         """Updates an existing hash object with another Hashable, list, set, tuple, dict or stringifyable object
@@ -25,7 +39,7 @@ class Hashable(object):
         :param object_: The value that should be added to the hash (can be another Hashable or a dictionary)
         """
         if isinstance(object_, Hashable):
-            object_.update_hash(obj_hash)
+            obj_hash.update(object_.get_hash_digest())
         elif isinstance(object_, (list, set, tuple)):
             if isinstance(object_, set):  # A set is not ordered
                 object_ = sorted(object_)
@@ -45,6 +59,38 @@ class Hashable(object):
         """
         raise NotImplementedError()
 
+    def get_hash_digest(self):
+        """Returns the digest of a hash with the (im)mutable data fields of the object
+
+        The digest is cached, if :attr:`cache_hash_digest` is set.
+
+        :return: The digest of the hash
+        :rtype: bytes
+        """
+        digest = self._hash_digest
+        if digest is None:
+            obj_hash = hashlib.sha256()
+            self.update_hash(obj_hash)
+            digest = obj_hash.digest()
+            if self.cache_hash_digest:
+                self._hash_digest = digest
+        return digest
+
+    def invalidate_hash_digest(self):
+        """Invalidates the cached digest of the object and of all Hashables depending on it"""
+        hashable = self
+        while hashable is not None:
+            hashable._hash_digest = None
+            hashable = hashable.get_hash_parent()
+
+    def get_hash_parent(self):
+        """Returns the Hashable, whose hash depends on the digest of this object
+
+        :return: The Hashable or None
+        :rtype: Hashable
+        """
+        return None
+
     def mutable_hash(self, obj_hash=None):
         """Creates a hash with the (im)mutable data fields of the object
 
@@ -17,12 +17,24 @@
 """
 
 import json
+import math
 import yaml
 from time import gmtime, strftime, strptime, mktime
+from future.utils import string_types, integer_types
 
-from jsonconversion.decoder import JSONObjectDecoder
+from jsonconversion.conversion import string2type, get_class_from_qualified_name
 from jsonconversion.encoder import JSONObjectEncoder
 
+try:
+    import numpy as np
+except ImportError:
+    np = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 substitute_modules = {
     # backward compatibiliy (remove in next minor release): state elements
     'rafcon.statemachine.data_flow.DataFlow': 'rafcon.core.state_elements.data_flow.DataFlow',
@@ -99,6 +111,240 @@ def load_dict_from_yaml(path):
     return dictionary
 
 
+# the encoder of the files, depending on the versions of json and jsonconversion some of the options are ignored
+_file_encoder = JSONObjectEncoder(indent=4, check_circular=False, sort_keys=True)
+
+
+class JSONBackend(object):
+    """Serializes objects to json strings and loads them using the json module of the standard library
+
+    Backends using faster json libraries derive from this class and are registered with
+    :func:`register_json_backend`. The strings written to files by all backends are byte-identical to those of the
+    JSONObjectEncoder.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj, compact=False):
+        """Serializes an object to a json string
+
+        :param obj: the object to be serialized, e.g. a dictionary or a state
+        :param bool compact: if True, a string without whitespace is created, which is not byte-identical to the string
+            written to files and thus only intended for internal snapshots
+        :return: the json string
+        :rtype: str
+        """
+        return self._dumps_builtin_types(_BuiltinTypeConverter().convert(obj), compact)
+
+    @staticmethod
+    def _dumps_builtin_types(obj, compact):
+        # the objects are converted to builtin types in advance, which allows using the fast C encoder of the standard
+        # library, as long as the string is not indented
+        if compact:
+            return json.dumps(obj, separators=(',', ':'), check_circular=False)
+        return json.dumps(obj, indent=_file_encoder.indent, sort_keys=_file_encoder.sort_keys, check_circular=False,
+                          separators=(_file_encoder.item_separator, _file_encoder.key_separator))
+
+    def loads(self, json_string, as_dict=False):
+        """Loads the objects from a json string
+
+        :param str json_string: the json string
+        :param bool as_dict: if True, the objects are not converted and only dictionaries and lists are returned
+        :return: the loaded objects
+        """
+        if as_dict:
+            return json.loads(json_string)
+        return json.loads(json_string, object_hook=_dict_to_qualified_object)
+
+
+class OrjsonBackend(JSONBackend):
+    """Loads json strings and serializes objects to compact json strings using the orjson library
+
+    orjson does not add whitespace after separators and does not escape non-ASCII characters. Thus, the strings
+    written to files are still serialized by the standard library, as adding the whitespace takes longer than the
+    serialization itself.
+    """
+
+    name = 'orjson'
+
+    def dumps(self, obj, compact=False):
+        if not compact:
+            return super(OrjsonBackend, self).dumps(obj)
+        converter = _BuiltinTypeConverter(check_compatibility=True)
+        builtin_obj = converter.convert(obj)
+        if converter.compatible:
+            try:
+                return orjson.dumps(builtin_obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+            except orjson.JSONEncodeError:
+                # e.g. integers with more than 64 bits as keys
+                pass
+        return self._dumps_builtin_types(builtin_obj, compact)
+
+    def loads(self, json_string, as_dict=False):
+        try:
+            obj = orjson.loads(json_string)
+        except orjson.JSONDecodeError:
+            # e.g. NaN and Infinity, which are written by the standard library, but not supported by orjson
+            return super(OrjsonBackend, self).loads(json_string, as_dict)
+        if as_dict:
+            return obj
+        return _apply_object_hook(obj)
+
+
+_compatible_key_types = (str, int)
+
+
+class _BuiltinTypeConverter(object):
+    """Converts objects to the builtin types, in the same way as the JSONObjectEncoder does while encoding them
+
+    In addition, it can be checked, whether the converted objects can be serialized by a fast json library without
+    losing information. Such libraries support integers fitting into 64 bits, finite floats and keys being strings or
+    integers.
+
+    :param bool check_compatibility: whether to check the compatibility with fast json libraries
+    """
+
+    _encoder = JSONObjectEncoder()
+
+    def __init__(self, check_compatibility=False):
+        self.compatible = check_compatibility
+
+    def convert(self, obj):
+        if isinstance(obj, string_types) or obj is None or obj is True or obj is False:
+            return obj
+        if isinstance(obj, integer_types):
+            if self.compatible and not -2 ** 63 <= obj < 2 ** 64:
+                self.compatible = False
+            # subclasses are encoded like their base class by the standard library
+            return obj if type(obj) in integer_types else int(obj)
+        if isinstance(obj, float):
+            if self.compatible and (math.isnan(obj) or math.isinf(obj)):
+                self.compatible = False
+            return obj if type(obj) is float else float(obj)
+        if isinstance(obj, list):
+            return [self.convert(item) for item in obj]
+        if isinstance(obj, dict):
+            if self.compatible and not all(type(key) in _compatible_key_types for key in obj):
+                self.compatible = False
+            return {key: self.convert(value) for key, value in obj.items()}
+        # JSONObjects, tuples, sets and types
+        return self.convert(self._encoder.default(obj))
+
+
+_qualified_name_classes = {}
+_type_names_types = {}
+
+
+def _get_class_for_qualified_name(qualified_name):
+    """Returns the class of a qualified name, the classes are cached as resolving the name involves an import"""
+    try:
+        return _qualified_name_classes[qualified_name]
+    except KeyError:
+        cls = get_class_from_qualified_name(substitute_modules.get(qualified_name, qualified_name))
+        _qualified_name_classes[qualified_name] = cls
+        return cls
+
+
+def _dict_to_qualified_object(dictionary):
+    """Converts a loaded dictionary in the same way as the JSONObjectDecoder does, but with cached type names"""
+    if '__jsonqualname__' in dictionary:
+        cls = _get_class_for_qualified_name(dictionary.pop('__jsonqualname__'))
+        if cls is tuple:
+            return tuple(dictionary['items'])
+        if cls is set:
+            return set(dictionary['items'])
+        if np and cls is np.ndarray:
+            return np.array(dictionary['items'])
+        if hasattr(cls, "from_dict"):
+            return cls.from_dict(dictionary)
+        return dictionary
+    if '__type__' in dictionary:
+        type_name = dictionary['__type__']
+        try:
+            return _type_names_types[type_name]
+        except KeyError:
+            _type_names_types[type_name] = string2type(substitute_modules.get(type_name, type_name))
+            return _type_names_types[type_name]
+    # converts keys to integers, where possible
+    converted_dictionary = {}
+    for key, value in dictionary.items():
+        try:
+            key = int(key)
+        except ValueError:
+            pass
+        converted_dictionary[key] = value
+    return converted_dictionary
+
+
+def _apply_object_hook(obj):
+    """Converts the dictionaries of loaded builtin objects bottom-up, as the object hook of json.loads would do"""
+    if type(obj) is dict:
+        return _dict_to_qualified_object({key: _apply_object_hook(value) for key, value in obj.items()})
+    if type(obj) is list:
+        return [_apply_object_hook(item) for item in obj]
+    return obj
+
+
+_json_backends = {}
+_json_backend = None
+
+
+def register_json_backend(backend):
+    """Registers a json backend, which can then be selected with :func:`set_json_backend`
+
+    :param JSONBackend backend: the backend
+    """
+    _json_backends[backend.name] = backend
+
+
+def set_json_backend(name=None):
+    """Selects the json backend used for serializing and loading objects
+
+    :param str name: the name of a registered backend, None for the fastest available backend
+    """
+    global _json_backend
+    if name is None:
+        name = 'orjson' if 'orjson' in _json_backends else 'json'
+    if name not in _json_backends:
+        raise ValueError("Unknown json backend '{0}', available backends are: {1}".format(
+            name, ", ".join(sorted(_json_backends))))
+    _json_backend = _json_backends[name]
+
+
+def get_json_backend():
+    """Returns the selected json backend
+
+    :rtype: JSONBackend
+    """
+    return _json_backend
+
+
+def get_json_backend_names():
+    """Returns the names of the registered json backends"""
+    return sorted(_json_backends)
+
+
+register_json_backend(JSONBackend())
+if orjson is not None:
+    register_json_backend(OrjsonBackend())
+set_json_backend()
+
+
+def dict_to_json_string(dictionary, compact=False, **kwargs):
+    """
+    Serialize a dictionary to the json string written by write_dict_to_json.
+    :param dictionary: The dictionary to get serialized
+    :param compact: If True, the json string is not indented, e.g. for internal snapshots of objects
+    :param kwargs: optional additional parameters for dumper, passing them disables the selected json backend
+    :return: The json string
+    """
+    if kwargs:
+        if compact:
+            kwargs.setdefault('separators', (',', ':'))
+        return json.dumps(dictionary, cls=JSONObjectEncoder, indent=4, check_circular=False, sort_keys=True, **kwargs)
+    return _json_backend.dumps(dictionary, compact)
+
+
 def write_dict_to_json(dictionary, path, **kwargs):
     """
     Write a dictionary to a json file.
@@ -106,8 +352,7 @@ def write_dict_to_json(dictionary, path, **kwargs):
     :param dictionary: The dictionary to get saved
     :param kwargs: optional additional parameters for dumper
     """
-    result_string = json.dumps(dictionary, cls=JSONObjectEncoder,
-                               indent=4, check_circular=False, sort_keys=True, **kwargs)
+    result_string = dict_to_json_string(dictionary, **kwargs)
     with open(path, 'w') as f:
         # We cannot write directly to the file, as otherwise the 'encode' method wouldn't be called
         f.write(result_string)
@@ -119,10 +364,14 @@ def load_objects_from_json(path, as_dict=False):
     :param path: The relative path of the json file.
     :return: The dictionary specified in the json file
     """
-    f = open(path, 'r')
-    if as_dict:
-        result = json.load(f)
-    else:
-        result = json.load(f, cls=JSONObjectDecoder, substitute_modules=substitute_modules)
-    f.close()
-    return result
+    with open(path, 'r') as f:
+        return _json_backend.loads(f.read(), as_dict)
+
+
+def load_objects_from_json_string(json_string, as_dict=False):
+    """Loads a dictionary from a json string, e.g. the content of a json file read in advance.
+
+    :param str json_string: The json string
+    :return: The dictionary specified in the json string
+    """
+    return _json_backend.loads(json_string, as_dict)
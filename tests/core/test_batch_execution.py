@@ -0,0 +1,91 @@
+import os
+import json
+
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.core.batch_execution import run_batch, load_results
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+
+MULTIPLYING_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["product"] = inputs["x"] * inputs["factor"]
+    return 0 if outputs["product"] >= 0 else 1
+"""
+
+
+def create_state_machine(path):
+    root_state = HierarchyState("root")
+    root_x = root_state.add_input_data_port("x", "int", 0)
+    root_factor = root_state.add_input_data_port("factor", "int", 2)
+    root_product = root_state.add_output_data_port("product", "int")
+    root_state.add_outcome("negative", 1)
+    state = ExecutionState("multiply")
+    state.script_text = MULTIPLYING_SCRIPT
+    x = state.add_input_data_port("x", "int")
+    factor = state.add_input_data_port("factor", "int")
+    product = state.add_output_data_port("product", "int")
+    state.add_outcome("negative", 1)
+    root_state.add_state(state)
+    root_state.set_start_state(state.state_id)
+    root_state.add_data_flow(root_state.state_id, root_x, state.state_id, x)
+    root_state.add_data_flow(root_state.state_id, root_factor, state.state_id, factor)
+    root_state.add_data_flow(state.state_id, product, root_state.state_id, root_product)
+    root_state.add_transition(state.state_id, 0, root_state.state_id, 0)
+    root_state.add_transition(state.state_id, 1, root_state.state_id, 1)
+    storage.save_state_machine_to_path(StateMachine(root_state), path)
+
+
+def test_batch_execution(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        base_path = testing_utils.get_unique_temp_path()
+        state_machine_path = os.path.join(base_path, "batch_state_machine")
+        create_state_machine(state_machine_path)
+        table_path = os.path.join(base_path, "parameters.csv")
+        with open(table_path, 'w') as table_file:
+            table_file.write("x,factor\n")
+            for x in range(-2, 4):
+                table_file.write("{0},3\n".format(x))
+        results_path = os.path.join(base_path, "results.jsonl")
+
+        records = run_batch(state_machine_path, table_path, results_path, processes=2)
+        assert len(records) == 6
+        results = load_results(results_path)
+        assert sorted(results.keys()) == list(range(6))
+        for run_index, record in results.items():
+            x = run_index - 2
+            assert record['status'] == 'finished'
+            assert record['output_data']['product'] == 3 * x
+            assert record['final_outcome'] == ('negative' if x < 0 else 'success')
+            assert record['duration'] >= 0
+
+        # simulate an interrupted batch by removing the last two runs from the results
+        with open(results_path) as results_file:
+            lines = [line for line in results_file if json.loads(line)['run'] not in (4, 5)]
+        with open(results_path, 'w') as results_file:
+            results_file.writelines(lines + ['{"run": 5, "incomplete'])
+        records = run_batch(state_machine_path, table_path, results_path, processes=2, resume=True)
+        assert sorted(record['run'] for record in records) == [4, 5]
+        assert sorted(load_results(results_path).keys()) == list(range(6))
+
+        # an unknown port name is recorded as error of the run, the former results are overwritten
+        # ports missing in a row keep their default value, also if the former run of the worker set them
+        table_path = os.path.join(base_path, "parameters.json")
+        with open(table_path, 'w') as table_file:
+            json.dump([{"x": 2, "factor": 5}, {"x": 7, "y": 1}, {"factor": 3}, {"x": 4}], table_file)
+        records = sorted(run_batch(state_machine_path, table_path, results_path, processes=1),
+                         key=lambda record: record['run'])
+        assert [record['status'] for record in records] == ['finished', 'error', 'finished', 'finished']
+        assert [record.get('output_data', {}).get('product') for record in records] == [10, None, 0, 8]
+        assert len(load_results(results_path)) == 4
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=1)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
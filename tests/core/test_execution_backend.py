@@ -0,0 +1,97 @@
+import threading
+
+# core elements
+from rafcon.core.execution.worker_pool import WorkerPool
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+from tests.core.test_concurrency_barrier_state import create_concurrency_barrier_state
+
+THREAD_RECORDING_SCRIPT = """
+import threading
+
+def execute(self, inputs, outputs, gvm):
+    gvm.set_variable("executed_in_parent_thread", threading.current_thread() is self.parent.thread)
+    return 0
+"""
+
+
+def test_worker_pool():
+    pool = WorkerPool(2)
+    release = threading.Event()
+    tasks = [pool.submit(release.wait) for _ in range(3)]
+    statistics = pool.statistics
+    assert statistics['workers'] == 2
+    assert statistics['busy_workers'] == 2
+    assert statistics['overflow_threads'] == 1
+    assert all(task.is_alive() for task in tasks)
+
+    release.set()
+    for task in tasks:
+        task.join()
+    assert not any(task.is_alive() for task in tasks)
+
+    # finished workers are reused
+    pool.submit(lambda: None).join()
+    statistics = pool.statistics
+    assert statistics['workers'] == 2
+    assert statistics['submitted_tasks'] == 4
+
+    pool.shutdown()
+    with pytest.raises(RuntimeError):
+        pool.submit(lambda: None)
+
+
+def test_inline_execution_of_hierarchy_children(caplog):
+    testing_utils.initialize_environment_core(core_config={"EXECUTION_BACKEND": "worker_pool"})
+
+    root_state = HierarchyState("root")
+    child_state = ExecutionState("child")
+    child_state.script_text = THREAD_RECORDING_SCRIPT
+    root_state.add_state(child_state)
+    root_state.set_start_state(child_state)
+    root_state.add_transition(child_state.state_id, 0, root_state.state_id, 0)
+    state_machine = StateMachine(root_state)
+
+    try:
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+
+        assert root_state.final_outcome.outcome_id == 0
+        # the child state was executed in the thread of the root state
+        assert rafcon.core.singleton.global_variable_manager.get_variable("executed_in_parent_thread")
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_concurrency_children_in_worker_pool(caplog):
+    testing_utils.initialize_environment_core(core_config={"EXECUTION_BACKEND": "worker_pool"})
+
+    root_state = create_concurrency_barrier_state()
+    root_state.input_data = {"input_data_port1": 0.1, "input_data_port2": 0.1}
+    root_state.output_data = {"output_data_port1": None}
+    state_machine = StateMachine(root_state)
+
+    try:
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+
+        assert root_state.final_outcome.outcome_id == 4
+        statistics = rafcon.core.singleton.state_machine_execution_engine.worker_pool_statistics
+        assert statistics['submitted_tasks'] >= 2
+        assert statistics['workers'] >= 1
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_errors=1)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
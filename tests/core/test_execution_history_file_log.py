@@ -2,6 +2,7 @@
 import rafcon.core.singleton
 from rafcon.core.storage import storage as global_storage
 import rafcon.utils.execution_log as log_helper
+from future.utils import native_str
 
 # test environment elements
 import pytest
@@ -9,11 +10,21 @@ from tests import utils as testing_utils
 import os
 
 
-def test_execution_log(caplog):
+@pytest.mark.parametrize("state_catalogue", [False, True])
+def test_execution_log(state_catalogue, monkeypatch, caplog):
+    from rafcon.core.execution.execution_history import HistoryItem
+    static_field_items = []
+    get_static_fields = HistoryItem.get_static_fields
+
+    def count_static_fields(history_item):
+        static_field_items.append(history_item)
+        return get_static_fields(history_item)
+    monkeypatch.setattr(HistoryItem, "get_static_fields", count_static_fields)
     try:
         testing_utils.initialize_environment_core(
             core_config={'EXECUTION_LOG_ENABLE': True,
-                         'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path()+'/test_execution_log'})
+                         'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path()+'/test_execution_log',
+                         'EXECUTION_LOG_STATE_CATALOGUE': state_catalogue})
 
         state_machine = global_storage.load_state_machine_from_path(
             testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines",
@@ -27,7 +38,16 @@ def test_execution_log(caplog):
         import json
         ss = shelve.open(state_machine.get_last_execution_log_filename())
 
-        assert len(ss) == 36
+        if state_catalogue:
+            # 36 history items and the state catalogue entries of the 10 executed states (incl. the state machine)
+            assert len(ss) == 46
+            assert len([key for key in ss if key.startswith(log_helper.STATE_CATALOGUE_KEY_PREFIX)]) == 10
+            assert len(log_helper.join_state_catalogue(ss)) == 36
+            # the static metadata is only built once per state
+            assert len(static_field_items) == 10
+        else:
+            assert len(ss) == 36
+            assert len(static_field_items) == 36
 
         start, next, concurrent, hierarchy, collapsed_items = log_helper.log_to_collapsed_structure(ss)
 
@@ -62,6 +82,278 @@ def test_execution_log(caplog):
     finally:
         testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
 
+def test_streaming_execution_log_analysis(caplog):
+    try:
+        testing_utils.initialize_environment_core(
+            core_config={'EXECUTION_LOG_ENABLE': True,
+                         'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path()+'/test_execution_log'})
+
+        state_machine = global_storage.load_state_machine_from_path(
+            testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines",
+                                                        "execution_file_log_test")))
+
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        filename = state_machine.get_last_execution_log_filename()
+
+        import shelve
+        ss = shelve.open(filename)
+        start, next, concurrent, hierarchy, collapsed_items = log_helper.log_to_collapsed_structure(ss)
+        collapsed_items.pop(start['run_id'])
+
+        streamed_items = list(log_helper.iter_collapsed_structure(log_helper.ordered_log_records(filename)))
+        assert len(streamed_items) == len(collapsed_items)
+        # the data contains DataFrames, which cannot be compared directly
+        assert {run_id: repr(item) for run_id, item in streamed_items} == \
+            {run_id: repr(item) for run_id, item in collapsed_items.items()}
+        # the items are yielded in the order the state executions finished
+        return_timestamps = [item['timestamp_return'] for _, item in streamed_items]
+        assert return_timestamps == sorted(return_timestamps)
+
+        # column projection and filters
+        prod1_id = [k for k, v in collapsed_items.items() if v['state_name'] == 'MakeProd1'][0]
+        prod1 = collapsed_items[prod1_id]
+        projected_items = dict(log_helper.iter_collapsed_structure(
+            log_helper.ordered_log_records(filename), run_ids=[prod1_id], columns={'scoped_data_ins': ['product'],
+                                                                                   'data_ins': []}))
+        assert list(projected_items.keys()) == [prod1_id]
+        assert projected_items[prod1_id]['scoped_data_ins'] == {'product': 2}
+        assert projected_items[prod1_id]['data_ins'] == {}
+        assert projected_items[prod1_id]['data_outs'] == prod1['data_outs']
+        timed_items = dict(log_helper.iter_collapsed_structure(
+            log_helper.ordered_log_records(filename), start_time=prod1['timestamp_call'],
+            end_time=prod1['timestamp_call']))
+        assert list(timed_items.keys()) == [prod1_id]
+        # container states are filtered by the timestamp of their EXECUTE call item, not their CONTAINER call item
+        step_id = [k for k, v in collapsed_items.items() if v['state_name'] == 'Prod1Step1'][0]
+        timed_items = dict(log_helper.iter_collapsed_structure(
+            log_helper.ordered_log_records(filename), start_time=prod1['timestamp_call'] + 1e-6))
+        assert prod1_id not in timed_items
+        assert step_id in timed_items
+        # only the state types of the collapsed structure are yielded
+        decider_records = []
+        for record in log_helper.ordered_log_records(filename):
+            if record['run_id'] == prod1_id:
+                record = dict(record, state_type='DeciderState')
+            decider_records.append(record)
+        assert prod1_id not in dict(log_helper.iter_collapsed_structure(decider_records))
+
+        try:
+            import pandas as pd
+        except ImportError:
+            pass
+        else:
+            df = log_helper.log_to_DataFrame(ss, scoped_in_columns=['product'])
+            chunks = list(log_helper.log_to_DataFrame_chunks(filename, chunk_size=5, scoped_in_columns=['product']))
+            assert len(chunks) == (len(collapsed_items) + 4) // 5
+            assert all(len(chunk) <= 5 for chunk in chunks)
+            chunked_df = pd.concat(chunks)
+            assert list(chunked_df.columns) == list(df.columns)
+            # the chunks may differ in the data types of columns with missing values, thus only the content is compared
+            def table_content(table):
+                return sorted(zip(table.run_id, table.state_name, table.outcome_name, table.timestamp_return,
+                                  table.scoped_data_ins__product.where(table.scoped_data_ins__product.notnull())))
+            assert repr(table_content(chunked_df)) == repr(table_content(df))
+        ss.close()
+
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
+
+
+def test_execution_log_asynchronous_writer(caplog):
+    try:
+        testing_utils.initialize_environment_core(
+            core_config={'EXECUTION_LOG_ENABLE': True,
+                         'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path()+'/test_execution_log',
+                         'EXECUTION_LOG_ASYNCHRONOUS_WRITER': True,
+                         'EXECUTION_LOG_QUEUE_SIZE': 5,
+                         'EXECUTION_LOG_STATE_CATALOGUE': True})
+
+        state_machine = global_storage.load_state_machine_from_path(
+            testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines",
+                                                        "execution_file_log_test")))
+
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+
+        execution_history_storage = state_machine.execution_histories[-1].execution_history_storage
+        assert execution_history_storage.statistics == {'queue_depth': 0, 'written_records': 46,
+                                                        'dropped_records': 0}
+
+        import shelve
+        ss = shelve.open(state_machine.get_last_execution_log_filename())
+        assert len(ss) == 46
+        ss.close()
+
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
+
+
+@pytest.mark.parametrize("back_pressure", ["drop", "sample"])
+def test_execution_log_back_pressure(back_pressure):
+    from rafcon.core.execution.execution_history import BufferedExecutionHistoryStorage
+    import shelve
+    import threading
+    filename = os.path.join(testing_utils.get_unique_temp_path(), 'execution_log.shelve')
+    storage = BufferedExecutionHistoryStorage(filename, queue_size=1, back_pressure=back_pressure)
+    # the writer thread cannot write any records while the lock is held; as sampled records wait for a free slot in
+    # the queue, the lock is released by another thread
+    storage.store_lock.acquire()
+    threading.Timer(0.5, storage.store_lock.release).start()
+    for key in range(50):
+        storage.store_item(key, {'history_item_id': key})
+    if back_pressure == "drop":
+        assert storage.statistics['dropped_records'] >= 48
+    storage.close()
+    statistics = storage.statistics
+    assert statistics['dropped_records'] + statistics['written_records'] == 50
+    if back_pressure == "sample":
+        assert 0 < statistics['dropped_records'] < 48
+    ss = shelve.open(filename)
+    assert len(ss) == statistics['written_records']
+    ss.close()
+
+
+def test_execution_log_close_while_storing():
+    from rafcon.core.execution.execution_history import BufferedExecutionHistoryStorage
+    import threading
+    filename = os.path.join(testing_utils.get_unique_temp_path(), 'execution_log.shelve')
+    storage = BufferedExecutionHistoryStorage(filename, queue_size=2)
+
+    def store_items(offset):
+        for key in range(offset, offset + 100):
+            storage.store_item(key, {'history_item_id': key})
+    threads = [threading.Thread(target=store_items, args=(offset,)) for offset in range(0, 400, 100)]
+    for thread in threads:
+        thread.start()
+    storage.close()
+    for thread in threads:
+        thread.join()
+    # records stored after closing the log are dropped and not left in the queue
+    flush_thread = threading.Thread(target=storage.flush)
+    flush_thread.daemon = True
+    flush_thread.start()
+    flush_thread.join(5.)
+    assert not flush_thread.is_alive()
+    statistics = storage.statistics
+    assert statistics['queue_depth'] == 0
+    assert statistics['dropped_records'] + statistics['written_records'] == 400
+
+
+def test_execution_log_stream_format(caplog):
+    import shelve
+    try:
+        testing_utils.initialize_environment_core(
+            core_config={'EXECUTION_LOG_ENABLE': True,
+                         'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path()+'/test_execution_log',
+                         'EXECUTION_LOG_FORMAT': 'stream',
+                         'EXECUTION_LOG_STATE_CATALOGUE': True})
+
+        state_machine = global_storage.load_state_machine_from_path(
+            testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines",
+                                                        "execution_file_log_test")))
+
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+
+        filename = state_machine.get_last_execution_log_filename()
+        assert log_helper.is_stream_log(filename)
+        records = list(log_helper.stream_log_records(filename))
+        assert len(records) == 46
+        # the catalogue entry is written before the first record referencing it
+        assert log_helper.is_state_catalogue_entry(records[0])
+        assert records[1]['item_type'] == 'StateMachineStartItem'
+        assert records[1]['state_catalogue_key'] == records[0]['history_item_id']
+        assert [record['item_type'] for record in log_helper.ordered_log_records(filename)][0] == \
+            'StateMachineStartItem'
+        history_items = log_helper.load_log(filename)
+        assert len(history_items) == 36
+
+        start, next, concurrent, hierarchy, collapsed_items = log_helper.log_to_collapsed_structure(history_items)
+        prod1_id = [k for k, v in collapsed_items.items() if v['state_name'] == 'MakeProd1'][0]
+        assert collapsed_items[prod1_id]['scoped_data_ins']['product'] == 2
+        assert collapsed_items[prod1_id]['outcome_name'] == 'success'
+
+        run_id_records = list(log_helper.log_records_for_run_id(filename, prod1_id))
+        assert run_id_records[0]['item_type'] == 'CallItem' and run_id_records[-1]['item_type'] == 'ReturnItem'
+        assert all(record['run_id'] == prod1_id for record in run_id_records)
+        # without index file, the index is created from the log file
+        index = log_helper.read_log_index(filename)
+        os.remove(filename + log_helper.STREAM_LOG_INDEX_SUFFIX)
+        assert log_helper.read_log_index(filename) == index
+
+        # the conversion of a shelve log results in the same records
+        shelve_filename = os.path.join(testing_utils.get_unique_temp_path(), 'execution_log.shelve')
+        shelve_log = shelve.open(shelve_filename)
+        shelve_log.update({native_str(record['history_item_id']): record for record in records})
+        shelve_log.close()
+        converted_filename = os.path.join(testing_utils.get_unique_temp_path(), 'execution_log.log')
+        log_helper.convert_shelve_log_to_stream_log(shelve_filename, converted_filename)
+        assert list(log_helper.stream_log_records(converted_filename)) == records
+        assert log_helper.read_log_index(converted_filename) == index
+
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
+
+
+def test_execution_log_export_with_string_ids(caplog):
+    import shelve
+    from rafcon.core.id_generator import experiment_id
+    try:
+        testing_utils.initialize_environment_core(
+            core_config={'EXECUTION_LOG_ENABLE': True,
+                         'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path()+'/test_execution_log'})
+
+        state_machine = global_storage.load_state_machine_from_path(
+            testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines",
+                                                        "execution_file_log_test")))
+
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+
+        filename = state_machine.get_last_execution_log_filename()
+        records = list(log_helper.ordered_log_records(filename))
+        assert all(isinstance(record['run_id'], int) and isinstance(record['history_item_id'], int)
+                   for record in records)
+        assert records[0]['experiment_id'] == experiment_id
+
+        export_filename = os.path.join(testing_utils.get_unique_temp_path(), 'execution_log.shelve')
+        log_helper.export_log_with_string_ids(filename, export_filename)
+        exported_items = shelve.open(export_filename, 'r')
+        assert len(exported_items) == len(records)
+        assert all(key.startswith(experiment_id + ".history_item_id.") for key in exported_items.keys())
+        _, _, _, _, collapsed_items = log_helper.log_to_collapsed_structure(log_helper.load_log(filename))
+        _, _, _, _, exported_collapsed_items = log_helper.log_to_collapsed_structure(exported_items)
+        assert sorted(item['state_name'] for item in exported_collapsed_items.values()) == \
+            sorted(item['state_name'] for item in collapsed_items.values())
+        assert all(run_id.startswith(experiment_id + ".run_id.") for run_id in exported_collapsed_items)
+        exported_items.close()
+
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
+
+
+def test_follow_execution_log_stream():
+    from rafcon.core.execution.execution_history import StreamExecutionHistoryStorage
+    filename = os.path.join(testing_utils.get_unique_temp_path(), 'execution_log.log')
+    storage = StreamExecutionHistoryStorage(filename)
+    storage.store_item(1, {'history_item_id': 1, 'run_id': 'a'})
+    records = log_helper.stream_log_records(filename, follow=True, poll_interval=0.01)
+    assert next(records)['history_item_id'] == 1
+    storage.store_item(2, {'history_item_id': 2, 'run_id': 'b'})
+    assert next(records)['history_item_id'] == 2
+    records.close()
+    storage.close()
+
+
 if __name__ == '__main__':
     test_execution_log(None)
     # pytest.main([__file__])
@@ -0,0 +1,108 @@
+import os
+
+# singleton elements
+import rafcon.core.singleton
+from rafcon.core.storage import storage as global_storage
+from rafcon.core.execution.execution_history import ConcurrencyItem, ScopedDataItem
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+
+
+def describe_execution_history(execution_history):
+    description = []
+    for history_item in execution_history:
+        item_description = [type(history_item).__name__, history_item.path, history_item.state_reference.name]
+        if isinstance(history_item, ScopedDataItem):
+            item_description.append(history_item.call_type)
+            item_description.append(sorted((key, repr(scoped_data.value))
+                                           for key, scoped_data in history_item.scoped_data.items()))
+            item_description.append(sorted((key, repr(value))
+                                           for key, value in history_item.child_state_input_output_data.items()))
+        if isinstance(history_item, ConcurrencyItem):
+            item_description.append([describe_execution_history(child_execution_history)
+                                     for child_execution_history in history_item.execution_histories])
+        # the items are linked, also if they were spilled
+        if history_item.next is not None:
+            item_description.append(type(history_item.next).__name__)
+        description.append(item_description)
+    return description
+
+
+def execute_state_machine(max_items_in_memory=None, max_age_in_memory=None, max_histories_in_memory=None,
+                          executions=1):
+    testing_utils.initialize_environment_core(core_config={'EXECUTION_HISTORY_MAX_ITEMS_IN_MEMORY': max_items_in_memory,
+                                                           'EXECUTION_HISTORY_MAX_AGE_IN_MEMORY': max_age_in_memory,
+                                                           'EXECUTION_HISTORY_MAX_HISTORIES_IN_MEMORY':
+                                                               max_histories_in_memory})
+    state_machine = global_storage.load_state_machine_from_path(
+        testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "execution_file_log_test")))
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    for _ in range(executions):
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+    return state_machine
+
+
+def test_execution_history_retention(caplog):
+    try:
+        state_machine = execute_state_machine(max_items_in_memory=None)
+        execution_history = state_machine.execution_histories[-1]
+        assert execution_history.number_of_items_in_memory == len(execution_history)
+        unbounded_description = describe_execution_history(execution_history)
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+    try:
+        state_machine = execute_state_machine(max_items_in_memory=3)
+        execution_history = state_machine.execution_histories[-1]
+        assert execution_history.number_of_items_in_memory == 3
+        # spilled items are paged in transparently
+        assert describe_execution_history(execution_history) == unbounded_description
+        assert describe_execution_history(execution_history[1:5]) == unbounded_description[1:5]
+        item_ids = [history_item.history_item_id for history_item in execution_history]
+        assert execution_history[0].history_item_id == item_ids[0]
+        assert execution_history[-4].history_item_id == item_ids[-4]
+
+        # popping items pages in the spilled items again
+        popped_item_ids = []
+        while len(execution_history) > 0:
+            popped_item_ids.append(execution_history.pop_last_item().history_item_id)
+            assert execution_history.number_of_items_in_memory == min(len(execution_history), 2)
+        assert popped_item_ids == item_ids[::-1]
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+    try:
+        # recent items are kept in memory if only the age is limited
+        state_machine = execute_state_machine(max_age_in_memory=3600)
+        execution_history = state_machine.execution_histories[-1]
+        assert execution_history.number_of_items_in_memory == len(execution_history)
+        assert describe_execution_history(execution_history) == unbounded_description
+        # items older than the maximum age are spilled
+        execution_history.max_age_in_memory = 0
+        execution_history._apply_retention_policy()
+        assert execution_history.number_of_items_in_memory == execution_history.MIN_ITEMS_IN_MEMORY
+        assert describe_execution_history(execution_history) == unbounded_description
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+@pytest.mark.parametrize("max_histories_in_memory, expected_histories", [(None, 4), (2, 2)])
+def test_execution_histories_retention(max_histories_in_memory, expected_histories, caplog):
+    try:
+        state_machine = execute_state_machine(max_histories_in_memory=max_histories_in_memory, executions=4)
+        assert len(state_machine.execution_histories) == expected_histories
+        # the histories of the latest executions are kept
+        assert all(len(execution_history) > 0 for execution_history in state_machine.execution_histories)
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,115 @@
+import os
+
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.utils import filesystem
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+
+PAST_TIME = 1000000000
+
+
+def create_state_machine():
+    root_state = HierarchyState("root")
+    for name in ("first", "second"):
+        state = ExecutionState(name)
+        root_state.add_state(state)
+    return StateMachine(root_state)
+
+
+def get_files(base_path):
+    return sorted(os.path.join(folder_path, name) for folder_path, _, file_names in os.walk(base_path)
+                  for name in file_names)
+
+
+def set_mtimes_to_past(base_path):
+    for file_path in get_files(base_path):
+        os.utime(file_path, (PAST_TIME, PAST_TIME))
+
+
+def get_written_state_files(base_path):
+    """Returns the written files except the state machine file, which holds the time of the last update"""
+    return [os.path.relpath(file_path, base_path) for file_path in get_files(base_path)
+            if os.stat(file_path).st_mtime != PAST_TIME and os.path.basename(file_path) != storage.STATEMACHINE_FILE]
+
+
+def test_incremental_storage(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        base_path = testing_utils.get_unique_temp_path()
+        state_machine = create_state_machine()
+        storage.save_state_machine_to_path(state_machine, base_path)
+        first_state, second_state = sorted(state_machine.root_state.states.values(), key=lambda state: state.name)
+        root_state_folder = storage.get_storage_id_for_state(state_machine.root_state)
+        first_state_folder = os.path.join(root_state_folder, storage.get_storage_id_for_state(first_state))
+
+        # the files of unchanged states are not written again
+        set_mtimes_to_past(base_path)
+        storage.save_state_machine_to_path(state_machine, base_path)
+        assert get_written_state_files(base_path) == []
+
+        # a loaded state machine is saved without writing the state files
+        filesystem._written_file_digests.clear()
+        set_mtimes_to_past(base_path)
+        storage.save_state_machine_to_path(storage.load_state_machine_from_path(base_path), base_path)
+        assert get_written_state_files(base_path) == []
+
+        # only the files of the changed state are written
+        set_mtimes_to_past(base_path)
+        first_state.script_text += "\n# changed\n"
+        first_state.description = "changed"
+        storage.save_state_machine_to_path(state_machine, base_path)
+        assert get_written_state_files(base_path) == sorted([
+            os.path.join(first_state_folder, storage.FILE_NAME_CORE_DATA),
+            os.path.join(first_state_folder, storage.SCRIPT_FILE)])
+        assert not [name for name in os.listdir(os.path.join(base_path, first_state_folder)) if name.endswith('.tmp')]
+
+        # files changed by others are written again
+        with open(os.path.join(base_path, first_state_folder, storage.SCRIPT_FILE), 'w') as script_file:
+            script_file.write("changed by others")
+        storage.save_state_machine_to_path(state_machine, base_path)
+        with open(os.path.join(base_path, first_state_folder, storage.SCRIPT_FILE)) as script_file:
+            assert script_file.read() == first_state.script_text
+
+        # folders of removed states are removed
+        second_state_folder = os.path.join(root_state_folder, storage.get_storage_id_for_state(second_state))
+        state_machine.root_state.remove_state(second_state.state_id)
+        storage.save_state_machine_to_path(state_machine, base_path)
+        assert not os.path.exists(os.path.join(base_path, second_state_folder))
+        assert os.path.exists(os.path.join(base_path, first_state_folder))
+
+        # all files are written, if forced
+        set_mtimes_to_past(base_path)
+        storage.save_state_machine_to_path(state_machine, base_path, force=True)
+        assert len(get_written_state_files(base_path)) == len(get_files(base_path)) - 1
+        assert storage.load_state_machine_from_path(base_path).root_state == state_machine.root_state
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_write_file_if_changed_racy_mtime(monkeypatch):
+    file_path = os.path.join(testing_utils.get_unique_temp_path(), "file.txt")
+    assert filesystem.write_file_if_changed(file_path, "content")
+
+    # a change of the same size within the resolution of the file system time stamps is detected
+    mtime = os.stat(file_path).st_mtime
+    with open(file_path, 'w') as file_pointer:
+        file_pointer.write("changed")
+    os.utime(file_path, (mtime, mtime))
+    assert filesystem.write_file_if_changed(file_path, "content")
+    assert filesystem.read_file(file_path) == "content"
+
+    # the remembered digests are bounded
+    monkeypatch.setattr(filesystem, 'MAX_WRITTEN_FILE_DIGESTS', 2)
+    for name in ("a", "b", "c"):
+        filesystem.write_file_if_changed(os.path.join(os.path.dirname(file_path), name), name)
+    assert len(filesystem._written_file_digests) == 2
+    assert file_path not in filesystem._written_file_digests
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
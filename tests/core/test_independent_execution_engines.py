@@ -0,0 +1,88 @@
+import rafcon.core.singleton
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+
+COUNTING_SCRIPT = """
+import time
+
+def execute(self, inputs, outputs, gvm):
+    time.sleep(0.01)
+    counter = gvm.get_variable(inputs["counter_name"], default=0) + 1
+    gvm.set_variable(inputs["counter_name"], counter)
+    if counter < 20:
+        return "loop"
+    return 0
+"""
+
+
+def create_counting_state_machine(counter_name):
+    root_state = HierarchyState("root")
+    state = ExecutionState("count")
+    state.script_text = COUNTING_SCRIPT
+    state.add_outcome("loop", 1)
+    state.add_input_data_port("counter_name", "str", counter_name)
+    root_state.add_state(state)
+    root_state.set_start_state(state.state_id)
+    root_state.add_transition(state.state_id, 1, state.state_id, None)
+    root_state.add_transition(state.state_id, 0, root_state.state_id, 0)
+    state_machine = StateMachine(root_state)
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    return state_machine
+
+
+def test_independent_execution_engines(caplog):
+    testing_utils.initialize_environment_core()
+    gvm = rafcon.core.singleton.global_variable_manager
+    execution_engine = rafcon.core.singleton.state_machine_execution_engine
+    try:
+        state_machine_1 = create_counting_state_machine("counter_1")
+        state_machine_2 = create_counting_state_machine("counter_2")
+        execution_engine_1 = execution_engine.get_independent_execution_engine(state_machine_1.state_machine_id)
+        execution_engine_2 = execution_engine.get_independent_execution_engine(state_machine_2.state_machine_id)
+        assert execution_engine.get_independent_execution_engine(state_machine_1.state_machine_id) is \
+            execution_engine_1
+
+        execution_engine_1.start()
+        execution_engine_2.start()
+        execution_engine_1.pause()
+        assert execution_engine_2.join()
+        assert gvm.get_variable("counter_2") == 20
+        assert execution_engine_2.status.execution_mode is StateMachineExecutionStatus.FINISHED
+        # the states resolved their engine once, when they were started
+        count_state = list(state_machine_2.root_state.states.values())[0]
+        assert state_machine_2.root_state._execution_engine is execution_engine_2
+        assert count_state._execution_engine is count_state.execution_engine is execution_engine_2
+
+        # the paused state machine is not affected by the other execution nor by the default execution engine
+        assert execution_engine_1.status.execution_mode is StateMachineExecutionStatus.PAUSED
+        assert execution_engine.finished_or_stopped()
+        assert rafcon.core.singleton.state_machine_manager.active_state_machine_id is None
+        assert gvm.get_variable("counter_1") < 20
+
+        execution_engine_1.start()
+        assert execution_engine_1.join()
+        assert gvm.get_variable("counter_1") == 20
+
+        # a state machine executed by an independent engine cannot be started by another engine at the same time
+        execution_engine_1.step_mode()
+        execution_engine.start(state_machine_1.state_machine_id)
+        assert execution_engine.status.execution_mode is StateMachineExecutionStatus.STOPPED
+        execution_engine_1.stop()
+        execution_engine_1.join()
+
+        for state_machine in (state_machine_1, state_machine_2):
+            execution_engine.remove_independent_execution_engine(state_machine.state_machine_id)
+            rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        assert not execution_engine.independent_execution_engines
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_errors=1)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,68 @@
+import json
+
+from jsonconversion.encoder import JSONObjectEncoder
+
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_elements.transition import Transition
+from rafcon.utils import storage_utils
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+
+
+def create_state():
+    root_state = HierarchyState("root")
+    state = ExecutionState(u"state ä\"\x7f")
+    state.description = "quotes \", separators , : and escapes \\ \n \t"
+    state.add_input_data_port("tuple", "tuple", (1, "two"))
+    state.add_input_data_port("small", "float", 1e-7)
+    state.add_input_data_port("large", "float", 1e20)
+    state.add_input_data_port("infinite", "float", float("inf"))
+    state.add_input_data_port("huge", "int", 2 ** 70)
+    state.semantic_data = {"numbers": [0.1, -2.5e-5, 12345678901234567890], "nested": {"key": u"ü"}}
+    root_state.add_state(state)
+    return root_state
+
+
+def test_json_backends(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state = create_state()
+        child_state = list(state.states.values())[0]
+        expected_string = json.dumps(state, cls=JSONObjectEncoder, indent=4, check_circular=False, sort_keys=True)
+        expected_semantic_data_string = json.dumps(child_state.semantic_data, cls=JSONObjectEncoder, indent=4,
+                                                   check_circular=False, sort_keys=True)
+        for backend_name in storage_utils.get_json_backend_names():
+            storage_utils.set_json_backend(backend_name)
+            assert storage_utils.get_json_backend().name == backend_name
+
+            # the strings written to files do not depend on the backend
+            state_string = storage_utils.dict_to_json_string(state)
+            assert state_string == expected_string
+            assert storage_utils.dict_to_json_string(child_state.semantic_data) == expected_semantic_data_string
+            assert storage_utils.load_objects_from_json_string(state_string, as_dict=True) == json.loads(state_string)
+            child_state_string = storage_utils.dict_to_json_string(child_state)
+            assert storage_utils.load_objects_from_json_string(child_state_string) == child_state
+
+            # compact strings for internal snapshots are loaded to equal objects
+            for obj in (child_state, child_state.semantic_data):
+                compact_string = storage_utils.dict_to_json_string(obj, compact=True)
+                assert "\n" not in compact_string and ", " not in compact_string.split('"')[0]
+                assert storage_utils.load_objects_from_json_string(compact_string) == obj
+
+            # data types naming renamed modules are substituted
+            renamed_type_string = '{"__type__": "rafcon.statemachine.transition.Transition"}'
+            assert storage_utils.load_objects_from_json_string(renamed_type_string) is Transition
+
+        with pytest.raises(ValueError):
+            storage_utils.set_json_backend("unknown")
+        assert "rafcon.core.states.execution_state.ExecutionState" in storage_utils._qualified_name_classes
+    finally:
+        storage_utils.set_json_backend()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,93 @@
+import os
+import shutil
+
+import rafcon.core.singleton
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.core.library_index import LibraryIndex
+from rafcon.core.config import global_config
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+
+
+def create_library(path):
+    storage.save_state_machine_to_path(StateMachine(ExecutionState("library")), path)
+
+
+def set_mtimes_to_past(path):
+    """Modification times of the last seconds are not trusted by the index"""
+    for folder_path, _, file_names in os.walk(path):
+        for name in [''] + file_names:
+            os.utime(os.path.join(folder_path, name), (1000000000, 1000000000))
+
+
+def test_library_index(monkeypatch, caplog):
+    library_root_path = testing_utils.get_unique_temp_path()
+    for library_path in ("lib_a", os.path.join("folder", "lib_b"), os.path.join("folder", "sub_folder", "lib_c")):
+        create_library(os.path.join(library_root_path, library_path))
+    index_file_path = os.path.join(testing_utils.get_unique_temp_path(), "library_index.json")
+    library_manager = rafcon.core.singleton.library_manager
+
+    testing_utils.initialize_environment_core(libraries={"index_test": library_root_path})
+    try:
+        expected_libraries = library_manager.libraries["index_test"]
+        assert library_manager.library_index is None
+
+        listed_folders = []
+        original_listdir = os.listdir
+
+        def listdir(path):
+            listed_folders.append(path)
+            return original_listdir(path)
+        monkeypatch.setattr(os, "listdir", listdir)
+
+        global_config.set_config_value("LIBRARY_INDEX_FILE", index_file_path)
+        set_mtimes_to_past(library_root_path)
+        library_manager.initialize()
+        assert library_manager.libraries["index_test"] == expected_libraries
+        assert os.path.exists(index_file_path)
+        assert library_manager.library_index.get_library_entry(library_root_path, ["folder", "lib_b"])['version'] is None
+
+        # the unchanged library tree is loaded from a fresh index without listing any folder
+        library_manager._library_index = None
+        del listed_folders[:]
+        library_manager.initialize()
+        assert library_manager.libraries["index_test"] == expected_libraries
+        assert not [path for path in listed_folders if path.startswith(library_root_path)]
+
+        # only the changed folder is listed again
+        create_library(os.path.join(library_root_path, "folder", "sub_folder", "lib_d"))
+        del listed_folders[:]
+        library_manager.initialize()
+        assert os.path.join(library_root_path, "folder", "sub_folder") in listed_folders
+        assert library_root_path not in listed_folders
+        assert "lib_d" in library_manager.libraries["index_test"]["folder"]["sub_folder"]
+
+        # removed libraries are detected by refreshing a sub folder
+        shutil.rmtree(os.path.join(library_root_path, "folder", "lib_b"))
+        library_manager.refresh_libraries(os.path.join("index_test", "folder"))
+        assert "lib_b" not in library_manager.libraries["index_test"]["folder"]
+        assert library_manager.libraries["index_test"]["lib_a"] == os.path.join(library_root_path, "lib_a")
+        assert LibraryIndex(index_file_path).scan(library_root_path) == library_manager.libraries["index_test"]
+        # a library path refreshes the folder of the library
+        library_manager.refresh_libraries(os.path.join("index_test", "lib_a"))
+        assert library_manager.libraries["index_test"]["lib_a"] == os.path.join(library_root_path, "lib_a")
+
+        # libraries in the packed format are indexed as files
+        packed_library_path = os.path.join(library_root_path, "folder",
+                                           "lib_e" + storage.PACKED_STATE_MACHINE_EXTENSION)
+        create_library(packed_library_path)
+        library_manager.refresh_libraries(os.path.join("index_test", "folder"))
+        assert library_manager.libraries["index_test"]["folder"]["lib_e"] == packed_library_path
+        assert library_manager.library_index.get_library_entry(library_root_path, ["folder", "lib_e"])['packed']
+        assert LibraryIndex(index_file_path).scan(library_root_path) == library_manager.libraries["index_test"]
+    finally:
+        global_config.set_config_value("LIBRARY_INDEX_FILE", None)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -1,4 +1,5 @@
 import os
+from copy import deepcopy
 from os.path import join
 
 # core elements
@@ -150,6 +151,55 @@ def test_hierarchy_state_library(caplog):
         testing_utils.assert_logger_warnings_and_errors(caplog)
 
 
+def test_shared_library_template(caplog):
+    with testing_utils.test_multithreading_lock:
+        state_machine = create_hierarchy_state_library_state_machine()
+        other_state_machine = create_hierarchy_state_library_state_machine()
+        lib_state = state_machine.root_state.states["library_hierarchy_state"]
+        other_lib_state = other_state_machine.root_state.states["library_hierarchy_state"]
+
+        # the library states share the template and create no private copy until needed
+        assert lib_state.library_root_state is other_lib_state.library_root_state
+        assert not lib_state.state_copy_initialized and not other_lib_state.state_copy_initialized
+        assert lib_state == other_lib_state
+        assert lib_state.mutable_hash().hexdigest() == other_lib_state.mutable_hash().hexdigest()
+        assert lib_state.get_states_statistics(0) == (3, 2)
+
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        assert state_machine.root_state.output_data["data_output_port1"] == 42.0
+        assert lib_state.state_copy_initialized and not other_lib_state.state_copy_initialized
+        assert lib_state.state_copy is not other_lib_state.library_root_state
+        assert lib_state.state_copy.parent is lib_state
+        assert lib_state.state_copy.input_data_ports is lib_state.input_data_ports
+        assert lib_state.mutable_hash().hexdigest() == other_lib_state.mutable_hash().hexdigest()
+
+        # the private copies share the semantic data and the compiled script modules of the template
+        template = lib_state.library_template
+        execution_state_id = next(state_id for state_id, state in template.states.items()
+                                  if isinstance(state, ExecutionState))
+        template_state = template.states[execution_state_id]
+        copied_state = lib_state.state_copy.states[execution_state_id]
+        other_copied_state = other_lib_state.state_copy.states[execution_state_id]
+        assert copied_state.semantic_data is template_state.semantic_data
+        assert copied_state.script.compiled_module is template_state.script.compiled_module is not None
+        other_copied_state.script.build_module_if_required()
+        assert other_copied_state.script.compiled_module is template_state.script.compiled_module
+        # the shared semantic data is copied before it is modified
+        copied_state.add_semantic_data([], "value", "key")
+        assert copied_state.semantic_data is not template_state.semantic_data
+        assert "key" not in template_state.semantic_data and "key" not in other_copied_state.semantic_data
+
+        # the deprecated copy instance of a library is a deep copy of the template
+        with pytest.warns(DeprecationWarning):
+            _, library_copy = rafcon.core.singleton.library_manager.get_library_state_copy_instance(
+                lib_state.lib_os_path)
+        assert library_copy is not template and library_copy == template
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
 def test_save_nested_library_state(caplog):
     library_with_nested_library_sm = create_hierarchy_state_library_state_machine()
 
@@ -177,6 +227,39 @@ def test_nested_library_state_machine(caplog):
         testing_utils.assert_logger_warnings_and_errors(caplog)
 
 
+def test_lazy_library_loading(caplog):
+    with testing_utils.test_multithreading_lock:
+        library_manager = rafcon.core.singleton.library_manager
+        rafcon.core.config.global_config.set_config_value("LIBRARY_LOADING", "lazy")
+        try:
+            library_manager.initialize()
+            library_manager.clean_loaded_libraries()
+            nested_library_state = LibraryState("temporary_libraries", "library_with_nested_library", "0.1",
+                                                "nested_library_state_name", "nested_library_state_id")
+            state_machine = StateMachine(nested_library_state)
+            # only the interface of the library is loaded
+            assert not nested_library_state.library_loaded
+            assert not library_manager._loaded_libraries
+            assert nested_library_state.get_states_statistics(0) == (1, 1)
+            assert sorted(port.name for port in nested_library_state.input_data_ports.values()) == ["data_input_port1"]
+            # neither hashing nor comparing library states loads the library
+            lazy_hash = state_machine.mutable_hash().hexdigest()
+            assert nested_library_state == deepcopy(nested_library_state)
+            assert not nested_library_state.library_loaded and not library_manager._loaded_libraries
+
+            rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+            rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+            rafcon.core.singleton.state_machine_execution_engine.join()
+            assert nested_library_state.output_data["data_output_port1"] == 42.0
+            assert nested_library_state.library_loaded and nested_library_state.state_copy_initialized
+            assert nested_library_state.get_states_statistics(0)[0] > 1
+            assert state_machine.mutable_hash().hexdigest() != lazy_hash
+            rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        finally:
+            rafcon.core.config.global_config.set_config_value("LIBRARY_LOADING", "preload")
+        testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
 def test_rafcon_library_path_variable(caplog):
     rafcon.core.config.global_config.set_config_value("LIBRARY_PATHS", {})
     os.environ['RAFCON_LIBRARY_PATH'] = os.path.join(testing_utils.LIBRARY_SM_PATH, 'generic')
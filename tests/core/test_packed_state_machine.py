@@ -0,0 +1,88 @@
+import os
+import zipfile
+
+import rafcon.core.singleton
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.library_state import LibraryState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.core.config import global_config
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+
+DOUBLING_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["result"] = 2 * inputs["value"]
+    return 0
+"""
+
+
+def create_state_machine():
+    root_state = HierarchyState("root")
+    root_value = root_state.add_input_data_port("value", "int", 21)
+    root_result = root_state.add_output_data_port("result", "int")
+    state = ExecutionState("double")
+    state.script_text = DOUBLING_SCRIPT
+    state.semantic_data = {"purpose": "test"}
+    value = state.add_input_data_port("value", "int")
+    result = state.add_output_data_port("result", "int")
+    root_state.add_state(state)
+    root_state.set_start_state(state.state_id)
+    root_state.add_data_flow(root_state.state_id, root_value, state.state_id, value)
+    root_state.add_data_flow(state.state_id, result, root_state.state_id, root_result)
+    root_state.add_transition(state.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def test_packed_state_machine(caplog):
+    base_path = testing_utils.get_unique_temp_path()
+    library_root_path = os.path.join(base_path, "libraries")
+    os.makedirs(library_root_path)
+    testing_utils.initialize_environment_core(libraries={"packed_libraries": library_root_path})
+    try:
+        state_machine = create_state_machine()
+        archive_path = os.path.join(library_root_path, "doubling" + storage.PACKED_STATE_MACHINE_EXTENSION)
+        storage.save_state_machine_to_path(state_machine, archive_path)
+        assert os.path.isfile(archive_path)
+        with zipfile.ZipFile(archive_path) as archive:
+            assert storage.STATEMACHINE_FILE in archive.namelist()
+        loaded_state_machine = storage.load_state_machine_from_path(archive_path)
+        assert loaded_state_machine.root_state == state_machine.root_state
+        assert loaded_state_machine.file_system_path == archive_path
+        loaded_state = list(loaded_state_machine.root_state.states.values())[0]
+        assert loaded_state.script_text == DOUBLING_SCRIPT
+        assert loaded_state.semantic_data == {"purpose": "test"}
+
+        # conversion between the folder format and the packed format
+        folder_path = os.path.join(base_path, "unpacked")
+        storage.unpack_state_machine(archive_path, folder_path)
+        assert storage.load_state_machine_from_path(folder_path).root_state == state_machine.root_state
+        repacked_archive_path = os.path.join(base_path, "repacked" + storage.PACKED_STATE_MACHINE_EXTENSION)
+        storage.pack_state_machine(folder_path, repacked_archive_path)
+        assert storage.load_state_machine_from_path(repacked_archive_path).root_state == state_machine.root_state
+
+        # packed libraries are found by the library manager and can be executed
+        library_manager = rafcon.core.singleton.library_manager
+        for library_loading in ("preload", "lazy"):
+            global_config.set_config_value("LIBRARY_LOADING", library_loading)
+            library_manager.initialize()
+            assert library_manager.libraries["packed_libraries"]["doubling"] == archive_path
+            assert library_manager.get_library_path_and_name_for_os_path(archive_path) == \
+                ("packed_libraries", "doubling")
+            library_state = LibraryState("packed_libraries", "doubling", "None", "library")
+            library_state_machine = StateMachine(library_state)
+            rafcon.core.singleton.state_machine_manager.add_state_machine(library_state_machine)
+            rafcon.core.singleton.state_machine_execution_engine.start(library_state_machine.state_machine_id)
+            rafcon.core.singleton.state_machine_execution_engine.join()
+            assert library_state.output_data["result"] == 42
+            rafcon.core.singleton.state_machine_manager.remove_state_machine(library_state_machine.state_machine_id)
+    finally:
+        global_config.set_config_value("LIBRARY_LOADING", "preload")
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
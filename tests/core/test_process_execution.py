@@ -0,0 +1,103 @@
+import os
+import time
+
+import rafcon.core.singleton
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+
+COMPUTING_SCRIPT = """
+import os
+
+def execute(self, inputs, outputs, gvm):
+    outputs["sum"] = sum(i * i for i in range(inputs["n"]))
+    outputs["pid"] = os.getpid()
+    self.persistent_variables["runs"] = self.persistent_variables.get("runs", 0) + 1
+    outputs["runs"] = self.persistent_variables["runs"]
+    gvm.set_variable("computed_sum", outputs["sum"])
+    return 0
+"""
+
+WAITING_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    gvm.set_variable("waiting", True)
+    while not self.preempted:
+        self.wait_for_interruption(1.)
+    return 0
+"""
+
+FAILING_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    raise ValueError("expected error")
+"""
+
+
+def create_state_machine(script_text):
+    root_state = HierarchyState("root")
+    state = ExecutionState("process")
+    state.script_text = script_text
+    state.execute_in_process = True
+    state.add_input_data_port("n", "int", 1000)
+    for name in ("sum", "pid", "runs"):
+        state.add_output_data_port(name, "int")
+    root_state.add_state(state)
+    root_state.set_start_state(state.state_id)
+    root_state.add_transition(state.state_id, 0, root_state.state_id, 0)
+    state_machine = StateMachine(root_state)
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    return state_machine, state
+
+
+def test_execute_in_process_flag():
+    state = ExecutionState("process")
+    assert "execute_in_process" not in state.to_dict()
+    state.execute_in_process = True
+    assert ExecutionState.from_dict(state.to_dict()).execute_in_process
+    assert state.__copy__().execute_in_process
+
+
+def test_process_execution(caplog):
+    testing_utils.initialize_environment_core()
+    execution_engine = rafcon.core.singleton.state_machine_execution_engine
+    gvm = rafcon.core.singleton.global_variable_manager
+    try:
+        state_machine, state = create_state_machine(COMPUTING_SCRIPT)
+        for run in (1, 2):
+            execution_engine.start(state_machine.state_machine_id)
+            execution_engine.join()
+            assert state.output_data["sum"] == sum(i * i for i in range(1000))
+            assert state.output_data["pid"] != os.getpid()
+            assert state.output_data["runs"] == run
+            assert gvm.get_variable("computed_sum") == state.output_data["sum"]
+        # the worker process is reused
+        assert execution_engine.process_pool.statistics["workers"] == 1
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+        # the preemption of the state is forwarded to the worker process
+        state_machine, state = create_state_machine(WAITING_SCRIPT)
+        execution_engine.start(state_machine.state_machine_id)
+        while not gvm.variable_exist("waiting"):
+            time.sleep(0.01)
+        execution_engine.stop()
+        execution_engine.join()
+        assert state.final_outcome.outcome_id == -2
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+        # errors of the script abort the state
+        state_machine, state = create_state_machine(FAILING_SCRIPT)
+        execution_engine.start(state_machine.state_machine_id)
+        execution_engine.join()
+        assert isinstance(state.output_data["error"], ValueError)
+        assert state.final_outcome.outcome_id == -1
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        execution_engine.process_pool.shutdown()
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_errors=2)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
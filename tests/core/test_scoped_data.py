@@ -68,5 +68,67 @@ def test_scoped_data(caplog):
         testing_utils.assert_logger_warnings_and_errors(caplog)
 
 
+def test_inputs_for_state_follow_data_flow_changes():
+    state_machine = create_state_machine()
+    root_state = state_machine.root_state
+    states_by_name = {state.name: state for state in root_state.states.values()}
+    state1, state2 = states_by_name["first_state"], states_by_name["second_state"]
+
+    root_state.setup_run()
+    root_state.add_input_data_to_scoped_data({"data_input_port1": 1.0})
+    assert root_state.get_inputs_for_state(state1)["data_input_port1"] == 1.0
+    root_state.add_state_execution_output_to_scoped_data({"data_output_port1": 2.0}, state1)
+    assert root_state.get_inputs_for_state(state2)["data_input_port1"] == 2.0
+
+    # redirect the data flow into state2 to the input of the root state
+    state2_input_key = state2.get_io_data_port_id_from_name_and_type("data_input_port1", InputDataPort)
+    data_flow = [df for df in root_state.data_flows.values() if df.to_state == state2.state_id][0]
+    data_flow.modify_origin(root_state.state_id,
+                            root_state.get_io_data_port_id_from_name_and_type("data_input_port1", InputDataPort))
+    assert root_state.get_inputs_for_state(state2)["data_input_port1"] == 1.0
+
+    # without data flow, the default value of the port is used
+    root_state.remove_data_flow(data_flow.data_flow_id)
+    assert root_state.get_inputs_for_state(state2)["data_input_port1"] == \
+        state2.input_data_ports[state2_input_key].default_value
+
+
+def test_scoped_data_snapshots_share_unchanged_entries():
+    from rafcon.core.execution.execution_history import CallItem, ReturnItem, CallType
+    state_machine = create_state_machine()
+    root_state = state_machine.root_state
+    states_by_name = {state.name: state for state in root_state.states.values()}
+    state1, state2 = states_by_name["first_state"], states_by_name["second_state"]
+
+    root_state.setup_run()
+    root_state.add_input_data_to_scoped_data({"data_input_port1": [1.0]})
+    call_item = CallItem(state1, None, CallType.EXECUTE, root_state, {"data_input_port1": [1.0]}, 0)
+    output_data = {"data_output_port1": [2.0]}
+    root_state.add_state_execution_output_to_scoped_data(output_data, state1)
+    return_item = ReturnItem(state1, call_item, CallType.EXECUTE, root_state, output_data, 0)
+
+    input_key = str(root_state.get_io_data_port_id_from_name_and_type("data_input_port1", InputDataPort)) + \
+        root_state.state_id
+    output_key = str(state1.get_io_data_port_id_from_name_and_type("data_output_port1", OutputDataPort)) + \
+        state1.state_id
+    # the unchanged input entry is shared, the new output entry is a copy
+    assert return_item.scoped_data[input_key] is call_item.scoped_data[input_key]
+    assert output_key not in call_item.scoped_data
+    assert return_item.scoped_data[output_key] is not root_state.scoped_data[output_key]
+    assert return_item.child_state_input_output_data["data_output_port1"] is \
+        return_item.scoped_data[output_key].value
+
+    # later changes of the scoped data do not affect the snapshots
+    output_data["data_output_port1"].append(3.0)
+    root_state.add_state_execution_output_to_scoped_data({"data_output_port1": [4.0]}, state1)
+    assert return_item.scoped_data[output_key].value == [2.0]
+    assert return_item.child_state_input_output_data["data_output_port1"] == [2.0]
+
+    # a state stepping back to a snapshot must not modify it
+    root_state.scoped_data = return_item.scoped_data
+    root_state.add_state_execution_output_to_scoped_data({"data_output_port1": [5.0]}, state2)
+    assert len(return_item.scoped_data) == 2
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
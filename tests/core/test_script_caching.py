@@ -0,0 +1,66 @@
+import os
+import time
+
+from rafcon.core.config import global_config
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.utils.filesystem import write_file
+
+from tests import utils as testing_utils
+
+COUNTER_SCRIPT = """
+counter = 0
+
+def execute(self, inputs, outputs, gvm):
+    global counter
+    counter += 1
+    outputs["counter"] = counter
+    return 0
+"""
+
+
+def execute_state(state):
+    outputs = {"counter": None}
+    state._execute({}, outputs)
+    return outputs["counter"]
+
+
+def test_compiled_module_is_reused():
+    state = ExecutionState("counter_state")
+    state.script_text = COUNTER_SCRIPT
+
+    assert execute_state(state) == 1
+    compiled_module = state.script.compiled_module
+    assert execute_state(state) == 2
+    assert state.script.compiled_module is compiled_module
+
+    # changing the script text invalidates the compiled module
+    state.script_text = COUNTER_SCRIPT.replace("counter += 1", "counter += 10")
+    assert execute_state(state) == 10
+    assert state.script.compiled_module is not compiled_module
+
+
+def test_recompilation_on_state_execution():
+    state = ExecutionState("counter_state")
+    state.script_text = COUNTER_SCRIPT
+
+    global_config.set_config_value("SCRIPT_RECOMPILATION_ON_STATE_EXECUTION", True)
+    try:
+        assert execute_state(state) == 1
+        assert execute_state(state) == 1
+    finally:
+        global_config.set_config_value("SCRIPT_RECOMPILATION_ON_STATE_EXECUTION", False)
+
+
+def test_script_file_change_invalidates_compiled_module():
+    path = testing_utils.get_unique_temp_path()
+    write_file(os.path.join(path, "counter_script.py"), COUNTER_SCRIPT)
+    state = ExecutionState("counter_state", path=path, filename="counter_script.py")
+
+    assert execute_state(state) == 1
+    assert execute_state(state) == 2
+
+    # make sure the modification time differs on file systems with coarse time resolution
+    time.sleep(0.01)
+    write_file(os.path.join(path, "counter_script.py"), COUNTER_SCRIPT.replace("counter += 1", "counter += 10"))
+    os.utime(os.path.join(path, "counter_script.py"), (time.time() + 1, time.time() + 1))
+    assert execute_state(state) == 10
@@ -35,7 +35,10 @@ def test_start_stop_pause_step(caplog):
 
     with testing_utils.test_multithreading_lock:
         rafcon.core.singleton.state_machine_manager.add_state_machine(sm)
+        assert sm.execution_finished
         rafcon.core.singleton.state_machine_execution_engine.step_mode(sm.state_machine_id)
+        assert not sm.wait_for_execution_finished(timeout=0.01)
+        assert not rafcon.core.singleton.state_machine_execution_engine.join(timeout=0.01)
 
         for i in range(5):
             time.sleep(0.2)
@@ -44,7 +47,8 @@ def test_start_stop_pause_step(caplog):
         # give the state machine time to execute
         time.sleep(0.2)
         rafcon.core.singleton.state_machine_execution_engine.stop()
-        rafcon.core.singleton.state_machine_execution_engine.join()
+        assert rafcon.core.singleton.state_machine_execution_engine.join()
+        assert sm.wait_for_execution_finished(timeout=0)
 
         assert rafcon.core.singleton.global_variable_manager.get_variable("counter") == 5
         rafcon.core.singleton.state_machine_manager.remove_state_machine(sm.state_machine_id)
@@ -0,0 +1,91 @@
+from copy import deepcopy
+
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.state import StateExecutionStatus
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+
+
+def create_state_machine():
+    root_state = HierarchyState("root")
+    for container_index in range(2):
+        container_state = HierarchyState("container {0}".format(container_index))
+        root_state.add_state(container_state)
+        last_state = None
+        for index in range(3):
+            state = ExecutionState("state {0}".format(index))
+            state.add_input_data_port("input", "int", index)
+            container_state.add_state(state)
+            if last_state is None:
+                container_state.set_start_state(state)
+            else:
+                container_state.add_transition(last_state.state_id, 0, state.state_id, None)
+            last_state = state
+        container_state.add_transition(last_state.state_id, 0, container_state.state_id, 0)
+        root_state.add_transition(container_state.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def assert_hash_is_up_to_date(state_machine, previous_digests):
+    """Asserts that the incrementally updated hash equals the hash of an uncached copy and differs from all before"""
+    digest = state_machine.mutable_hash().digest()
+    assert digest == deepcopy(state_machine.root_state).mutable_hash().digest()
+    assert digest not in previous_digests
+    previous_digests.append(digest)
+
+
+def test_incremental_state_hash(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_state_machine()
+        root_state = state_machine.root_state
+        container_state, other_container_state = sorted(root_state.states.values(), key=lambda state: state.name)
+        state = sorted(container_state.states.values(), key=lambda state: state.name)[1]
+        digests = []
+        assert_hash_is_up_to_date(state_machine, digests)
+        assert state._hash_digest is not None and other_container_state._hash_digest is not None
+
+        # a modification only invalidates the digests on the path to the root state
+        state.description = "changed"
+        assert state._hash_digest is None and container_state._hash_digest is None and root_state._hash_digest is None
+        assert other_container_state._hash_digest is not None
+        assert all(sibling._hash_digest is not None for sibling in container_state.states.values()
+                   if sibling is not state)
+        assert_hash_is_up_to_date(state_machine, digests)
+
+        # execution time attributes are not hashed and keep the digests
+        state.input_data = {"input": 1}
+        state.output_data = {}
+        state.state_execution_status = StateExecutionStatus.ACTIVE
+        state.state_execution_status = StateExecutionStatus.INACTIVE
+        container_state.scoped_data = {}
+        assert state._hash_digest is not None and container_state._hash_digest is not None
+        assert state_machine.mutable_hash().digest() == digests[-1]
+
+        # modifications of state elements, scripts, semantic data and state ids
+        list(state.input_data_ports.values())[0].default_value = 42
+        assert_hash_is_up_to_date(state_machine, digests)
+        transition = container_state.get_transition_for_outcome(state, state.outcomes[0])
+        transition.modify_target(container_state.state_id, 0)
+        assert_hash_is_up_to_date(state_machine, digests)
+        state.script_text += "\n# changed\n"
+        assert_hash_is_up_to_date(state_machine, digests)
+        state.script.script += "\n# changed again\n"
+        assert_hash_is_up_to_date(state_machine, digests)
+        state.add_semantic_data([], "value", "key")
+        assert_hash_is_up_to_date(state_machine, digests)
+        # the ids in the transitions of the root state are changed as well
+        root_state.change_state_id()
+        assert_hash_is_up_to_date(state_machine, digests)
+        other_container_state.remove_state(list(other_container_state.states.keys())[0])
+        assert_hash_is_up_to_date(state_machine, digests)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,61 @@
+import os
+
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.core.config import global_config
+
+# test environment elements
+import pytest
+from tests import utils as testing_utils
+
+
+def create_state_machine():
+    root_state = HierarchyState("root")
+    for index in range(3):
+        container_state = BarrierConcurrencyState("container {0}".format(index)) if index % 2 else \
+            HierarchyState("container {0}".format(index))
+        root_state.add_state(container_state)
+        for child_index in range(3):
+            state = ExecutionState("child {0}".format(child_index))
+            state.script_text += "\n# script of child {0} of container {1}\n".format(child_index, index)
+            state.add_input_data_port("input", "int", child_index)
+            state.semantic_data = {"index": child_index}
+            container_state.add_state(state)
+    return StateMachine(root_state)
+
+
+def test_parallel_state_machine_loading(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        base_path = testing_utils.get_unique_temp_path()
+        state_machine = create_state_machine()
+        storage.save_state_machine_to_path(state_machine, base_path)
+        root_state_path = os.path.join(base_path, storage.get_storage_id_for_state(state_machine.root_state))
+
+        prefetched_files = storage.PrefetchedStateFiles(root_state_path, 4)
+        assert len(prefetched_files.get_child_folders(root_state_path)) == 3
+        assert prefetched_files.read_duration >= 0 and prefetched_files.scan_duration >= 0
+
+        loaded_state_machines = []
+        for threads in (1, 4):
+            global_config.set_config_value("STATE_MACHINE_LOADING_THREADS", threads)
+            loaded_state_machines.append(storage.load_state_machine_from_path(base_path))
+        for loaded_state_machine in loaded_state_machines:
+            assert loaded_state_machine.root_state == state_machine.root_state
+            assert not loaded_state_machine.marked_dirty
+            for container_state in loaded_state_machine.root_state.states.values():
+                for state in container_state.states.values():
+                    original_state = state_machine.get_state_by_path(state.get_path())
+                    assert state.script_text == original_state.script_text
+                    assert state.semantic_data == original_state.semantic_data
+                    assert state.file_system_path == original_state.file_system_path
+    finally:
+        global_config.set_config_value("STATE_MACHINE_LOADING_THREADS", 8)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -5,7 +5,9 @@ from pytest import raises
 from rafcon.core.states.execution_state import ExecutionState
 from rafcon.core.states.container_state import ContainerState
 from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.states.hierarchy_state import HierarchyState
 from rafcon.core.states.state import InputDataPort
+from rafcon.core.storage.storage import get_storage_id_for_state
 from tests.utils import assert_logger_warnings_and_errors
 from rafcon.utils import log
 logger = log.get_logger(__name__)
@@ -261,8 +263,37 @@ def test_port_and_outcome_removal(caplog):
     assert_logger_warnings_and_errors(caplog)
 
 
+def test_state_path_cache(caplog):
+    root = HierarchyState("root", state_id="ROOT")
+    child = HierarchyState("child", state_id="CHILD")
+    grandchild = ExecutionState("grandchild", state_id="GRANDCHILD")
+    child.add_state(grandchild)
+    assert grandchild.get_path() == "CHILD/GRANDCHILD"
+    assert grandchild.get_path(by_name=True) == "child/grandchild"
+
+    # changing the parent invalidates the cached paths of the whole subtree
+    root.add_state(child)
+    assert grandchild.get_path() == "ROOT/CHILD/GRANDCHILD"
+    assert grandchild.get_path(appendix="X") == "ROOT/CHILD/GRANDCHILD/X"
+    assert grandchild.get_path(by_name=True) == "root/child/grandchild"
+    assert grandchild.get_storage_path() == "/".join(get_storage_id_for_state(state)
+                                                     for state in (root, child, grandchild))
+
+    child.name = "renamed"
+    assert grandchild.get_path() == "ROOT/CHILD/GRANDCHILD"
+    assert grandchild.get_path(by_name=True) == "root/renamed/grandchild"
+    assert grandchild.get_storage_path() == "/".join(get_storage_id_for_state(state)
+                                                     for state in (root, child, grandchild))
+
+    child.change_state_id("NEWCHILD")
+    assert grandchild.get_path() == "ROOT/NEWCHILD/GRANDCHILD"
+
+    assert_logger_warnings_and_errors(caplog)
+
+
 if __name__ == '__main__':
     test_create_state(None)
     test_port_and_outcome_removal(None)
     test_create_container_state(None)
+    test_state_path_cache(None)
     # pytest.main([__file__])
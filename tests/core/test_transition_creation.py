@@ -4,6 +4,7 @@ from rafcon.core.states.execution_state import ExecutionState
 from rafcon.core.states.hierarchy_state import HierarchyState
 from rafcon.core.storage import storage
 from rafcon.core.state_machine import StateMachine
+from rafcon.core.state_elements.logical_port import Outcome
 
 # test environment elements
 from pytest import raises
@@ -81,5 +82,37 @@ def test_transition_creation(caplog):
     rafcon.core.singleton.state_machine_manager.delete_all_state_machines()
 
 
+def test_transition_lookup_for_outcome():
+    sm = create_state_machine()
+    root_state = sm.root_state
+    states_by_name = {state.name: state for state in root_state.states.values()}
+    state1, state2, state3 = [states_by_name["DummyState{}".format(i)] for i in range(1, 4)]
+    outcome_3 = state1.outcomes[3]
+    outcome_4 = state1.outcomes[4]
+
+    transition = root_state.get_transition_for_outcome(state1, outcome_3)
+    assert transition.from_state == state1.state_id and transition.to_state == state2.state_id
+    assert root_state.get_transition_for_outcome(state1, Outcome(-1, "aborted")) is None
+
+    # removing and adding transitions is reflected by the lookup
+    root_state.remove_transition(transition.transition_id)
+    assert root_state.get_transition_for_outcome(state1, outcome_3) is None
+    root_state.add_transition(state1.state_id, 3, state3.state_id, None)
+    assert root_state.get_transition_for_outcome(state1, outcome_3).to_state == state3.state_id
+
+    # modifying the origin of a transition is reflected by the lookup
+    transition = root_state.get_transition_for_outcome(state1, outcome_4)
+    root_state.remove_transition(root_state.get_transition_for_outcome(state1, outcome_3).transition_id)
+    transition.modify_origin(state1.state_id, 3)
+    assert root_state.get_transition_for_outcome(state1, outcome_4) is None
+    assert root_state.get_transition_for_outcome(state1, outcome_3) is transition
+
+    # changing the id of the container state updates the transitions to its outcomes
+    transition = root_state.get_transition_for_outcome(state2, state2.outcomes[3])
+    root_state.change_state_id()
+    assert transition.to_state == root_state.state_id
+    assert root_state.get_transition_for_outcome(state2, state2.outcomes[3]) is transition
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
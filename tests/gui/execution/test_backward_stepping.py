@@ -51,8 +51,7 @@ def execute_library_state_forwards_backwards():
 
     call_gui_callback(menubar_ctrl.on_backward_step_activate, None, None)
 
-    while not state_machine_execution_engine.finished_or_stopped():
-        time.sleep(0.1)
+    state_machine_execution_engine.join()
     for key, sd in sm.root_state.scoped_data.items():
         if sd.name == "beer_count":
             assert sd.value == 100
@@ -138,8 +137,7 @@ def execute_preemptive_state_forwards_backwards():
     state_machines_editor_tab_status_check(current_state_machine_id, active=True)
     call_gui_callback(menubar_ctrl.on_backward_step_activate, None, None)
 
-    while not state_machine_execution_engine.finished_or_stopped():
-        time.sleep(0.1)
+    state_machine_execution_engine.join()
     # stop or finished are asynchronous but the call_gui_callback makes the check synchronous
     call_gui_callback(state_machines_editor_tab_status_check, current_state_machine_id, False)
 
@@ -209,8 +207,7 @@ def execute_barrier_state_forwards_backwards():
 
     print("cp3")
 
-    while not state_machine_execution_engine.finished_or_stopped():
-        time.sleep(0.1)
+    state_machine_execution_engine.join()
 
     print("cp4")
 
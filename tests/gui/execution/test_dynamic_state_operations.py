@@ -1,5 +1,4 @@
 import os
-import time
 import datetime
 import pytest
 
@@ -31,8 +30,7 @@ def execute_dynamic_state_insertion(state_machine_name="dynamic_library_insertio
 
     testing_utils.wait_for_gui()  # TODO check -> without call_gui_callback wait_for_gui should be without effect
 
-    while not state_machine_execution_engine.finished_or_stopped():
-        time.sleep(0.1)
+    state_machine_execution_engine.join()
     # stop or finished are asynchronous but the call_gui_callback makes the check synchronous
     call_gui_callback(state_machines_editor_tab_status_check, current_state_machine_id, False)
 
@@ -151,8 +151,7 @@ def iter_execution_modes():
 
     # finish the state machine
     testing_utils.call_gui_callback(menubar_ctrl.on_start_activate, None)
-    while not state_machine_execution_engine.finished_or_stopped():
-        time.sleep(0.1)
+    state_machine_execution_engine.join()
     testing_utils.call_gui_callback(testing_utils.wait_for_gui)  # propagate securely the stop
 
 
@@ -165,8 +164,7 @@ def iter_execution_modes():
     number_of_executions_before = len(execution_history_ctrl.history_tree_store)
     print("history length before: {0}\n".format(number_of_executions_before))
     testing_utils.call_gui_callback(menubar_ctrl.on_start_activate, None)
-    while not state_machine_execution_engine.finished_or_stopped():
-        time.sleep(0.1)
+    state_machine_execution_engine.join()
     testing_utils.call_gui_callback(testing_utils.wait_for_gui)
     testing_utils.call_gui_callback(execution_history_ctrl.reload_history, None)
     number_of_executions_after = len(execution_history_ctrl.history_tree_store)
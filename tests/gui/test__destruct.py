@@ -509,16 +509,12 @@ def run_simple_execution_controller_construction():
 
     testing_utils.call_gui_callback(create_models)
 
-    import rafcon.core.execution.execution_engine
     import rafcon.gui.singleton
     sm_m = rafcon.gui.singleton.state_machine_manager_model.get_selected_state_machine_model()
     execution_engine = rafcon.gui.singleton.state_machine_execution_engine
-    sm_execution_status = rafcon.core.execution.execution_engine.StateMachineExecutionStatus
     testing_utils.call_gui_callback(execution_engine.start, sm_m.state_machine.state_machine_id)
 
-    while execution_engine.status.execution_mode is not sm_execution_status.FINISHED:
-        print("execution not finished yet: wait")
-        time.sleep(0.01)
+    execution_engine.join()
     testing_utils.call_gui_callback(rafcon.core.singleton.state_machine_manager.delete_all_state_machines)
 
 
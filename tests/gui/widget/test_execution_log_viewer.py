@@ -0,0 +1,57 @@
+import os
+import pprint
+
+# test environment elements
+from tests import utils as testing_utils
+from tests.utils import call_gui_callback
+
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+
+def create_execution_log():
+    from rafcon.core.singleton import state_machine_execution_engine, state_machine_manager
+    from rafcon.core.storage import storage
+
+    state_machine = storage.load_state_machine_from_path(
+        testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "execution_file_log_test")))
+    call_gui_callback(state_machine_manager.add_state_machine, state_machine)
+    call_gui_callback(state_machine_execution_engine.start, state_machine.state_machine_id)
+    state_machine_execution_engine.join()
+    return state_machine.get_last_execution_log_filename()
+
+
+def select_items_of_execution_log(filename):
+    from rafcon.gui.views.execution_log_viewer import ExecutionLogTreeView
+    from rafcon.gui.controllers.execution_log_viewer import ExecutionLogTreeController
+
+    view = call_gui_callback(ExecutionLogTreeView)
+    controller = call_gui_callback(ExecutionLogTreeController, [], view, filename, None)
+    call_gui_callback(testing_utils.wait_for_gui)
+
+    # the run ids of the log are integers, while the tree store holds strings
+    assert controller.items and all(isinstance(run_id, int) for run_id in controller.items)
+
+    def get_text():
+        text_buffer = view.text_view.get_buffer()
+        return text_buffer.get_text(text_buffer.get_start_iter(), text_buffer.get_end_iter(), True)
+
+    selected_run_ids = 0
+    for run_id, item_iter in controller.item_iter.items():
+        if controller.tree_store.get_value(item_iter, controller.RUN_ID_STORAGE_ID) != str(run_id):
+            continue
+        call_gui_callback(view.tree_view.get_selection().select_iter, item_iter)
+        assert call_gui_callback(get_text) == pprint.pformat(controller.items[run_id])
+        selected_run_ids += 1
+    assert selected_run_ids > 0
+
+
+def test_execution_log_viewer_selection(caplog):
+    testing_utils.run_gui(core_config={'EXECUTION_LOG_ENABLE': True,
+                                       'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path()})
+    try:
+        select_items_of_execution_log(create_execution_log())
+    finally:
+        testing_utils.close_gui()
+        testing_utils.shutdown_environment(caplog=caplog)
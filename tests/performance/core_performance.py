@@ -9,8 +9,10 @@ from rafcon.core.states.preemptive_concurrency_state import PreemptiveConcurrenc
 from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
 from rafcon.core.state_elements.data_port import InputDataPort, OutputDataPort
 from rafcon.core.state_machine import StateMachine
+from rafcon.core.execution.execution_status import StateMachineExecutionStatus
 
 from rafcon.utils.timer import measure_time
+from timeit import default_timer as timer
 
 from tests import utils as testing_utils
 
@@ -73,6 +75,30 @@ def create_barrier_concurrency_state(number_child_states=10, number_childs_per_c
     return barrier_state
 
 
+LOOP_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    counter = gvm.get_variable("loop_counter", default=0) + 1
+    gvm.set_variable("loop_counter", counter)
+    if counter < inputs["number_of_steps"]:
+        return "loop"
+    return 0
+"""
+
+
+def create_looping_hierarchy_state(number_of_steps=10000):
+    """Creates a hierarchy state, whose single child state is executed number_of_steps times"""
+    hierarchy = HierarchyState("loop_hierarchy")
+    state = ExecutionState("loop_state")
+    state.script_text = LOOP_SCRIPT
+    state.add_outcome("loop", 1)
+    state.add_input_data_port("number_of_steps", "int", number_of_steps)
+    hierarchy.add_state(state)
+    hierarchy.set_start_state(state.state_id)
+    hierarchy.add_transition(state.state_id, 1, state.state_id, None)
+    hierarchy.add_transition(state.state_id, 0, hierarchy.state_id, 0)
+    return hierarchy
+
+
 def execute_state(root_state):
     state_machine = StateMachine(root_state)
     rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
@@ -112,9 +138,32 @@ def test_preemption_concurrency_state_execution(number_child_states=10, number_c
     execute_state(preemption_state)
 
 
+def test_execution_engine_step_overhead(number_of_steps=10000):
+    if rafcon.core.singleton.global_variable_manager.variable_exist("loop_counter"):
+        rafcon.core.singleton.global_variable_manager.delete_variable("loop_counter")
+    hierarchy_state = create_looping_hierarchy_state(number_of_steps)
+    start = timer()
+    execute_state(hierarchy_state)
+    duration = timer() - start
+    assert rafcon.core.singleton.global_variable_manager.get_variable("loop_counter") == number_of_steps
+    print("Execution of {0} steps took {1:.3}s; {2:.3}ms per step".format(
+        number_of_steps, duration, duration / number_of_steps * 1000.))
+
+    # the execution engine is asked for the execution mode before each step
+    execution_engine = rafcon.core.singleton.state_machine_execution_engine
+    execution_engine.set_execution_mode(StateMachineExecutionStatus.STARTED, notify=False)
+    start = timer()
+    for _ in range(number_of_steps):
+        execution_engine.handle_execution_mode(hierarchy_state, hierarchy_state.states[hierarchy_state.start_state_id])
+    duration = timer() - start
+    execution_engine.set_execution_mode(StateMachineExecutionStatus.STOPPED, notify=False)
+    print("Handling the execution mode took {0:.3}us per step".format(duration / number_of_steps * 1000000.))
+
+
 if __name__ == '__main__':
     # test_hierarchy_state_execution(10)
     test_hierarchy_state_execution(100)
+    test_execution_engine_step_overhead(10000)
     # TODO: state creation takes too long (> 100 seconds) => investigate
     # test_hierarchy_state_execution(1000)
     # test_barrier_concurrency_state_execution(10, 10)
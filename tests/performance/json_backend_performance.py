@@ -0,0 +1,88 @@
+"""Compares the json backends of the storage utils on the files of the example state machines and libraries"""
+from __future__ import print_function
+import json
+import os
+from timeit import default_timer as timer
+
+from jsonconversion.decoder import JSONObjectDecoder
+from jsonconversion.encoder import JSONObjectEncoder
+
+from rafcon.core.config import global_config
+from rafcon.utils import storage_utils
+
+from tests import utils as testing_utils
+
+EXAMPLE_PATHS = [testing_utils.EXAMPLES_PATH, testing_utils.RAFCON_SHARED_LIBRARY_PATH]
+EXAMPLE_LIBRARIES = {
+    "ros": os.path.join(testing_utils.EXAMPLES_PATH, "libraries", "ros_libraries"),
+    "turtle_libraries": os.path.join(testing_utils.EXAMPLES_PATH, "libraries", "turtle_libraries"),
+    "tutorials": testing_utils.TUTORIAL_PATH
+}
+
+
+def get_json_files(paths=EXAMPLE_PATHS):
+    json_files = []
+    for path in paths:
+        for folder_path, _, file_names in os.walk(os.path.abspath(path)):
+            json_files.extend(os.path.join(folder_path, name) for name in sorted(file_names) if name.endswith(".json"))
+    return json_files
+
+
+def measure(function, items, repetitions):
+    """Returns the shortest duration of applying the function to all items"""
+    durations = []
+    for _ in range(repetitions):
+        start = timer()
+        for item in items:
+            function(item)
+        durations.append(timer() - start)
+    return min(durations)
+
+
+def test_json_backend_performance(repetitions=10):
+    testing_utils.initialize_environment_core(libraries=dict(EXAMPLE_LIBRARIES))
+    # the loaded library states shall not load their libraries, only the json backends are compared
+    global_config.set_config_value("LIBRARY_LOADING", "lazy")
+    try:
+        compare_json_backends(repetitions)
+    finally:
+        global_config.set_config_value("LIBRARY_LOADING", "preload")
+        storage_utils.set_json_backend()
+        testing_utils.shutdown_environment_only_core()
+
+
+def compare_json_backends(repetitions):
+    json_strings = []
+    for json_file_path in get_json_files():
+        with open(json_file_path) as json_file:
+            json_strings.append(json_file.read())
+    storage_utils.set_json_backend("json")
+    objects = [storage_utils.load_objects_from_json_string(json_string) for json_string in json_strings]
+    # the files have been written by the JSONObjectEncoder so far
+    expected_strings = [json.dumps(obj, cls=JSONObjectEncoder, indent=4, check_circular=False, sort_keys=True)
+                        for obj in objects]
+
+    print("{0} json files, {1:.1f} kB".format(len(json_strings), sum(len(string) for string in json_strings) / 1e3))
+    print("{0:>10} {1:>10} {2:>10} {3:>10} {4:>10}".format("backend", "load [ms]", "dump [ms]", "compact", "load dict"))
+    reference_load_duration = measure(lambda string: json.loads(
+        string, cls=JSONObjectDecoder, substitute_modules=storage_utils.substitute_modules), json_strings, repetitions)
+    reference_dump_duration = measure(lambda obj: json.dumps(
+        obj, cls=JSONObjectEncoder, indent=4, check_circular=False, sort_keys=True), objects, repetitions)
+    print("{0:>10} {1:>10.1f} {2:>10.1f}".format("reference", reference_load_duration * 1e3,
+                                                 reference_dump_duration * 1e3))
+    for backend_name in storage_utils.get_json_backend_names():
+        storage_utils.set_json_backend(backend_name)
+        # the files written by all backends are byte-identical
+        assert [storage_utils.dict_to_json_string(obj) for obj in objects] == expected_strings
+        load_duration = measure(storage_utils.load_objects_from_json_string, json_strings, repetitions)
+        dump_duration = measure(storage_utils.dict_to_json_string, objects, repetitions)
+        compact_duration = measure(lambda obj: storage_utils.dict_to_json_string(obj, compact=True), objects,
+                                   repetitions)
+        dict_duration = measure(lambda string: storage_utils.load_objects_from_json_string(string, as_dict=True),
+                                json_strings, repetitions)
+        print("{0:>10} {1:>10.1f} {2:>10.1f} {3:>10.1f} {4:>10.1f}".format(
+            backend_name, load_duration * 1e3, dump_duration * 1e3, compact_duration * 1e3, dict_duration * 1e3))
+
+
+if __name__ == '__main__':
+    test_json_backend_performance()